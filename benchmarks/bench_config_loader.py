@@ -0,0 +1,35 @@
+"""配置加载基准：ConfigLoader.load_* 与 CocktailSystem 初始化"""
+
+import contextlib
+import io
+
+from src.cocktail_system import CocktailSystem
+from src.config_loader import ConfigLoader
+
+
+def _quiet(func):
+    def wrapper():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+    return wrapper
+
+
+def bench_load_ingredients(run_benchmark, catalog_path):
+    ingredients = run_benchmark(_quiet(ConfigLoader(catalog_path).load_ingredients))
+    assert ingredients
+
+
+def bench_load_recipes(run_benchmark, catalog_path):
+    recipes = run_benchmark(_quiet(ConfigLoader(catalog_path).load_recipes))
+    assert recipes
+
+
+def bench_load_game_config(run_benchmark, catalog_path):
+    game_config = run_benchmark(_quiet(ConfigLoader(catalog_path).load_game_config))
+    assert game_config
+
+
+def bench_cocktail_system_init(run_benchmark, catalog_path):
+    loader = ConfigLoader(catalog_path)
+    system = run_benchmark(_quiet(lambda: CocktailSystem(loader)))
+    assert system.recipes
@@ -0,0 +1,62 @@
+"""评分基准：按配方评分、自由调酒评分和配方匹配"""
+
+import pytest
+
+from demo import TermixDemo
+
+
+@pytest.fixture(scope="module")
+def attempts(cocktail_system):
+    """取目录中间和末尾的配方构造几类典型的调酒记录"""
+    names = list(cocktail_system.recipes)
+    middle = cocktail_system.recipes[names[len(names) // 2]]
+    last = cocktail_system.recipes[names[-1]]
+
+    # 用量有偏差、多一种材料：覆盖评分的各个扣分分支
+    deviated = {name: amount * (1.35 if index % 2 else 0.9) for index, (name, amount) in enumerate(middle.ingredients.items())}
+    deviated["冰块"] = deviated.get("冰块", 0) + 50
+    return {
+        "middle": middle,
+        "deviated": deviated,
+        "last_exact": dict(last.ingredients),
+        # 不匹配任何配方的自由调酒：匹配时要扫描整个目录
+        "free": {"伏特加": 40, "蔓越莓汁": 60, "汤力水": 90, "柠檬片": 1, "樱桃": 2},
+    }
+
+
+def bench_calculate_score(run_benchmark, cocktail_system, attempts):
+    score, _ = run_benchmark(cocktail_system.calculate_score, attempts["middle"].name, attempts["deviated"])
+    assert 0 <= score < 100
+
+
+def bench_calculate_free_mixing_score(run_benchmark, cocktail_system, attempts):
+    assert run_benchmark(cocktail_system.calculate_free_mixing_score, attempts["free"]) > 0
+
+
+def bench_grade_mix_free(run_benchmark, cocktail_system, attempts):
+    """自由调酒的完整评分：先匹配配方（全表扫描未命中），再按自由调酒评分"""
+    _, matched, _ = run_benchmark(cocktail_system.grade_mix, attempts["free"])
+    assert matched == ""
+
+
+def bench_find_matching_recipe_hit_last(run_benchmark, cocktail_system, attempts):
+    """命中目录中最后一个配方（最坏情况的命中）"""
+    assert run_benchmark(cocktail_system.find_matching_recipe, attempts["last_exact"])
+
+
+def bench_find_matching_recipe_miss(run_benchmark, cocktail_system, attempts):
+    assert run_benchmark(cocktail_system.find_matching_recipe, attempts["free"]) == ""
+
+
+def bench_demo_recipes_similar(run_benchmark, cocktail_system, attempts):
+    """演示版自由调酒的配方相似度扫描（demo._mix_free_cocktail 的循环）"""
+    recipes_similar = TermixDemo._recipes_similar
+    selected = attempts["free"]
+
+    def scan():
+        for recipe_name, recipe in cocktail_system.recipes.items():
+            if recipes_similar(None, selected, recipe.ingredients):
+                return recipe_name
+        return None
+
+    run_benchmark(scan)
@@ -0,0 +1,57 @@
+"""
+基准测试用的目录 - 按规模生成并缓存配置目录
+
+shipped 为仓库自带的 config/；其余规模由 src.catalog_generator 按自带目录的
+分布生成（种子固定，结果确定），逐条写出 JSON，生成百万级目录时不必把全部
+配方放在内存里。
+"""
+
+import os
+import shutil
+
+from src.catalog_generator import generate_catalog
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHIPPED_CONFIG_DIR = os.path.join(ROOT, "config")
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".catalogs")
+
+SHIPPED = "shipped"
+DEFAULT_SIZES = "shipped,1k"
+ALL_SIZES = "shipped,1k,100k,1m"
+
+_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_size(label: str):
+    """把 "1k"、"100k"、"1m"、"2500" 等规模标签解析为配方数，shipped 返回 None"""
+    label = label.strip().lower()
+    if label == SHIPPED:
+        return None
+    if label[-1:] in _SUFFIXES:
+        return int(float(label[:-1]) * _SUFFIXES[label[-1]])
+    return int(label)
+
+
+def parse_sizes(spec: str):
+    """解析逗号分隔的规模列表；"all" 表示全部规模"""
+    if spec.strip().lower() == "all":
+        spec = ALL_SIZES
+    return [label.strip().lower() for label in spec.split(",") if label.strip()]
+
+
+def catalog_dir(label: str, seed: int = 0) -> str:
+    """返回该规模的配置目录，不存在时生成"""
+    count = parse_size(label)
+    if count is None:
+        return SHIPPED_CONFIG_DIR
+
+    directory = os.path.join(CACHE_DIR, f"generated-{count}-{seed}")
+    if os.path.exists(os.path.join(directory, "recipes.json")):
+        return directory
+
+    # 先写到临时目录再改名，中断后不会留下不完整的目录
+    partial = directory + ".partial"
+    shutil.rmtree(partial, ignore_errors=True)
+    generate_catalog(partial, count, seed=seed, model_dir=SHIPPED_CONFIG_DIR)
+    os.replace(partial, directory)
+    return directory
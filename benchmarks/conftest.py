@@ -0,0 +1,122 @@
+"""
+Termix 基准测试配置
+
+    pytest benchmarks                                   # 默认规模: shipped,1k
+    pytest benchmarks --catalog-sizes all               # 加上 100k 和 1m（耗时较长）
+    pytest benchmarks --benchmark-compare=0001          # 与仓库中提交的基线比较，中位数退化超过阈值即失败
+    pytest benchmarks --benchmark-save=baseline         # 在本机保存新的基线到 benchmarks/baselines
+    pytest benchmarks --benchmark-autosave --benchmark-compare   # 与上一次保存的运行比较并保存本次结果
+    pytest benchmarks --benchmark-compare --regression-threshold 5%
+
+基线按机器类型（系统-解释器-版本-位数）分目录保存，没有可比较的基线时直接报错并提示先保存。
+"""
+
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+
+import pytest
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+from catalogs import DEFAULT_SIZES, catalog_dir, parse_sizes  # noqa: E402
+
+BASELINE_DIR = os.path.join(BENCHMARK_DIR, "baselines")
+_DEFAULT_STORAGE = "file://./.benchmarks"
+
+# 单次调用超过这个秒数（大目录的加载等）时改为固定轮数，不做自动校准
+SLOW_CALL = 0.1
+SLOW_ROUNDS = 3
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("termix", "Termix 基准测试")
+    group.addoption(
+        "--catalog-sizes",
+        default=os.environ.get("TERMIX_BENCH_SIZES", DEFAULT_SIZES),
+        help="逗号分隔的目录规模（shipped、1k、100k、1m 或具体配方数），all 为全部；"
+             "默认 $TERMIX_BENCH_SIZES 或 %(default)s",
+    )
+    group.addoption(
+        "--regression-threshold",
+        default=os.environ.get("TERMIX_BENCH_THRESHOLD", "10%"),
+        help="与基线比较时中位数允许的退化：百分比（如 10%%）或秒数（如 0.001），"
+             "off 表示不判定；默认 $TERMIX_BENCH_THRESHOLD 或 10%%",
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # 在 pytest-benchmark 读取选项之前调整：基线默认存放在 benchmarks/baselines，
+    # 比较时按 --regression-threshold 判定退化（显式给出 --benchmark-compare-fail 时以其为准）
+    if config.getoption("benchmark_storage", None) == _DEFAULT_STORAGE:
+        config.option.benchmark_storage = "file://" + BASELINE_DIR
+
+    threshold = config.getoption("regression_threshold")
+    comparing = config.getoption("benchmark_compare", None)
+    if comparing and config.option.benchmark_storage == "file://" + BASELINE_DIR:
+        _check_baseline(comparing)
+    if comparing and threshold and threshold.lower() != "off" \
+            and not config.getoption("benchmark_compare_fail", None):
+        from pytest_benchmark.utils import parse_compare_fail
+
+        config.option.benchmark_compare_fail = [parse_compare_fail(f"median:{threshold}")]
+
+
+def _check_baseline(comparing):
+    """确认本机类型有可比较的基线，否则给出保存基线的提示
+
+    pytest-benchmark 找不到基线时只发出警告，随后报出难以理解的
+    "--benchmark-compare-fail requires valid --benchmark-compare"。
+    """
+    from pytest_benchmark.utils import get_machine_id
+
+    if comparing is not True and os.path.isfile(comparing):
+        return
+    machine_id = get_machine_id()
+    pattern = "[0-9][0-9][0-9][0-9]_" if comparing is True else comparing.rstrip("*")
+    if not glob.glob(os.path.join(BASELINE_DIR, machine_id, pattern + "*.json")):
+        raise pytest.UsageError(
+            f"benchmarks/baselines/{machine_id} 中没有与 {pattern}* 匹配的基线，"
+            f"请先在基准提交上运行 pytest benchmarks --benchmark-save=baseline"
+        )
+
+
+def pytest_generate_tests(metafunc):
+    if "catalog_size" in metafunc.fixturenames:
+        sizes = parse_sizes(metafunc.config.getoption("catalog_sizes"))
+        metafunc.parametrize("catalog_size", sizes, scope="session")
+
+
+@pytest.fixture(scope="session")
+def catalog_path(catalog_size):
+    """该规模的配置目录（首次使用时生成并缓存到 benchmarks/.catalogs）"""
+    return catalog_dir(catalog_size)
+
+
+@pytest.fixture(scope="session")
+def cocktail_system(catalog_path):
+    from src.cocktail_system import CocktailSystem
+    from src.config_loader import ConfigLoader
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return CocktailSystem(ConfigLoader(catalog_path))
+
+
+@pytest.fixture
+def run_benchmark(benchmark):
+    """按单次耗时选择计时方式：快的调用自动校准轮数，慢的调用固定轮数"""
+    benchmark.group = benchmark.name.split("[")[0]
+
+    def run(func, *args, **kwargs):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        if time.perf_counter() - start >= SLOW_CALL:
+            return benchmark.pedantic(func, args=args, kwargs=kwargs, rounds=SLOW_ROUNDS, iterations=1)
+        return benchmark(func, *args, **kwargs)
+
+    return run
@@ -5,24 +5,24 @@
 
 import json
 import sys
-from pathlib import Path
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.prompt import Prompt, Confirm
 
 from src.config_loader import ConfigLoader
 
-
 class ConfigManager:
     """配置管理器"""
     
     def __init__(self):
+        # rich 在各方法内导入：导入本模块或查看 --help 时不需要加载
+        from rich.console import Console
+
         self.console = Console()
         self.config_loader = ConfigLoader()
     
     def run(self):
         """运行配置管理器"""
+        from rich.panel import Panel
+        from rich.prompt import Prompt
+        
         self.console.print(Panel(
             "[bold cyan]🍸 Termix 配置管理工具 🍸[/bold cyan]\n\n"
             "管理游戏的材料、配方和设置",
@@ -56,6 +56,9 @@ class ConfigManager:
     
     def show_current_config(self):
         """显示当前配置"""
+        from rich.table import Table
+        from rich.prompt import Prompt
+        
         self.console.clear()
         
         # 显示材料统计
@@ -102,6 +105,8 @@ class ConfigManager:
     
     def validate_configs(self):
         """验证配置文件"""
+        from rich.prompt import Prompt
+        
         self.console.clear()
         self.console.print("[bold yellow]🔍 验证配置文件...[/bold yellow]\n")
         
@@ -141,6 +146,8 @@ class ConfigManager:
     
     def create_sample_configs(self):
         """创建示例配置"""
+        from rich.prompt import Prompt, Confirm
+        
         self.console.clear()
         
         if Confirm.ask("这将创建示例配置文件，是否继续？"):
@@ -151,6 +158,8 @@ class ConfigManager:
     
     def add_ingredient(self):
         """添加新材料"""
+        from rich.prompt import Prompt
+        
         self.console.clear()
         self.console.print("[bold cyan]➕ 添加新材料[/bold cyan]\n")
         
@@ -220,6 +229,8 @@ class ConfigManager:
     
     def add_recipe(self):
         """添加新配方"""
+        from rich.prompt import Prompt
+        
         self.console.clear()
         self.console.print("[bold cyan]➕ 添加新配方[/bold cyan]\n")
         
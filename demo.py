@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
 """
 Termix 演示版本 - 简化的终端调酒游戏
+
+脚本模式（--script）从文件依次读取每次输入，不再等待，并统计各界面的
+渲染耗时，配合 --console null/record 可以测量 Rich 渲染吞吐量：
+
+    python demo.py --script choices.txt --console null --report demo.json
 """
 
 from rich.console import Console
@@ -9,20 +14,105 @@ from rich.text import Text
 from rich.align import Align
 from rich.table import Table
 from rich.prompt import Prompt, Confirm
-import time
+import argparse
+import collections
+import functools
+import json
+import os
 import random
+import sys
+import time
 
 from src.character import BunnyGirl
 from src.cocktail_system import CocktailSystem
+from src.pacing import Pacing
+from src.perf_stats import summarize
+
+
+class ScriptedPrompt:
+    """脚本输入：依次返回脚本中的答案，代替 Prompt.ask
+    
+    脚本每行一个答案（空行即直接回车），以 # 开头的行为注释。
+    答案不在可选项中时与 Prompt.ask 一样提示并读取下一个答案；
+    答案用完时抛出 EOFError（与标准输入关闭时一致）。
+    """
+    
+    def __init__(self, answers, console):
+        self.answers = collections.deque(answers)
+        self.console = console
+    
+    @classmethod
+    def from_file(cls, path, console):
+        with open(path, "r", encoding="utf-8") as f:
+            answers = [line.rstrip("\r\n") for line in f if not line.startswith("#")]
+        return cls(answers, console)
+    
+    def ask(self, prompt, choices=None):
+        while True:
+            if not self.answers:
+                raise EOFError("脚本中的输入已用完")
+            answer = self.answers.popleft()
+            # 回显提示和答案，渲染量与交互时相当
+            suffix = f" [{'/'.join(choices)}]" if choices else ""
+            self.console.print(f"{prompt}{suffix}: {answer}")
+            if choices is None or answer in choices:
+                return answer
+            self.console.print("[red]请从可选项中选择[/red]")
+
+
+def make_console(kind="terminal", width=120):
+    """创建控制台：terminal 为真实终端；null 渲染后丢弃输出；record 渲染并保留记录"""
+    if kind == "terminal":
+        return Console()
+    # 按真实终端渲染（ANSI 样式、固定宽度），只是不写到屏幕
+    return Console(
+        file=open(os.devnull, "w", encoding="utf-8"),
+        force_terminal=True,
+        color_system="truecolor",
+        width=width,
+        record=(kind == "record"),
+    )
+
+
+def _timed(name):
+    """装饰器：开启计时时记录每次调用的耗时（毫秒）"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.timings is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.timings[name].append((time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorator
 
 
 class TermixDemo:
     """Termix 演示版本"""
     
-    def __init__(self):
-        self.console = Console()
+    def __init__(self, fast=None, console=None, prompt=None, cocktail_system=None, collect_timings=False):
+        self.console = console or Console()
+        # prompt 为 None 时交互式读取输入，否则使用 ScriptedPrompt 等脚本输入
+        self.prompt = prompt
         self.bunny_girl = BunnyGirl()
-        self.cocktail_system = CocktailSystem()
+        self.cocktail_system = cocktail_system or CocktailSystem()
+        self.pacing = Pacing.from_config(self.cocktail_system.game_config, fast)
+        self.timings = collections.defaultdict(list) if collect_timings else None
+    
+    def ask(self, prompt, choices=None):
+        """读取一次输入"""
+        if self.prompt is not None:
+            return self.prompt.ask(prompt, choices=choices)
+        if choices is None:
+            return Prompt.ask(prompt)
+        return Prompt.ask(prompt, choices=choices)
+    
+    def timing_report(self):
+        """各界面渲染耗时汇总（毫秒）"""
+        return {name: summarize(values) for name, values in (self.timings or {}).items()}
     
     def show_title(self):
         """显示标题"""
@@ -40,14 +130,15 @@ class TermixDemo:
         )
         
         self.console.print(panel)
-        time.sleep(2)
+        self.pacing.sleep(2)
     
     def show_character_intro(self):
         """显示角色介绍"""
         self.console.clear()
         self.console.print(self.bunny_girl.show_character("happy"))
-        time.sleep(3)
+        self.pacing.sleep(3)
     
+    @_timed("show_ingredients")
     def show_ingredients(self):
         """显示可用材料"""
         self.console.clear()
@@ -69,6 +160,7 @@ class TermixDemo:
         self.console.print(table)
         self.console.print(f"\n💡 {self.cocktail_system.get_random_recipe_hint()}")
     
+    @_timed("show_recipes")
     def show_recipes(self):
         """显示配方"""
         self.console.clear()
@@ -88,6 +180,7 @@ class TermixDemo:
             self.console.print(f"[italic]{recipe.description}[/italic]")
             self.console.print(f"难度: {'⭐' * recipe.difficulty}\n")
     
+    @_timed("mixing_animation")
     def mixing_animation(self, recipe_name):
         """调酒动画"""
         self.console.clear()
@@ -116,8 +209,9 @@ class TermixDemo:
             )
             
             self.console.print(panel)
-            time.sleep(1.5)
+            self.pacing.sleep(1.5)
     
+    @_timed("show_result")
     def show_result(self, recipe_name, score, evaluation):
         """显示调酒结果"""
         self.console.clear()
@@ -153,7 +247,7 @@ class TermixDemo:
         self.console.print("1. 📖 按配方调酒")
         self.console.print("2. 🎨 自由调酒")
         
-        mode_choice = Prompt.ask("\n请选择模式", choices=["1", "2"])
+        mode_choice = self.ask("\n请选择模式", choices=["1", "2"])
         
         if mode_choice == "1":
             self._recipe_mixing()
@@ -173,7 +267,7 @@ class TermixDemo:
         
         while True:
             try:
-                choice = int(Prompt.ask("\n请选择配方编号")) - 1
+                choice = int(self.ask("\n请选择配方编号")) - 1
                 if 0 <= choice < len(recipes):
                     selected_recipe = recipes[choice]
                     break
@@ -217,7 +311,7 @@ class TermixDemo:
             self.console.print("3. 清空配方")
             self.console.print("4. 返回主菜单")
             
-            action = Prompt.ask("请选择", choices=["1", "2", "3", "4"])
+            action = self.ask("请选择", choices=["1", "2", "3", "4"])
             
             if action == "1":
                 self._add_ingredient_interactive(selected_ingredients)
@@ -246,7 +340,7 @@ class TermixDemo:
         
         while True:
             try:
-                choice = int(Prompt.ask("\n请选择材料编号")) - 1
+                choice = int(self.ask("\n请选择材料编号")) - 1
                 if 0 <= choice < len(ingredients):
                     selected_ingredient = ingredients[choice]
                     break
@@ -258,7 +352,7 @@ class TermixDemo:
         # 输入用量
         while True:
             try:
-                amount = float(Prompt.ask(f"请输入 {selected_ingredient.name} 的用量(ml)"))
+                amount = float(self.ask(f"请输入 {selected_ingredient.name} 的用量(ml)"))
                 if amount > 0:
                     break
                 else:
@@ -273,7 +367,7 @@ class TermixDemo:
             selected_ingredients[selected_ingredient.name] = amount
         
         self.console.print(f"[green]已添加 {selected_ingredient.emoji} {selected_ingredient.name} {amount}ml[/green]")
-        time.sleep(1)
+        self.pacing.sleep(1)
     
     def _mix_free_cocktail(self, selected_ingredients):
         """调制自由鸡尾酒"""
@@ -386,29 +480,87 @@ class TermixDemo:
                 
                 self.console.print(panel)
                 
-                choice = Prompt.ask("请选择选项", choices=["1", "2", "3", "4"])
+                choice = self.ask("请选择选项", choices=["1", "2", "3", "4"])
                 
                 if choice == "1":
                     self.show_recipes()
-                    Prompt.ask("\n按回车继续...")
+                    self.ask("\n按回车继续...")
                 elif choice == "2":
                     self.show_ingredients()
-                    Prompt.ask("\n按回车继续...")
+                    self.ask("\n按回车继续...")
                 elif choice == "3":
                     self.interactive_mixing()
-                    Prompt.ask("\n按回车继续...")
+                    self.ask("\n按回车继续...")
                 elif choice == "4":
                     self.console.print("\n[cyan]感谢游玩 Termix！🍸[/cyan]")
                     break
         
         except KeyboardInterrupt:
             self.console.print("\n\n[yellow]游戏被中断，再见！👋[/yellow]")
+        except EOFError:
+            # 标准输入关闭或脚本输入用完
+            self.console.print("\n[yellow]输入已结束，再见！👋[/yellow]")
 
 
 def main():
     """主函数"""
-    demo = TermixDemo()
+    parser = argparse.ArgumentParser(description="Termix 演示版本")
+    parser.add_argument("--fast", action="store_true", help="快速模式：跳过演示中的等待")
+    parser.add_argument("--script", metavar="FILE",
+                        help="从文件依次读取输入（每行一个，空行为回车），不再等待，并统计渲染耗时")
+    parser.add_argument("--console", choices=["terminal", "null", "record"], default="terminal",
+                        help="输出目标：terminal 终端；null 渲染后丢弃；record 渲染并记录（配合 --save）")
+    parser.add_argument("--width", type=int, default=120, help="null/record 控制台的宽度")
+    parser.add_argument("--save", metavar="PATH", help="record 控制台的输出保存路径（.html/.svg/其他为纯文本）")
+    parser.add_argument("--report", metavar="PATH", help="渲染耗时报告输出路径（默认 stderr）")
+    parser.add_argument("--config-dir", metavar="DIR", help="从其他目录加载配置（如生成的大规模目录）")
+    parser.add_argument("--seed", type=int, help="随机数种子")
+    args = parser.parse_args()
+    
+    if args.seed is not None:
+        random.seed(args.seed)
+    
+    console = make_console(args.console, args.width)
+    cocktail_system = None
+    if args.config_dir:
+        from src.config_loader import ConfigLoader
+        cocktail_system = CocktailSystem(ConfigLoader(args.config_dir))
+    
+    if args.script:
+        # 脚本模式：不等待，并记录各界面的渲染耗时
+        demo = TermixDemo(console=console, prompt=ScriptedPrompt.from_file(args.script, console),
+                          cocktail_system=cocktail_system, collect_timings=True)
+        demo.pacing = Pacing(fast=True)
+    else:
+        demo = TermixDemo(fast=True if args.fast else None, console=console, cocktail_system=cocktail_system)
+    
+    started = time.perf_counter()
     demo.run()
+    elapsed = (time.perf_counter() - started) * 1000
+    
+    if args.console == "record" and args.save:
+        if args.save.endswith(".html"):
+            console.save_html(args.save)
+        elif args.save.endswith(".svg"):
+            console.save_svg(args.save)
+        else:
+            console.save_text(args.save)
+    
+    if demo.timings is not None:
+        report = {
+            "console": args.console,
+            "width": args.width,
+            "recipes": len(demo.cocktail_system.recipes),
+            "ingredients": len(demo.cocktail_system.ingredients),
+            "total_ms": round(elapsed, 3),
+            "sections": demo.timing_report(),
+        }
+        data = json.dumps(report, ensure_ascii=False, indent=2)
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                f.write(data + "\n")
+        else:
+            print(data, file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Termix 批量评分工具 (termix-grade) - 离线为 JSON Lines 调酒记录评分
+
+每行输入一条调酒记录：
+
+    {"recipe": "莫吉托", "ingredients": {"白朗姆酒": 50, "青柠汁": 25, ...}}
+
+"recipe" 可省略或为 null，此时先匹配配方，匹配不到按自由调酒评分；
+指定的配方不存在或输入格式错误时输出错误行（带文件名和该文件中的行号）。
+其余字段（如 "id"）原样带到输出（包括错误行）。每行输出一条结果，顺序与输入一致。
+逐行流式处理，内存占用与输入规模无关。
+"""
+
+import argparse
+import contextlib
+import itertools
+import json
+import sys
+import time
+
+from src.cocktail_system import CocktailSystem
+
+IO_BUFFER_SIZE = 1 << 20  # 1 MiB 批量读写缓冲
+PROGRESS_INTERVAL = 0.5  # 进度刷新间隔（秒）
+
+_cocktail_system = None
+
+
+def _load_cocktail_system(shared_catalog=None, config_dir=None) -> CocktailSystem:
+    """加载调酒系统；配置加载时的提示输出到 stderr，避免混入评分结果
+
+    指定 shared_catalog 时从共享内存目录解码，不再读取 JSON 配置；
+    指定 config_dir 时从该目录读取配置。
+    """
+    if shared_catalog:
+        from src.shared_catalog import CatalogReader
+
+        reader = CatalogReader(shared_catalog)
+        try:
+            return reader.load()
+        finally:
+            reader.close()
+    with contextlib.redirect_stdout(sys.stderr):
+        if config_dir:
+            from src.config_loader import ConfigLoader
+            return CocktailSystem(ConfigLoader(config_dir))
+        return CocktailSystem()
+
+
+def _init_worker(shared_catalog=None, config_dir=None):
+    """工作进程初始化：每个进程加载一次配置"""
+    global _cocktail_system
+    _cocktail_system = _load_cocktail_system(shared_catalog, config_dir)
+
+
+def grade_attempt(cocktail_system: CocktailSystem, attempt: dict) -> dict:
+    """为单条记录评分，返回输出记录"""
+    ingredients = attempt.get("ingredients")
+    if not isinstance(ingredients, dict):
+        raise ValueError("缺少 ingredients 对象")
+
+    recipe_name = attempt.get("recipe")
+    if recipe_name and recipe_name not in cocktail_system.recipes:
+        raise ValueError(f"未知配方: {recipe_name}")
+    score, matched, evaluation = cocktail_system.grade_mix(ingredients, recipe_name)
+
+    result = _passthrough(attempt)
+    result["matched"] = matched or None
+    result["mode"] = "recipe" if matched else "free"
+    result["score"] = score
+    result["evaluation"] = evaluation
+    return result
+
+
+def _passthrough(attempt: dict) -> dict:
+    """原样带到输出的字段（除 ingredients 外的全部字段）"""
+    return {key: value for key, value in attempt.items() if key != "ingredients"}
+
+
+def grade_line(numbered_line) -> bytes:
+    """解析并评分一行输入，返回编码好的输出行（在工作进程中执行）"""
+    path, line_number, line = numbered_line
+    attempt = None
+    try:
+        attempt = json.loads(line)
+        if not isinstance(attempt, dict):
+            raise ValueError("每行必须是一个 JSON 对象")
+        result = grade_attempt(_cocktail_system, attempt)
+    except (ValueError, TypeError, ZeroDivisionError) as e:
+        result = _passthrough(attempt) if isinstance(attempt, dict) else {}
+        result.update({"file": path, "line": line_number, "error": str(e)})
+    return (json.dumps(result, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _read_lines(paths):
+    """依次读取输入文件（"-" 为 stdin），产出 (文件名, 文件内行号, 内容)，跳过空行"""
+    for path in paths:
+        if path == "-":
+            stream = contextlib.nullcontext(sys.stdin.buffer)
+        else:
+            stream = open(path, "rb", buffering=IO_BUFFER_SIZE)
+        with stream as f:
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    yield path, line_number, line
+
+
+def _batched(iterable, size):
+    """按固定大小分批"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class ProgressCounter:
+    """stderr 上的进度计数器"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.count = 0
+        self.started = time.monotonic()
+        self._last_report = self.started
+        self._tty = sys.stderr.isatty()
+
+    def advance(self, n=1):
+        self.count += n
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        if now - self._last_report >= PROGRESS_INTERVAL:
+            self._last_report = now
+            self._report(now, final=False)
+
+    def finish(self):
+        if self.enabled:
+            self._report(time.monotonic(), final=True)
+
+    def _report(self, now, final):
+        elapsed = now - self.started
+        rate = self.count / elapsed if elapsed > 0 else 0
+        message = f"已评分 {self.count} 条 ({rate:,.0f} 条/秒)"
+        if self._tty:
+            sys.stderr.write("\r" + message + ("\n" if final else ""))
+        elif final:
+            sys.stderr.write(message + "\n")
+        sys.stderr.flush()
+
+
+def grade_stream(lines, output, jobs=1, chunksize=256, progress=None, shared_catalog=None, config_dir=None):
+    """评分所有输入行并写入 output（二进制流）"""
+    progress = progress or ProgressCounter(enabled=False)
+
+    if jobs <= 1:
+        _init_worker(shared_catalog, config_dir)
+        for numbered_line in lines:
+            output.write(grade_line(numbered_line))
+            progress.advance()
+        return progress.count
+
+    import multiprocessing
+
+    # 按窗口分批提交，避免 imap 把整个输入预读进内存
+    window = jobs * chunksize * 4
+    with multiprocessing.Pool(jobs, initializer=_init_worker, initargs=(shared_catalog, config_dir)) as pool:
+        for batch in _batched(lines, window):
+            for encoded in pool.imap(grade_line, batch, chunksize):
+                output.write(encoded)
+                progress.advance()
+    return progress.count
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        prog="termix-grade",
+        description="Termix 批量评分：读取 JSON Lines 调酒记录，输出 JSON Lines 评分结果"
+    )
+    parser.add_argument("inputs", nargs="*", default=["-"], metavar="INPUT",
+                        help="输入文件，默认或 \"-\" 为标准输入")
+    parser.add_argument("-o", "--output", default="-", help="输出文件，默认标准输出")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="并行进程数，0 表示使用全部 CPU（默认 1）")
+    parser.add_argument("--chunksize", type=int, default=256, help="每次分发给工作进程的行数")
+    parser.add_argument("--shared-catalog", metavar="NAME",
+                        help="从共享内存目录加载配方（见 src.shared_catalog）")
+    parser.add_argument("--config-dir", metavar="DIR", help="从其他目录加载配置（如生成的大规模目录）")
+    parser.add_argument("-q", "--quiet", action="store_true", help="不在 stderr 显示进度")
+    args = parser.parse_args()
+
+    jobs = args.jobs
+    if jobs <= 0:
+        import os
+        jobs = os.cpu_count() or 1
+
+    if args.output == "-":
+        sys.stdout.flush()
+        output = open(sys.stdout.fileno(), "wb", buffering=IO_BUFFER_SIZE, closefd=False)
+    else:
+        output = open(args.output, "wb", buffering=IO_BUFFER_SIZE)
+
+    progress = ProgressCounter(enabled=not args.quiet)
+    try:
+        with output:
+            grade_stream(_read_lines(args.inputs), output, jobs, max(args.chunksize, 1), progress,
+                         args.shared_catalog, args.config_dir)
+    except BrokenPipeError:
+        # 下游（如 head）提前关闭管道
+        sys.stderr.close()
+        return
+    except KeyboardInterrupt:
+        sys.stderr.write("\n已中断\n")
+        sys.exit(130)
+    progress.finish()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,22 +4,39 @@ Termix - 终端调酒游戏
 一个美观的终端调酒应用，让你体验调酒的乐趣
 """
 
+import argparse
 import asyncio
+import contextlib
+import sys
+
+from src.startup_profiler import profiler
+
+if __name__ == "__main__":
+    # 未开启时分析器不记录事件；命令行开启时从导入阶段开始记录
+    profiler.enable_from_argv(sys.argv[1:])
+profiler.begin("imports")
+
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, Vertical
 from textual.widgets import Header, Footer, Static, Button
 from textual.reactive import reactive
-from textual.events import Key, Resize
+from textual.events import InputEvent, Key, MouseDown, MouseUp, Resize
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 from rich.align import Align
 
 from src.character import BunnyGirl
-from src.cocktail_system import CocktailSystem
 from src.ui_components import WelcomeScreen, GameScreen, StartMixingMessage, StartRecipeMixingMessage, ShowRecipeDetailsMessage
 from src.free_mixing import StartFreeMixingMessage
 from src.help_system import HelpScreen, CloseHelpMessage
+from src.mixing_jobs import MixingJobManager
+from src.pacing import Pacing
+from src.mixing_plan import build_mixing_plan, get_mixing_time_budget
+from src.scoring_service import LocalScoringBackend, connect_scoring_backend
+from src.shared_catalog import load_cocktail_system
+
+profiler.end("imports")
 
 
 class TermixApp(App):
@@ -31,43 +48,138 @@ class TermixApp(App):
     
     current_screen = reactive("welcome")
     
-    def __init__(self):
+    def __init__(self, fast=None, scoring_socket=None, bunny_girl=None, cocktail_system=None, recorder=None,
+                 shared_catalog=None):
         super().__init__()
-        self.bunny_girl = BunnyGirl()
-        self.cocktail_system = CocktailSystem()
+        # 角色与配方目录在欢迎界面显示后于后台线程加载，见 _load_game；
+        # 也可以直接传入预先加载好的实例（如会话预热进程 fork 出的会话）
+        self.fast = fast
+        self.scoring_socket = scoring_socket
+        self.shared_catalog = shared_catalog
+        self.bunny_girl = bunny_girl
+        self.cocktail_system = cocktail_system
+        self.scoring = None
+        self.pacing = None
+        self.game_screen = None
+        self.game_ready = asyncio.Event()
         self.help_visible = False
         self.current_module = "main"
+        self.mixing_jobs = MixingJobManager()
+        # 会话录制器（main.py --record 或回放时使用），见 src/session_recorder.py
+        self.recorder = recorder
     
     def compose(self) -> ComposeResult:
-        """构建应用界面"""
-        yield Header()
-        yield WelcomeScreen(id="welcome")
-        yield GameScreen(id="game", bunny_girl=self.bunny_girl, cocktail_system=self.cocktail_system)
-        yield HelpScreen(id="help", current_module=self.current_module)
-        yield Footer()
+        """构建应用界面（游戏界面在数据加载完成后再挂载）"""
+        with profiler.phase("compose", widget="Header"):
+            header = Header()
+        yield header
+        with profiler.phase("compose", widget="WelcomeScreen"):
+            welcome = WelcomeScreen(loading=True, id="welcome")
+        yield welcome
+        with profiler.phase("compose", widget="HelpScreen"):
+            help_screen = HelpScreen(id="help", current_module=self.current_module)
+        yield help_screen
+        with profiler.phase("compose", widget="Footer"):
+            footer = Footer()
+        yield footer
     
     def on_mount(self) -> None:
         """应用挂载时的初始化"""
+        # 挂载后一次性获取界面引用
+        self.welcome_screen = self.query_one("#welcome", WelcomeScreen)
+        self.help_screen = self.query_one("#help", HelpScreen)
         self.show_welcome_screen()
+        if self.recorder is not None:
+            self.recorder.start(self.size, self.fast)
+        profiler.mark("mounted")
+        
+        # 欢迎界面先完成首帧绘制，再开始加载数据和构建游戏界面
+        self.call_after_refresh(self._on_first_paint)
+    
+    def _on_first_paint(self):
+        """首帧绘制完成后启动后台加载"""
+        profiler.mark("first_paint")
+        self.run_worker(self._load_game(), group="startup", exclusive=True)
+    
+    def _build_game_state(self):
+        """构建尚未传入的角色和调酒系统（在工作线程中执行）"""
+        bunny_girl, cocktail_system = self.bunny_girl, self.cocktail_system
+        if bunny_girl is None:
+            with profiler.phase("BunnyGirl()"):
+                bunny_girl = BunnyGirl()
+        catalog_error = None
+        if cocktail_system is None:
+            # 配置了共享目录（--shared-catalog 或 TERMIX_SHARED_CATALOG）时从共享内存解码
+            with profiler.phase("CocktailSystem()"):
+                cocktail_system, catalog_error = load_cocktail_system(self.shared_catalog)
+        return bunny_girl, cocktail_system, catalog_error
+    
+    async def _load_game(self):
+        """后台加载游戏数据并挂载游戏界面，完成后启用开始按钮"""
+        if self.bunny_girl is None or self.cocktail_system is None:
+            self.bunny_girl, self.cocktail_system, catalog_error = await asyncio.to_thread(self._build_game_state)
+            if catalog_error is not None:
+                self.notify(f"{catalog_error}，改用配置文件", severity="warning")
+        self.pacing = Pacing.from_config(self.cocktail_system.game_config, self.fast)
+        
+        # 配置了评分服务时通过它评分，否则（或连接失败时）在本进程内评分
+        self.scoring, error = await connect_scoring_backend(self.cocktail_system, self.scoring_socket)
+        if error is not None:
+            self.notify(f"评分服务不可用，改用本地评分: {error}", severity="warning")
+        
+        with profiler.phase("mount", widget="GameScreen"):
+            game_screen = GameScreen(id="game", bunny_girl=self.bunny_girl, cocktail_system=self.cocktail_system,
+                                     pacing=self.pacing)
+            game_screen.display = False
+            await self.mount(game_screen, before=self.help_screen)
+        self.game_screen = game_screen
+        
+        self.welcome_screen.set_ready()
+        self.game_ready.set()
+        self._record("ready")
+        profiler.mark("game_ready")
+    
+    async def on_unmount(self) -> None:
+        """退出时断开评分服务并结束录制"""
+        if self.scoring is not None:
+            await self.scoring.close()
+        if self.recorder is not None:
+            self.recorder.close()
+    
+    async def on_event(self, event) -> None:
+        """录制来自终端的输入事件（转发给子组件的副本不重复记录）"""
+        if self.recorder is not None and isinstance(event, InputEvent) and not event.is_forwarded:
+            if isinstance(event, Key):
+                self.recorder.record_key(event)
+            elif isinstance(event, MouseDown):
+                self.recorder.record_mouse("mouse_down", event)
+            elif isinstance(event, MouseUp):
+                self.recorder.record_mouse("mouse_up", event)
+        await super().on_event(event)
+    
+    def _record(self, kind, **fields):
+        if self.recorder is not None:
+            self.recorder.record(kind, **fields)
+    
+    def _record_message(self, message):
+        if self.recorder is not None:
+            self.recorder.record_message(message)
     
     def show_welcome_screen(self):
         """显示欢迎界面"""
-        welcome = self.query_one("#welcome", WelcomeScreen)
-        game = self.query_one("#game", GameScreen)
-        help_screen = self.query_one("#help", HelpScreen)
-        welcome.display = True
-        game.display = False
-        help_screen.display = False
+        self.welcome_screen.display = True
+        if self.game_screen is not None:
+            self.game_screen.display = False
+        self.help_screen.display = False
         self.current_module = "main"
     
     def show_game_screen(self):
         """显示游戏界面"""
-        welcome = self.query_one("#welcome", WelcomeScreen)
-        game = self.query_one("#game", GameScreen)
-        help_screen = self.query_one("#help", HelpScreen)
-        welcome.display = False
-        game.display = True
-        help_screen.display = False
+        if self.game_screen is None:
+            return  # 仍在加载
+        self.welcome_screen.display = False
+        self.game_screen.display = True
+        self.help_screen.display = False
         self.current_module = "ingredients"  # 默认显示材料界面
     
     def on_button_pressed(self, event: Button.Pressed) -> None:
@@ -77,18 +189,11 @@ class TermixApp(App):
     
     def on_resize(self, event: Resize) -> None:
         """处理窗口大小变化事件"""
-        # 自动调整布局
+        if self.recorder is not None:
+            self.recorder.record_resize(event.size)
+        # 自动调整布局（防抖和滞回由布局控制器处理）
         try:
-            game_screen = self.query_one("#game", GameScreen)
-            # 根据终端大小自动选择布局
-            if event.size.width < 100:  # 窄屏幕使用垂直布局
-                if game_screen.layout_mode == "horizontal":
-                    game_screen._apply_vertical_layout()
-                    game_screen.layout_mode = "vertical"
-            else:  # 宽屏幕使用水平布局
-                if game_screen.layout_mode == "vertical":
-                    game_screen._apply_horizontal_layout()
-                    game_screen.layout_mode = "horizontal"
+            self.game_screen.layout_controller.request(event.size.width)
         except:
             pass  # 如果游戏界面还没有加载，忽略错误
     
@@ -102,18 +207,21 @@ class TermixApp(App):
         elif event.key == "escape":
             self.show_welcome_screen()
             event.prevent_default()
+        # F9 跳过调酒动画
+        elif event.key == "f9":
+            if self.mixing_jobs.skip():
+                event.prevent_default()
         # F11 切换布局
         elif event.key == "f11":
             try:
-                game_screen = self.query_one("#game", GameScreen)
-                game_screen._toggle_layout()
+                self.game_screen._toggle_layout()
                 event.prevent_default()
             except:
                 pass
     
     def _show_help(self):
         """显示帮助界面"""
-        help_screen = self.query_one("#help", HelpScreen)
+        help_screen = self.help_screen
         
         if self.help_visible:
             # 如果帮助已显示，隐藏它
@@ -127,32 +235,35 @@ class TermixApp(App):
     
     def on_close_help_message(self, message: CloseHelpMessage) -> None:
         """处理关闭帮助消息"""
-        help_screen = self.query_one("#help", HelpScreen)
-        help_screen.display = False
+        self._record_message(message)
+        self.help_screen.display = False
         self.help_visible = False
     
     def on_start_mixing_message(self, message: StartMixingMessage) -> None:
         """处理开始调酒消息"""
+        self._record_message(message)
         # 切换到调酒界面并开始调酒
-        game_screen = self.query_one("#game", GameScreen)
-        game_screen._show_view("mixing")
+        self.game_screen._show_view("mixing")
         self.current_module = "mixing"
+        self.game_screen.character.start_animation("working", "正在为您精心调制...")
         
-        # 启动调酒动画
-        asyncio.create_task(self._start_mixing_process(message.ingredients))
+        # 启动调酒任务（取代仍在进行的旧任务）
+        self.mixing_jobs.submit(self._start_mixing_process(message.ingredients))
     
     def on_start_free_mixing_message(self, message: StartFreeMixingMessage) -> None:
         """处理开始自由调酒消息"""
+        self._record_message(message)
         # 切换到自由调酒界面并开始调酒
-        game_screen = self.query_one("#game", GameScreen)
-        game_screen._show_view("free-mixing")
+        self.game_screen._show_view("free-mixing")
         self.current_module = "free-mixing"
+        self.game_screen.character.start_animation("working", "正在为您精心调制...")
         
-        # 启动自由调酒过程
-        asyncio.create_task(self._start_free_mixing_process(message.ingredients))
+        # 启动自由调酒任务（取代仍在进行的旧任务）
+        self.mixing_jobs.submit(self._start_free_mixing_process(message.ingredients))
     
     def on_start_recipe_mixing_message(self, message: StartRecipeMixingMessage) -> None:
         """处理开始按配方调制消息"""
+        self._record_message(message)
         recipe = message.recipe
         
         # 显示配方信息
@@ -162,11 +273,14 @@ class TermixApp(App):
             severity="information"
         )
         
-        # 启动按配方调酒过程
-        asyncio.create_task(self._start_recipe_mixing_process(recipe))
+        self.game_screen.character.start_animation("working", "正在为您精心调制...")
+        
+        # 启动按配方调酒任务（取代仍在进行的旧任务）
+        self.mixing_jobs.submit(self._start_recipe_mixing_process(recipe))
     
     def on_show_recipe_details_message(self, message: ShowRecipeDetailsMessage) -> None:
         """处理显示配方详细信息消息"""
+        self._record_message(message)
         # 显示详细的配方信息
         self.notify(
             message.details,
@@ -176,113 +290,70 @@ class TermixApp(App):
     
     async def _start_mixing_process(self, ingredients):
         """启动调酒过程"""
-        try:
-            # 显示调酒动画（简化版）
-            await self._show_mixing_animation(ingredients)
-            
-            # 计算分数
-            recipe_name = self.cocktail_system.find_matching_recipe(ingredients)
-            if recipe_name:
-                score, evaluation = self.cocktail_system.calculate_score(recipe_name, ingredients)
-            else:
-                # 如果没有匹配的配方，使用自由调酒评分
-                score = self._calculate_free_mixing_score(ingredients)
-                evaluation = "创意鸡尾酒"
-            
-            # 显示结果
-            await self._show_mixing_result(score, recipe_name or "创意鸡尾酒", ingredients)
-            
-        except Exception as e:
-            # 显示错误信息
-            self.notify(f"调酒过程中出现错误: {str(e)}", severity="error")
+        await self._run_mixing_job(ingredients, "调酒过程中出现错误")
     
     async def _start_free_mixing_process(self, ingredients):
         """启动自由调酒过程"""
-        try:
-            # 显示调酒动画
-            await self._show_mixing_animation(ingredients)
-            
-            # 计算分数
-            recipe_name = self.cocktail_system.find_matching_recipe(ingredients)
-            if recipe_name:
-                score, evaluation = self.cocktail_system.calculate_score(recipe_name, ingredients)
-            else:
-                # 如果没有匹配的配方，使用自由调酒评分
-                score = self._calculate_free_mixing_score(ingredients)
-                evaluation = "创意鸡尾酒"
-            
-            # 显示结果
-            await self._show_mixing_result(score, recipe_name or "创意鸡尾酒", ingredients)
-            
-        except Exception as e:
-            # 显示错误信息
-            self.notify(f"调酒过程中出现错误: {str(e)}", severity="error")
+        await self._run_mixing_job(ingredients, "调酒过程中出现错误")
     
     async def _start_recipe_mixing_process(self, recipe):
         """启动按配方调制过程"""
+        await self._run_mixing_job(recipe.ingredients, "按配方调制过程中出现错误", recipe=recipe)
+    
+    async def _run_mixing_job(self, ingredients, error_message, recipe=None):
+        """执行一次调酒：评分与动画同时进行，动画可被跳过"""
+        score_task = None
         try:
-            # 显示调酒动画
-            await self._show_mixing_animation(recipe.ingredients)
+            # 评分不依赖动画，立即开始计算
+            score_task = asyncio.ensure_future(self._score_mix(ingredients, recipe))
             
-            # 按配方调制应该得到满分
-            score = 100
-            recipe_name = recipe.name
+            # 根据实际材料规划动画步骤，进度驱动器用完时间预算时动画结束（可按 F9 跳过）
+            plan = build_mixing_plan(
+                ingredients,
+                self.cocktail_system.ingredients,
+                get_mixing_time_budget(self.cocktail_system.game_config)
+            )
+            animation = self.game_screen.mixing_animation
+            await self.mixing_jobs.play(animation.start_mixing_animation(ingredients, plan))
+            
+            score, recipe_name = await score_task
             
             # 显示结果
-            await self._show_mixing_result(score, recipe_name, recipe.ingredients)
+            await self._show_mixing_result(score, recipe_name, ingredients)
             
+        except asyncio.CancelledError:
+            # 被新的调酒任务取代
+            raise
         except Exception as e:
             # 显示错误信息
-            self.notify(f"按配方调制过程中出现错误: {str(e)}", severity="error")
+            self.game_screen.character.stop_animation()
+            self.notify(f"{error_message}: {str(e)}", severity="error")
+        finally:
+            # 被取代或出错时不让评分请求留在后台继续运行
+            if score_task is not None and not score_task.done():
+                score_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await score_task
     
-    def _calculate_free_mixing_score(self, ingredients):
-        """计算自由调酒的分数"""
-        # 基于材料数量和搭配的简单评分系统
-        score = 0
-        
-        # 基础分数
-        ingredient_count = len([ing for ing in ingredients.values() if ing > 0])
-        score += min(ingredient_count * 15, 60)  # 最多60分
-        
-        # 检查是否有基酒
-        base_spirits = ["伏特加", "白朗姆酒", "威士忌", "龙舌兰酒", "金酒", "白兰地"]
-        has_base = any(ing in ingredients and ingredients[ing] > 0 for ing in base_spirits)
-        if has_base:
-            score += 20
-        
-        # 检查是否有果汁或调酒器
-        mixers = ["青柠汁", "柠檬汁", "橙汁", "蔓越莓汁", "苏打水", "汤力水", "可乐"]
-        has_mixer = any(ing in ingredients and ingredients[ing] > 0 for ing in mixers)
-        if has_mixer:
-            score += 15
-        
-        # 检查是否有装饰
-        garnishes = ["薄荷叶", "柠檬片", "樱桃", "橄榄", "盐", "糖浆"]
-        has_garnish = any(ing in ingredients and ingredients[ing] > 0 for ing in garnishes)
-        if has_garnish:
-            score += 5
-        
-        return min(score, 100)
-    
-    async def _show_mixing_animation(self, ingredients):
-        """显示调酒动画"""
-        steps = [
-            "🧊 准备冰块...",
-            "🥃 倒入基酒...",
-            "🍋 添加果汁...",
-            "🍯 加入糖浆...",
-            "🥄 搅拌混合...",
-            "🌿 装饰点缀...",
-            "✨ 完成调制！"
-        ]
+    async def _score_mix(self, ingredients, recipe=None):
+        """计算调酒得分，返回 (得分, 鸡尾酒名称)"""
+        if recipe is not None:
+            # 按配方调制应该得到满分
+            return 100, recipe.name
         
-        for i, step in enumerate(steps):
-            # 显示当前步骤
-            self.notify(step, title="🍸 调酒中...", severity="information", timeout=1)
-            await asyncio.sleep(1)
+        # 先匹配配方，没有匹配的配方时使用自由调酒评分
+        try:
+            score, recipe_name, evaluation = await self.scoring.score(ingredients)
+        except ConnectionError as e:
+            # 评分服务中途断开，之后改用本地评分
+            self.notify(f"评分服务已断开，改用本地评分: {e}", severity="warning")
+            self.scoring = LocalScoringBackend(self.cocktail_system)
+            score, recipe_name, evaluation = await self.scoring.score(ingredients)
+        return score, recipe_name or "创意鸡尾酒"
     
     async def _show_mixing_result(self, score: int, recipe_name: str, ingredients):
         """显示调酒结果"""
+        self._record("result", recipe=recipe_name, score=score)
         # 获取配方信息和ASCII艺术
         ascii_art = ""
         if recipe_name:
@@ -350,8 +421,8 @@ class TermixApp(App):
         self.notify(content, title=title, severity="information")
         
         # 更新角色状态
-        game_screen = self.query_one("#game", GameScreen)
-        character = game_screen.query_one("#character", Container)
+        character = self.game_screen.character
+        character.stop_animation()
         if score >= 80:
             character.update_character("excited")
         elif score >= 60:
@@ -360,10 +431,40 @@ class TermixApp(App):
             character.update_character("thinking")
 
 
-def main():
-    """主函数"""
-    app = TermixApp()
+def main(argv=None, **app_options):
+    """主函数
+    
+    argv 为 None 时解析命令行；app_options 透传给 TermixApp
+    （如预先加载好的 bunny_girl / cocktail_system）。
+    """
+    parser = argparse.ArgumentParser(description="Termix - 终端调酒游戏")
+    parser.add_argument("--fast", action="store_true", help="快速模式：压缩所有调酒动画的等待时间")
+    parser.add_argument("--scoring-socket", metavar="PATH",
+                        help="连接评分服务的 Unix 套接字（默认读取 TERMIX_SCORING_SOCKET）")
+    parser.add_argument("--profile-startup", nargs="?", const="", metavar="PATH",
+                        help="退出时输出启动时间线 JSON（不指定 PATH 则输出到 stderr）")
+    parser.add_argument("--record", metavar="PATH",
+                        help="把按键、鼠标和消息录制到 PATH，可用 python -m src.session_recorder replay 回放")
+    parser.add_argument("--shared-catalog", metavar="NAME",
+                        help="从共享内存目录加载配方（默认读取 TERMIX_SHARED_CATALOG，见 src.shared_catalog）")
+    parser.add_argument("--seed", type=int, help="随机数种子（台词、提示等）；录制时默认随机生成并写入录制文件")
+    args = parser.parse_args(argv)
+    if args.profile_startup is not None:
+        profiler.enable(args.profile_startup or None)
+    
+    recorder = None
+    if args.record or args.seed is not None:
+        import random
+        seed = args.seed if args.seed is not None else random.SystemRandom().randrange(2 ** 32)
+        random.seed(seed)
+        if args.record:
+            from src.session_recorder import SessionRecorder
+            recorder = SessionRecorder(args.record, seed=seed)
+    
+    app = TermixApp(fast=True if args.fast else None, scoring_socket=args.scoring_socket,
+                    recorder=recorder, shared_catalog=args.shared_catalog, **app_options)
     app.run()
+    return app.return_code or 0
 
 
 if __name__ == "__main__":
@@ -1,6 +1,47 @@
 """
 Termix 游戏模块
+
+包本身不在导入时加载任何子模块：引擎部分（data_models、config_loader、
+cocktail_system 等）只依赖标准库，可供批处理工具直接使用；Textual/Rich
+相关的界面模块只有在真正访问对应名称时才会被导入。
 """
 
+from importlib import import_module
+
 __version__ = "1.0.0"
 __author__ = "Termix Team"
+
+# 名称 -> 所在子模块，按需导入（PEP 562）
+_LAZY_EXPORTS = {
+    # 引擎（仅标准库）
+    "IngredientType": "data_models",
+    "Ingredient": "data_models",
+    "CocktailRecipe": "data_models",
+    "ConfigLoader": "config_loader",
+    "CocktailSystem": "cocktail_system",
+    "RecipeFragments": "recipe_fragments",
+    "MixingStep": "mixing_plan",
+    "build_mixing_plan": "mixing_plan",
+    "Pacing": "pacing",
+    "ProgressDriver": "pacing",
+    # 界面（依赖 Textual/Rich）
+    "BunnyGirl": "character",
+    "WelcomeScreen": "ui_components",
+    "GameScreen": "ui_components",
+    "HelpScreen": "help_system",
+}
+
+__all__ = ["__version__", "__author__", *_LAZY_EXPORTS]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
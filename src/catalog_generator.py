@@ -0,0 +1,296 @@
+"""
+目录生成模块 - 按种子生成确定性的大规模材料和配方目录
+
+生成的分布以自带配置（config/）为模型：材料类型的比例、配方的材料数、
+配方中各类材料的出现频率和用量、风味标签、难度、分类和表情都从自带目录
+统计而来。材料和配方逐条写出，生成百万级配方时内存占用与规模无关。
+
+    python -m src.catalog_generator big_catalog --recipes 1000000 --seed 1
+    python main.py ...  # 或 demo.py --config-dir big_catalog、基准测试等
+
+同一种子和参数总是生成完全相同的文件。输出目录可以直接交给
+ConfigLoader(output_dir) 加载。
+"""
+
+import collections
+import itertools
+import json
+import os
+import random
+import shutil
+from typing import Any, Dict, List, Optional
+
+# 派生材料、配方名称时使用的修饰词
+_VARIANTS = ["陈酿", "特级", "手工", "有机", "烟熏", "冰镇", "鲜榨", "香草", "蜂蜜", "辛辣",
+             "金标", "银标", "经典", "珍藏", "小批量", "海岛", "山地", "晨露", "暮色", "午夜"]
+_IO_BUFFER_SIZE = 1 << 20
+
+
+class CatalogModel:
+    """从一份配置目录统计出的分布"""
+
+    def __init__(self, config_dir: str = "config"):
+        self.config_dir = config_dir
+        with open(os.path.join(config_dir, "ingredients.json"), "r", encoding="utf-8") as f:
+            self.ingredients: List[Dict[str, Any]] = json.load(f)["ingredients"]
+        with open(os.path.join(config_dir, "recipes.json"), "r", encoding="utf-8") as f:
+            self.recipes: List[Dict[str, Any]] = json.load(f)["recipes"]
+
+        type_of = {item["name"]: item["type"] for item in self.ingredients}
+        self.ingredients_by_type: Dict[str, List[Dict[str, Any]]] = collections.defaultdict(list)
+        for item in self.ingredients:
+            self.ingredients_by_type[item["type"]].append(item)
+        self.flavors_by_type = {
+            ingredient_type: sorted({flavor for item in items for flavor in item["flavor_profile"]})
+            for ingredient_type, items in self.ingredients_by_type.items()
+        }
+        self.ingredient_types = sorted(self.ingredients_by_type)
+        self.ingredient_type_weights = [len(self.ingredients_by_type[t]) for t in self.ingredient_types]
+
+        # 配方：材料数、各类材料在配方中的出现频率和用量
+        self.recipe_sizes = [len(recipe["ingredients"]) for recipe in self.recipes]
+        slot_types = collections.Counter()
+        self.amounts_by_type: Dict[str, List[float]] = collections.defaultdict(list)
+        self.max_per_recipe: Dict[str, int] = collections.defaultdict(int)  # 如冰块每杯只用一种
+        with_base = 0
+        for recipe in self.recipes:
+            types = [type_of.get(name) for name in recipe["ingredients"]]
+            with_base += "BASE_SPIRIT" in types
+            for ingredient_type, used in collections.Counter(types).items():
+                self.max_per_recipe[ingredient_type] = max(self.max_per_recipe[ingredient_type], used)
+            for name, amount in recipe["ingredients"].items():
+                if name in type_of:
+                    slot_types[type_of[name]] += 1
+                    self.amounts_by_type[type_of[name]].append(amount)
+        self.base_spirit_share = with_base / len(self.recipes) if self.recipes else 0.0
+        self.slot_types = sorted(slot_types)
+        self.slot_type_weights = [slot_types[t] for t in self.slot_types]
+
+        tags = collections.Counter(tag for recipe in self.recipes for tag in recipe["flavor_tags"])
+        self.tags = sorted(tags)
+        self.tag_weights = [tags[tag] for tag in self.tags]
+        self.tag_counts = [len(recipe["flavor_tags"]) for recipe in self.recipes]
+        self.difficulties = [recipe["difficulty"] for recipe in self.recipes]
+        self.emojis = [recipe["emoji"] for recipe in self.recipes]
+        self.categories = [recipe.get("category", "经典系列") for recipe in self.recipes]
+
+
+class CatalogGenerator:
+    """确定性目录生成器"""
+
+    def __init__(self, model: CatalogModel, seed: int = 0, include_shipped: bool = True):
+        self.model = model
+        self.seed = seed
+        self.include_shipped = include_shipped
+
+    def iter_ingredients(self, count: int):
+        """产出 count 个材料：先是模型中的材料，其余由同类材料派生"""
+        model = self.model
+        rng = random.Random(f"{self.seed}:ingredients")
+        names = set()
+        shipped = model.ingredients if self.include_shipped else []
+        for item in shipped[:count]:
+            names.add(item["name"])
+            yield item
+
+        for index in range(len(names), count):
+            ingredient_type = rng.choices(model.ingredient_types, model.ingredient_type_weights)[0]
+            template = rng.choice(model.ingredients_by_type[ingredient_type])
+            variant = rng.choice(_VARIANTS)
+            name = f"{variant}{template['name']}"
+            if name in names:
+                name = f"{name} {index}"
+            names.add(name)
+
+            flavors = list(template["flavor_profile"])
+            extra = rng.choice(model.flavors_by_type[ingredient_type])
+            if extra not in flavors:
+                flavors.append(extra)
+            alcohol = template["alcohol_content"]
+            if alcohol:
+                alcohol = round(min(alcohol * rng.uniform(0.85, 1.15), 95.0), 1)
+            yield {
+                "name": name,
+                "type": ingredient_type,
+                "color": template["color"],
+                "flavor_profile": flavors,
+                "alcohol_content": alcohol,
+                "emoji": template["emoji"],
+                "description": f"{variant}款 · {template['description']}",
+            }
+
+    def iter_recipes(self, count: int, ingredients: List[Dict[str, Any]]):
+        """产出 count 个配方，只使用给定的材料"""
+        model = self.model
+        rng = random.Random(f"{self.seed}:recipes")
+        by_type: Dict[str, List[str]] = collections.defaultdict(list)
+        for item in ingredients:
+            by_type[item["type"]].append(item["name"])
+        slot_types = [t for t in model.slot_types if by_type.get(t)]
+        # 预先累加权重，避免每次 choices 重新计算
+        slot_weights = list(itertools.accumulate(
+            w for t, w in zip(model.slot_types, model.slot_type_weights) if by_type.get(t)))
+        tag_weights = list(itertools.accumulate(model.tag_weights))
+        available = {item["name"] for item in ingredients}
+
+        produced = 0
+        if self.include_shipped:
+            for recipe in model.recipes:
+                if produced >= count:
+                    return
+                if all(name in available for name in recipe["ingredients"]):
+                    produced += 1
+                    yield recipe
+
+        for index in range(produced, count):
+            size = min(rng.choice(model.recipe_sizes), len(available))
+            chosen: Dict[str, float] = {}
+            used = collections.Counter()
+            if by_type.get("BASE_SPIRIT") and rng.random() < model.base_spirit_share:
+                chosen[rng.choice(by_type["BASE_SPIRIT"])] = self._amount(rng, "BASE_SPIRIT")
+                used["BASE_SPIRIT"] += 1
+            attempts = 0
+            while len(chosen) < size and attempts < size * 8:
+                attempts += 1
+                ingredient_type = rng.choices(slot_types, cum_weights=slot_weights)[0]
+                name = rng.choice(by_type[ingredient_type])
+                if name in chosen or used[ingredient_type] >= model.max_per_recipe[ingredient_type]:
+                    continue
+                chosen[name] = self._amount(rng, ingredient_type)
+                used[ingredient_type] += 1
+
+            template = rng.choice(model.recipes)
+            tags = set()
+            for _ in range(rng.choice(model.tag_counts)):
+                tags.add(rng.choices(model.tags, cum_weights=tag_weights)[0])
+            yield {
+                "name": f"{rng.choice(_VARIANTS)}{template['name']} No.{index}",
+                "category": rng.choice(model.categories),
+                "ingredients": chosen,
+                "description": f"以{next(iter(chosen))}为主的{'、'.join(sorted(tags))}风格鸡尾酒",
+                "difficulty": rng.choice(model.difficulties),
+                "emoji": rng.choice(model.emojis),
+                "flavor_tags": sorted(tags),
+            }
+
+    def _amount(self, rng, ingredient_type):
+        amounts = self.model.amounts_by_type.get(ingredient_type) or [30]
+        return max(1, round(rng.choice(amounts) * rng.uniform(0.8, 1.25)))
+
+    def write(self, output_dir: str, recipes: int, ingredients: Optional[int] = None,
+              attempts: int = 0) -> Dict[str, int]:
+        """生成目录写入 output_dir，返回各文件的条目数
+
+        ingredients 为 None 时按配方数取一个与自带目录比例相当的材料数。
+        attempts 大于 0 时另外写出 attempts.jsonl（供 grade.py、评分服务压测）。
+        """
+        if ingredients is None:
+            ingredients = default_ingredient_count(recipes, len(self.model.ingredients))
+        os.makedirs(output_dir, exist_ok=True)
+        shutil.copyfile(os.path.join(self.model.config_dir, "game_config.json"),
+                        os.path.join(output_dir, "game_config.json"))
+
+        ingredient_list = list(self.iter_ingredients(ingredients))
+        _write_json_array(os.path.join(output_dir, "ingredients.json"), "ingredients", ingredient_list)
+
+        # 配方逐条写出；需要压测记录时用蓄水池抽样保留固定数量的配方
+        sampler = _Reservoir(attempts, random.Random(f"{self.seed}:attempts"))
+        recipe_count = _write_json_array(
+            os.path.join(output_dir, "recipes.json"), "recipes",
+            (sampler.offer(recipe) for recipe in self.iter_recipes(recipes, ingredient_list)),
+        )
+        if attempts:
+            self._write_attempts(os.path.join(output_dir, "attempts.jsonl"), sampler.items, ingredient_list)
+
+        return {"ingredients": len(ingredient_list), "recipes": recipe_count, "attempts": len(sampler.items)}
+
+    def _write_attempts(self, path, recipes, ingredients):
+        """按配方调酒、照配方自由调酒和随意混合各占约三分之一"""
+        rng = random.Random(f"{self.seed}:attempt-mixes")
+        names = [item["name"] for item in ingredients]
+        with open(path, "w", encoding="utf-8", buffering=_IO_BUFFER_SIZE) as f:
+            for index, recipe in enumerate(recipes):
+                kind = index % 3
+                if kind == 2:
+                    mix = {name: rng.randint(5, 120) for name in rng.sample(names, min(len(names), rng.randint(2, 6)))}
+                    attempt = {"id": index, "ingredients": mix}
+                else:
+                    mix = {name: round(amount * rng.uniform(0.85, 1.15), 1)
+                           for name, amount in recipe["ingredients"].items()}
+                    attempt = {"id": index, "recipe": recipe["name"] if kind == 0 else None, "ingredients": mix}
+                f.write(json.dumps(attempt, ensure_ascii=False) + "\n")
+
+
+class _Reservoir:
+    """蓄水池抽样：从流中等概率保留 size 个元素，原样返回每个元素"""
+
+    def __init__(self, size: int, rng: random.Random):
+        self.size = size
+        self.rng = rng
+        self.items: List[Any] = []
+        self.seen = 0
+
+    def offer(self, item):
+        if self.size:
+            self.seen += 1
+            if len(self.items) < self.size:
+                self.items.append(item)
+            else:
+                slot = self.rng.randrange(self.seen)
+                if slot < self.size:
+                    self.items[slot] = item
+        return item
+
+
+def default_ingredient_count(recipes: int, shipped: int = 40) -> int:
+    """默认材料数：小目录沿用自带材料，大目录每 250 个配方约一种材料，最多 2000 种"""
+    return min(2000, max(shipped, recipes // 250))
+
+
+def _write_json_array(path, key, items) -> int:
+    """把 {"key": [...]} 逐条写出，返回条目数"""
+    count = 0
+    with open(path, "w", encoding="utf-8", buffering=_IO_BUFFER_SIZE) as f:
+        f.write('{\n  "%s": [' % key)
+        for item in items:
+            f.write(",\n    " if count else "\n    ")
+            f.write(json.dumps(item, ensure_ascii=False))
+            count += 1
+        f.write("\n  ]\n}\n")
+    return count
+
+
+def generate_catalog(output_dir: str, recipes: int, ingredients: Optional[int] = None, seed: int = 0,
+                     attempts: int = 0, model_dir: str = "config", include_shipped: bool = True) -> Dict[str, int]:
+    """按自带配置的分布生成目录"""
+    generator = CatalogGenerator(CatalogModel(model_dir), seed=seed, include_shipped=include_shipped)
+    return generator.write(output_dir, recipes, ingredients, attempts)
+
+
+def main():
+    """生成目录"""
+    import argparse
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description="Termix 目录生成器：按自带配置的分布生成大规模目录")
+    parser.add_argument("output", help="输出目录（写入 ingredients.json、recipes.json、game_config.json）")
+    parser.add_argument("--recipes", type=int, required=True, help="配方数")
+    parser.add_argument("--ingredients", type=int, help="材料数（默认随配方数增长，至少为自带材料数）")
+    parser.add_argument("--seed", type=int, default=0, help="随机数种子（默认 0）")
+    parser.add_argument("--attempts", type=int, default=0, help="另外生成多少条调酒记录 attempts.jsonl")
+    parser.add_argument("--model-dir", default="config", help="作为分布模型的配置目录（默认 config）")
+    parser.add_argument("--no-shipped", action="store_true", help="不包含模型目录中原有的材料和配方")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = generate_catalog(args.output, args.recipes, args.ingredients, args.seed,
+                              args.attempts, args.model_dir, not args.no_shipped)
+    elapsed = time.perf_counter() - started
+    print(f"已生成 {counts['ingredients']} 种材料、{counts['recipes']} 个配方"
+          + (f"、{counts['attempts']} 条调酒记录" if counts["attempts"] else "")
+          + f" → {args.output}（{elapsed:.1f} 秒）", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
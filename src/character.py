@@ -6,6 +6,8 @@ from rich.text import Text
 from rich.console import Console
 from rich.panel import Panel
 from rich.align import Align
+from rich.segment import Segment
+from typing import Dict, List, Tuple
 import time
 import random
 
@@ -13,13 +15,34 @@ import random
 class BunnyGirl:
     """兔女郎角色类"""
     
+    # 每种心情实际不同的帧数，帧号按此取模后作为缓存键
+    FRAME_VARIANTS = {
+        "happy": 1,
+        "working": 2,
+        "excited": 3
+    }
+    
     def __init__(self):
         self.name = "小兔"
         self.mood = "happy"  # happy, working, excited, tired
         self.animation_frame = 0
+        self._art_cache: Dict[Tuple[str, int], str] = {}
+    
+    def frame_variant(self, mood="happy", frame=0) -> int:
+        """将帧号归一化为该心情下的帧变体"""
+        return frame % self.FRAME_VARIANTS.get(mood, 1)
     
     def get_ascii_art(self, mood="happy", frame=0):
-        """获取兔女郎的ASCII艺术"""
+        """获取兔女郎的ASCII艺术（每个心情和帧只构建一次）"""
+        key = (mood, self.frame_variant(mood, frame))
+        art = self._art_cache.get(key)
+        if art is None:
+            art = self._build_ascii_art(mood, key[1])
+            self._art_cache[key] = art
+        return art
+    
+    def _build_ascii_art(self, mood, frame):
+        """构建兔女郎的ASCII艺术"""
         
         if mood == "happy":
             return self._get_happy_bunny(frame)
@@ -184,7 +207,7 @@ class BunnyGirl:
         return random.choice(dialogues.get(context, dialogues["greeting"]))
     
     def animate_working(self, duration=3):
-        """工作动画"""
+        """工作动画（仅用于独立控制台，会阻塞；Textual 界面请使用 CharacterDisplay.start_animation）"""
         console = Console()
         frames = 6
         
@@ -217,6 +240,73 @@ class BunnyGirl:
         return panel
 
 
+class BakedFrame:
+    """已渲染好的角色帧（按行保存的分段），显示时无需再次测量"""
+    
+    def __init__(self, key: Tuple[str, int, str], lines: List[List[Segment]], width: int):
+        self.key = key
+        self.lines = lines
+        self.width = width
+
+
+class CharacterFrameCache:
+    """角色帧缓存 - 按心情、帧和对话缓存指定宽度下渲染好的面板
+    
+    同时记录帧与帧之间发生变化的行号，动画时只需重绘这些行。
+    """
+    
+    def __init__(self, bunny_girl, title="🐰 调酒师小兔", border_style="magenta"):
+        self.bunny_girl = bunny_girl
+        self.title = title
+        self.border_style = border_style
+        self.width = 0
+        self._frames: Dict[Tuple[str, int, str], BakedFrame] = {}
+        self._deltas: Dict[Tuple[Tuple, Tuple], List[int]] = {}
+    
+    def get_frame(self, console, mood, frame, dialogue, width) -> BakedFrame:
+        """获取渲染好的帧，宽度变化时整体重建"""
+        if width != self.width:
+            self._frames.clear()
+            self._deltas.clear()
+            self.width = width
+        
+        key = (mood, self.bunny_girl.frame_variant(mood, frame), dialogue)
+        baked = self._frames.get(key)
+        if baked is None:
+            art = self.bunny_girl.get_ascii_art(mood, frame)
+            panel = Panel(
+                Align.center(f"{art}\n\n💬 {dialogue}"),
+                title=self.title,
+                border_style=self.border_style
+            )
+            lines = console.render_lines(panel, console.options.update_width(width))
+            baked = BakedFrame(key, lines, width)
+            self._frames[key] = baked
+        return baked
+    
+    def get_delta(self, previous: BakedFrame, current: BakedFrame) -> List[int]:
+        """获取两帧之间内容不同的行号"""
+        delta_key = (previous.key, current.key)
+        changed = self._deltas.get(delta_key)
+        if changed is None:
+            changed = [
+                y for y, (old_line, new_line) in enumerate(zip(previous.lines, current.lines))
+                if old_line != new_line
+            ]
+            # 行数不同时多出的行也需要重绘
+            shorter = min(len(previous.lines), len(current.lines))
+            changed.extend(range(shorter, max(len(previous.lines), len(current.lines))))
+            self._deltas[delta_key] = changed
+        return changed
+    
+    def bake(self, console, mood, dialogue, width):
+        """预先渲染某个心情下的所有帧，并计算相邻帧之间的差异"""
+        variants = self.bunny_girl.FRAME_VARIANTS.get(mood, 1)
+        frames = [self.get_frame(console, mood, frame, dialogue, width) for frame in range(variants)]
+        for index, frame in enumerate(frames):
+            self.get_delta(frame, frames[(index + 1) % variants])
+
+
 # 测试代码
 if __name__ == "__main__":
     bunny = BunnyGirl()
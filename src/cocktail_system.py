@@ -2,32 +2,102 @@
 调酒系统 - 管理调酒材料、配方和评分
 """
 
-import random
-from typing import Dict, List, Tuple
+from __future__ import annotations
 
 from .data_models import Ingredient, CocktailRecipe, IngredientType
 from .config_loader import config_loader
+from .recipe_fragments import RecipeFragmentCache, RecipeFragments
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, List, Tuple
+
+# 计算用量偏差时分母的下限：配方中用量为 0 的材料（如装饰）不会导致除以零
+MIN_RECIPE_AMOUNT = 1e-6
 
 
 class CocktailSystem:
     """调酒系统主类"""
     
-    def __init__(self):
-        # 从配置文件加载数据
-        self.game_config = config_loader.load_game_config()
-        self.ingredients = config_loader.load_ingredients()
-        self.recipes = config_loader.load_recipes()
+    def __init__(self, loader=None):
+        # 从配置文件加载数据（默认读取 config/，也可传入其他目录的 ConfigLoader）
+        loader = loader or config_loader
+        game_config = loader.load_game_config()
+        ingredients = loader.load_ingredients()
+        recipes = loader.load_recipes()
         
         # 如果配置文件为空，使用内置数据作为后备
-        if not self.ingredients:
-            self.ingredients = self._init_ingredients()
-        if not self.recipes:
-            self.recipes = self._init_recipes()
+        if not ingredients:
+            ingredients = self._init_ingredients()
+        if not recipes:
+            recipes = self._init_recipes()
+        
+        self._init_catalog(game_config, ingredients, recipes)
+    
+    @classmethod
+    def from_catalog(cls, game_config: Dict, ingredients: Dict[str, Ingredient],
+                     recipes: Dict[str, CocktailRecipe]) -> "CocktailSystem":
+        """用已加载好的目录构建调酒系统（不读取配置文件），如来自共享内存的目录"""
+        system = cls.__new__(cls)
+        system._init_catalog(game_config, ingredients, recipes)
+        return system
+    
+    def _init_catalog(self, game_config, ingredients, recipes):
+        """设置目录数据并构建索引"""
+        self.game_config = game_config
+        self.ingredients = ingredients
+        self.recipes = recipes
         
         self.player_inventory = list(self.ingredients.keys())  # 玩家拥有的材料
         
         # 默认解锁所有配方
         self.unlocked_recipes = list(self.recipes.keys())
+        
+        # 加载时预先计算分类索引，避免界面每次渲染重新扫描
+        self.catalog_version = 0
+        self._fragment_cache = RecipeFragmentCache()
+        self._build_catalog_indexes()
+    
+    def _build_catalog_indexes(self):
+        """构建配方分类和材料类型索引"""
+        # 目录变化时版本号递增，依赖目录的缓存据此失效
+        self.catalog_version += 1
+        
+        self.recipe_categories: Dict[str, List[str]] = {}
+        for name in self.unlocked_recipes:
+            if name in self.recipes:
+                category = self._categorize_recipe(self.recipes[name])
+                self.recipe_categories.setdefault(category, []).append(name)
+        
+        self.ingredients_by_type: Dict[str, List[str]] = {}
+        for name in self.player_inventory:
+            type_name = self.ingredients[name].type.value
+            self.ingredients_by_type.setdefault(type_name, []).append(name)
+        
+        # 搜索用的小写文本：名称单独保存，用于名称匹配优先排序
+        self._search_index: List[Tuple[str, str, str]] = [
+            (
+                name,
+                name.lower(),
+                " ".join([recipe.description, *recipe.flavor_tags, *recipe.ingredients]).lower(),
+            )
+            for name, recipe in self.recipes.items()
+        ]
+    
+    @staticmethod
+    def _categorize_recipe(recipe: CocktailRecipe) -> str:
+        """从配方的flavor_tags推断分类"""
+        if "经典" in recipe.flavor_tags:
+            return "经典系列"
+        elif "热带" in recipe.flavor_tags:
+            return "热带系列"
+        elif "果味" in recipe.flavor_tags:
+            return "果味系列"
+        elif "咖啡" in recipe.flavor_tags:
+            return "咖啡系列"
+        elif any(tag in ["创意", "复杂", "强烈"] for tag in recipe.flavor_tags):
+            return "创意系列"
+        return "其他"
     
     def _init_ingredients(self) -> Dict[str, Ingredient]:
         """初始化调酒材料"""
@@ -768,6 +838,39 @@ class CocktailSystem:
         """获取已解锁的配方"""
         return [self.recipes[name] for name in self.unlocked_recipes if name in self.recipes]
     
+    def get_recipes_by_category(self) -> Dict[str, List[CocktailRecipe]]:
+        """获取按分类分组的已解锁配方"""
+        return {
+            category: [self.recipes[name] for name in names]
+            for category, names in self.recipe_categories.items()
+        }
+    
+    def get_ingredients_by_type(self) -> Dict[str, List[Ingredient]]:
+        """获取按类型分组的可用材料"""
+        return {
+            type_name: [self.ingredients[name] for name in names]
+            for type_name, names in self.ingredients_by_type.items()
+        }
+    
+    def search_recipes(self, query: str, limit: int = 20) -> List[str]:
+        """按名称、描述、风味标签和材料搜索配方，名称命中的排在前面"""
+        query = query.strip().lower()
+        if not query:
+            return []
+        
+        name_hits = []
+        other_hits = []
+        for name, name_text, detail_text in self._search_index:
+            if query in name_text:
+                name_hits.append(name)
+            elif query in detail_text:
+                other_hits.append(name)
+        return (name_hits + other_hits)[:limit]
+    
+    def get_recipe_fragments(self, recipe: CocktailRecipe) -> RecipeFragments:
+        """获取配方的预渲染标记片段"""
+        return self._fragment_cache.get(recipe, self.catalog_version)
+    
     def calculate_score(self, recipe_name: str, player_ingredients: Dict[str, float]) -> Tuple[int, str]:
         """
         计算调酒得分
@@ -802,7 +905,7 @@ class CocktailSystem:
                 feedback.append(f"缺少 {ingredient_name}")
             else:
                 # 计算用量偏差
-                deviation = abs(player_amount - correct_amount) / correct_amount
+                deviation = abs(player_amount - correct_amount) / (correct_amount or MIN_RECIPE_AMOUNT)
                 if deviation > major_tolerance:
                     score -= major_penalty
                     feedback.append(f"{ingredient_name} 用量偏差较大")
@@ -819,22 +922,83 @@ class CocktailSystem:
         # 确保得分不为负
         score = max(0, score)
         
-        # 生成评价
+        return score, self.evaluate_score(score)
+    
+    @staticmethod
+    def evaluate_score(score: int) -> str:
+        """根据得分生成评价"""
         if score >= 90:
-            evaluation = "完美！🌟"
+            return "完美！🌟"
         elif score >= 80:
-            evaluation = "很棒！👏"
+            return "很棒！👏"
         elif score >= 70:
-            evaluation = "不错！👍"
+            return "不错！👍"
         elif score >= 60:
-            evaluation = "还可以 😊"
+            return "还可以 😊"
         else:
-            evaluation = "需要改进 😅"
+            return "需要改进 😅"
+    
+    def calculate_free_mixing_score(self, ingredients: Dict[str, float]) -> int:
+        """计算自由调酒的分数"""
+        # 基于材料数量和搭配的简单评分系统
+        score = 0
+        
+        # 基础分数
+        ingredient_count = len([ing for ing in ingredients.values() if ing > 0])
+        score += min(ingredient_count * 15, 60)  # 最多60分
+        
+        # 检查是否有基酒
+        base_spirits = ["伏特加", "白朗姆酒", "威士忌", "龙舌兰酒", "金酒", "白兰地"]
+        has_base = any(ing in ingredients and ingredients[ing] > 0 for ing in base_spirits)
+        if has_base:
+            score += 20
         
-        return score, evaluation
+        # 检查是否有果汁或调酒器
+        mixers = ["青柠汁", "柠檬汁", "橙汁", "蔓越莓汁", "苏打水", "汤力水", "可乐"]
+        has_mixer = any(ing in ingredients and ingredients[ing] > 0 for ing in mixers)
+        if has_mixer:
+            score += 15
+        
+        # 检查是否有装饰
+        garnishes = ["薄荷叶", "柠檬片", "樱桃", "橄榄", "盐", "糖浆"]
+        has_garnish = any(ing in ingredients and ingredients[ing] > 0 for ing in garnishes)
+        if has_garnish:
+            score += 5
+        
+        return min(score, 100)
+    
+    def grade_mix(self, ingredients: Dict[str, float], recipe_name: str = None) -> Tuple[int, str, str]:
+        """
+        为一次调酒评分：指定配方时按该配方评分，
+        否则先查找匹配的配方，找不到再按自由调酒评分
+        返回: (得分, 配方名称, 评价)，自由调酒的配方名称为空字符串
+        """
+        if not recipe_name:
+            recipe_name = self.find_matching_recipe(ingredients)
+        if recipe_name:
+            score, evaluation = self.calculate_score(recipe_name, ingredients)
+            return score, recipe_name, evaluation
+        
+        score = self.calculate_free_mixing_score(ingredients)
+        return score, "", self.evaluate_score(score)
+    
+    def find_matching_recipe(self, player_ingredients: Dict[str, float], tolerance: float = 0.2) -> str:
+        """查找与玩家材料匹配的配方（材料相同且用量误差在容差内）"""
+        used = {name: amount for name, amount in player_ingredients.items() if amount > 0}
+        for recipe_name, recipe in self.recipes.items():
+            if set(used.keys()) != set(recipe.ingredients.keys()):
+                continue
+            if all(
+                abs(amount - recipe.ingredients[name]) / (recipe.ingredients[name] or MIN_RECIPE_AMOUNT) <= tolerance
+                for name, amount in used.items()
+            ):
+                return recipe_name
+        return ""
     
     def get_random_recipe_hint(self) -> str:
         """获取随机配方提示"""
+        import random  # 仅此处使用，避免引擎导入时加载 random
+
         hints = [
             "💡 莫吉托需要薄荷叶来增加清香",
             "💡 玛格丽特的杯口需要用盐装饰",
@@ -848,6 +1012,9 @@ class CocktailSystem:
         """解锁新配方"""
         if recipe_name in self.recipes and recipe_name not in self.unlocked_recipes:
             self.unlocked_recipes.append(recipe_name)
+            category = self._categorize_recipe(self.recipes[recipe_name])
+            self.recipe_categories.setdefault(category, []).append(recipe_name)
+            self.catalog_version += 1
             return True
         return False
 
@@ -2,28 +2,49 @@
 配置加载器模块 - 从外部文件加载游戏数据
 """
 
-import json
+from __future__ import annotations
+
 import os
-from typing import Dict, List, Any
-from pathlib import Path
 
 from .data_models import Ingredient, CocktailRecipe, IngredientType
+from .startup_profiler import profiler
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, List
+
+
+def _read_json(path: str):
+    """读取 JSON 文件（json 会连带导入 re，只在真正读写配置时才导入）"""
+    import json
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json(path: str, data):
+    """写入 JSON 文件"""
+    import json
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
 
 
 class ConfigLoader:
     """配置文件加载器"""
     
     def __init__(self, config_dir: str = "config"):
-        self.config_dir = Path(config_dir)
-        self.ingredients_file = self.config_dir / "ingredients.json"
-        self.recipes_file = self.config_dir / "recipes.json"
-        self.game_config_file = self.config_dir / "game_config.json"
+        # 使用 os.path 而非 pathlib：引擎导入时不必连带加载 pathlib/urllib
+        self.config_dir = config_dir
+        self.ingredients_file = os.path.join(config_dir, "ingredients.json")
+        self.recipes_file = os.path.join(config_dir, "recipes.json")
+        self.game_config_file = os.path.join(config_dir, "game_config.json")
     
+    @profiler.timed("config:ingredients.json")
     def load_ingredients(self) -> Dict[str, Ingredient]:
         """从JSON文件加载材料数据"""
         try:
-            with open(self.ingredients_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json(self.ingredients_file)
             
             ingredients = {}
             for item in data.get("ingredients", []):
@@ -54,18 +75,18 @@ class ConfigLoader:
         except FileNotFoundError:
             print(f"⚠️  材料配置文件 {self.ingredients_file} 不存在，使用默认配置")
             return self._get_default_ingredients()
-        except json.JSONDecodeError as e:
+        except ValueError as e:  # 包括 json.JSONDecodeError
             print(f"❌ 材料配置文件格式错误: {e}")
             return self._get_default_ingredients()
         except Exception as e:
             print(f"❌ 加载材料配置时出错: {e}")
             return self._get_default_ingredients()
     
+    @profiler.timed("config:recipes.json")
     def load_recipes(self) -> Dict[str, CocktailRecipe]:
         """从JSON文件加载配方数据"""
         try:
-            with open(self.recipes_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json(self.recipes_file)
             
             recipes = {}
             for item in data.get("recipes", []):
@@ -84,22 +105,22 @@ class ConfigLoader:
         except FileNotFoundError:
             print(f"⚠️  配方配置文件 {self.recipes_file} 不存在，使用默认配置")
             return self._get_default_recipes()
-        except json.JSONDecodeError as e:
+        except ValueError as e:  # 包括 json.JSONDecodeError
             print(f"❌ 配方配置文件格式错误: {e}")
             return self._get_default_recipes()
         except Exception as e:
             print(f"❌ 加载配方配置时出错: {e}")
             return self._get_default_recipes()
     
+    @profiler.timed("config:game_config.json")
     def load_game_config(self) -> Dict[str, Any]:
         """加载游戏配置"""
         try:
-            with open(self.game_config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _read_json(self.game_config_file)
         except FileNotFoundError:
             print(f"⚠️  游戏配置文件 {self.game_config_file} 不存在，使用默认配置")
             return self._get_default_game_config()
-        except json.JSONDecodeError as e:
+        except ValueError as e:  # 包括 json.JSONDecodeError
             print(f"❌ 游戏配置文件格式错误: {e}")
             return self._get_default_game_config()
         except Exception as e:
@@ -189,16 +210,16 @@ class ConfigLoader:
             },
             "ui_settings": {
                 "items_per_page": 6,
-                "auto_layout_threshold": 100
+                "auto_layout_threshold": 100,
+                "render_fps": 60
             }
         }
     
     def save_user_config(self, config_data: Dict[str, Any], filename: str = "user_config.json"):
         """保存用户配置"""
         try:
-            user_config_file = self.config_dir / filename
-            with open(user_config_file, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, ensure_ascii=False, indent=2)
+            user_config_file = os.path.join(self.config_dir, filename)
+            _write_json(user_config_file, config_data)
             return True
         except Exception as e:
             print(f"❌ 保存用户配置时出错: {e}")
@@ -207,9 +228,8 @@ class ConfigLoader:
     def load_user_config(self, filename: str = "user_config.json") -> Dict[str, Any]:
         """加载用户配置"""
         try:
-            user_config_file = self.config_dir / filename
-            with open(user_config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            user_config_file = os.path.join(self.config_dir, filename)
+            return _read_json(user_config_file)
         except FileNotFoundError:
             return {}
         except Exception as e:
@@ -247,10 +267,10 @@ class ConfigLoader:
     def create_sample_configs(self):
         """创建示例配置文件"""
         # 确保配置目录存在
-        self.config_dir.mkdir(exist_ok=True)
+        os.makedirs(self.config_dir, exist_ok=True)
         
         # 创建示例材料配置
-        if not self.ingredients_file.exists():
+        if not os.path.exists(self.ingredients_file):
             ingredients_data = {
                 "ingredients": [
                     {
@@ -265,11 +285,10 @@ class ConfigLoader:
                 ]
             }
             
-            with open(self.ingredients_file, 'w', encoding='utf-8') as f:
-                json.dump(ingredients_data, f, ensure_ascii=False, indent=2)
+            _write_json(self.ingredients_file, ingredients_data)
         
         # 创建示例配方配置
-        if not self.recipes_file.exists():
+        if not os.path.exists(self.recipes_file):
             recipes_data = {
                 "recipes": [
                     {
@@ -287,8 +306,7 @@ class ConfigLoader:
                 ]
             }
             
-            with open(self.recipes_file, 'w', encoding='utf-8') as f:
-                json.dump(recipes_data, f, ensure_ascii=False, indent=2)
+            _write_json(self.recipes_file, recipes_data)
 
 
 # 全局配置加载器实例
@@ -1,11 +1,18 @@
 """
 数据模型 - 定义游戏中的数据结构
+
+引擎导入路径上的模块不使用 typing 和 dataclasses：typing 只在类型检查时导入，
+数据类手写构造函数（dataclasses 会连带导入 inspect，单这一项约占 12ms）。
 """
 
-from typing import Dict, List
-from dataclasses import dataclass
+from __future__ import annotations
+
 from enum import Enum
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, List
+
 
 class IngredientType(Enum):
     """材料类型枚举"""
@@ -16,25 +23,49 @@ class IngredientType(Enum):
     ICE = "冰块"
 
 
-@dataclass
-class Ingredient:
+class Record:
+    """简单数据记录：按 _fields 提供相等比较和 repr，子类自己写构造函数"""
+
+    _fields: tuple = ()
+    __hash__ = None
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._fields)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{self.__class__.__name__}({fields})"
+
+
+class Ingredient(Record):
     """调酒材料"""
-    name: str
-    type: IngredientType
-    color: str
-    flavor_profile: List[str]
-    alcohol_content: float
-    emoji: str
-    description: str
 
+    _fields = ("name", "type", "color", "flavor_profile", "alcohol_content", "emoji", "description")
+
+    def __init__(self, name: str, type: IngredientType, color: str, flavor_profile: List[str],
+                 alcohol_content: float, emoji: str, description: str):
+        self.name = name
+        self.type = type
+        self.color = color
+        self.flavor_profile = flavor_profile
+        self.alcohol_content = alcohol_content
+        self.emoji = emoji
+        self.description = description
 
-@dataclass
-class CocktailRecipe:
+
+class CocktailRecipe(Record):
     """鸡尾酒配方"""
-    name: str
-    ingredients: Dict[str, float]  # 材料名称 -> 用量(ml)
-    description: str
-    difficulty: int  # 1-5 难度等级
-    emoji: str
-    flavor_tags: List[str]
-    ascii_art: str = ""  # ASCII艺术图片
+
+    _fields = ("name", "ingredients", "description", "difficulty", "emoji", "flavor_tags", "ascii_art")
+
+    def __init__(self, name: str, ingredients: Dict[str, float], description: str, difficulty: int,
+                 emoji: str, flavor_tags: List[str], ascii_art: str = ""):
+        self.name = name
+        self.ingredients = ingredients  # 材料名称 -> 用量(ml)
+        self.description = description
+        self.difficulty = difficulty  # 1-5 难度等级
+        self.emoji = emoji
+        self.flavor_tags = flavor_tags
+        self.ascii_art = ascii_art  # ASCII艺术图片
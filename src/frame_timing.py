@@ -0,0 +1,406 @@
+"""
+界面帧时间基准模块 - 无头运行 TermixApp，按脚本操作并统计交互延迟和重绘耗时
+
+通过 Textual 的 run_test 挂载应用，依次执行几组脚本化的操作：
+
+    ingredient-paging   材料界面用 A/D 翻页
+    ingredient-select   材料界面用 1-6 选择材料、C 清空
+    recipe-paging       配方书用 A/D 翻页
+    free-mixing-add     自由调酒界面输入用量并添加材料
+    view-switch         用 F2-F5 切换视图（F1 由应用绑定为帮助，回到材料界面用导航按钮）
+
+每次交互的耗时从按键开始，到它引起的最后一帧绘制完成为止（交互后 50ms 内
+不再出现新帧即视为结束），因此包含 RenderScheduler 的合帧等待；每帧耗时是
+一次屏幕更新（布局、合成以及生成终端输出）的时间。无头驱动不向终端写入，
+这里仍会把每帧编码成终端输出序列，以计入这部分开销。
+
+    python -m src.frame_timing --save ui-baseline.json
+    python -m src.frame_timing --baseline ui-baseline.json   # 有退化时以非零状态退出
+
+帧计时依赖 Textual 的私有接口（Screen._on_timer_update、App._display、
+App._batch_count），只在验证过的 Textual 主版本上运行；接口缺失时直接报错，
+不会悄悄产出空的统计。
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .perf_stats import summarize
+
+DEFAULT_SIZE = (200, 70)
+DEFAULT_THRESHOLD = "25%"
+QUIET_PERIOD = 0.05  # 交互后这段时间内没有新帧即视为界面已稳定（秒）
+MIN_REGRESSION_MS = 2.0  # 低于这个差值的变化视为噪声
+PAGE_LIMIT = 20  # 大目录下每轮最多翻的页数
+ADD_COUNT = 5  # 自由调酒每轮添加的材料数
+COMPARED_STATS = ("p50", "p95", "p99")
+TESTED_TEXTUAL_MAJOR = (8,)  # 验证过上述私有接口的 Textual 主版本
+
+
+def check_textual(allow_untested: bool = False) -> str:
+    """确认 Textual 版本和帧计时依赖的私有接口，不满足时抛出 RuntimeError
+
+    返回 Textual 版本号。allow_untested 为 True 时跳过版本检查，但接口仍须存在。
+    """
+    from importlib.metadata import version
+
+    from textual.app import App
+    from textual.screen import Screen
+
+    textual_version = version("textual")
+    major = textual_version.split(".")[0]
+    if not allow_untested and not (major.isdigit() and int(major) in TESTED_TEXTUAL_MAJOR):
+        tested = ", ".join(f"{v}.x" for v in TESTED_TEXTUAL_MAJOR)
+        raise RuntimeError(
+            f"帧计时只在 Textual {tested} 上验证过，当前为 {textual_version}；"
+            f"确认私有接口未变后可用 --allow-untested-textual 运行"
+        )
+    missing = [
+        f"{cls.__name__}.{name}"
+        for cls, name in ((Screen, "_on_timer_update"), (App, "_display"))
+        if not callable(getattr(cls, name, None))
+    ]
+    if missing:
+        raise RuntimeError(f"Textual {textual_version} 中缺少帧计时依赖的私有接口: {', '.join(missing)}")
+    return textual_version
+
+
+class FrameTimer:
+    """记录每次屏幕更新的耗时
+
+    在类上替换 Screen._on_timer_update 和 App._display，必须在创建应用之前
+    安装（屏幕的更新定时器在创建时绑定回调）。只统计真正输出了画面的更新。
+    应通过 with 使用，退出时（包括出错时）恢复原来的方法。
+    """
+
+    def __init__(self, allow_untested: bool = False):
+        self.frames: List[Tuple[float, float]] = []  # (完成时刻, 耗时毫秒)
+        self.allow_untested = allow_untested
+        self._painted = False
+        self._originals = None
+
+    def install(self):
+        from textual.app import App
+        from textual.screen import Screen
+
+        if self._originals is not None:
+            raise RuntimeError("FrameTimer 已经安装")
+        check_textual(self.allow_untested)
+
+        original_update = Screen._on_timer_update
+        original_display = App._display
+        timer = self
+
+        def _on_timer_update(screen):
+            timer._painted = False
+            started = time.perf_counter()
+            original_update(screen)
+            if timer._painted:
+                finished = time.perf_counter()
+                timer.frames.append((finished, (finished - started) * 1000))
+
+        def _display(app, screen, renderable):
+            original_display(app, screen, renderable)
+            if renderable is None or app._batch_count:
+                return
+            timer._painted = True
+            if app.is_headless and hasattr(renderable, "render_segments"):
+                renderable.render_segments(app.console)
+
+        Screen._on_timer_update = _on_timer_update
+        App._display = _display
+        self._originals = (original_update, original_display)
+
+    def uninstall(self):
+        from textual.app import App
+        from textual.screen import Screen
+
+        if self._originals is not None:
+            Screen._on_timer_update, App._display = self._originals
+            self._originals = None
+
+    def check_app(self, app):
+        """确认应用实例上有 _display 依赖的 _batch_count（实例属性，只能在创建后检查）"""
+        if not hasattr(app, "_batch_count"):
+            raise RuntimeError("Textual 的 App 中缺少帧计时依赖的私有属性 _batch_count")
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+
+class InteractionDriver:
+    """发送交互并记录每次交互的延迟"""
+
+    def __init__(self, app, pilot, timer: FrameTimer):
+        self.app = app
+        self.pilot = pilot
+        self.timer = timer
+        self.interactions: List[float] = []
+        self.recording = True
+
+    async def settle(self):
+        """等待界面稳定：一个静默期内不再出现新帧"""
+        while True:
+            frames = len(self.timer.frames)
+            await self.pilot.pause(QUIET_PERIOD)
+            if len(self.timer.frames) == frames:
+                return
+
+    async def press(self, key: str):
+        """按键并等待界面稳定，记录到最后一帧完成的耗时"""
+        frames = len(self.timer.frames)
+        started = time.perf_counter()
+        await self.pilot.press(key)
+        pressed = time.perf_counter()
+        await self.settle()
+        new_frames = self.timer.frames[frames:]
+        finished = new_frames[-1][0] if new_frames else pressed
+        if self.recording:
+            self.interactions.append((finished - started) * 1000)
+
+    async def show(self, view: str, focus: str):
+        """切换到视图并聚焦其中的组件（准备步骤，不计时）"""
+        game_screen = self.app.game_screen
+        game_screen._show_view(view)
+        self.app.current_module = view
+        self.app.query_one(focus).focus()
+        await self.settle()
+
+
+def _page_turns(items: int, per_page: int) -> int:
+    pages = (items + per_page - 1) // per_page
+    return min(max(pages - 1, 0), PAGE_LIMIT)
+
+
+async def _ingredient_paging(app, driver: InteractionDriver):
+    await driver.show("ingredients", "#ingredients-view #ingredient-0")
+    view = app.query_one("#ingredients-view")
+    turns = _page_turns(len(app.cocktail_system.get_available_ingredients()), view.ingredients_per_page)
+    for key in ["d"] * turns + ["a"] * turns:
+        await driver.press(key)
+
+
+async def _ingredient_select(app, driver: InteractionDriver):
+    await driver.show("ingredients", "#ingredients-view #ingredient-0")
+    for key in ("1", "2", "3", "4", "5", "6", "1", "c"):
+        await driver.press(key)
+
+
+async def _recipe_paging(app, driver: InteractionDriver):
+    await driver.show("recipes", "#recipes-view #recipe-0")
+    view = app.query_one("#recipes-view")
+    turns = _page_turns(len(app.cocktail_system.get_unlocked_recipes()), view.recipes_per_page)
+    for key in ["d"] * turns + ["a"] * turns:
+        await driver.press(key)
+
+
+async def _free_mixing_add(app, driver: InteractionDriver):
+    from textual.widgets import Select
+
+    await driver.show("free-mixing", "#free-mixing-view #amount-input")
+    view = app.query_one("#free-mixing-view")
+    select = view.query_one("#ingredient-select", Select)
+    ingredients = app.cocktail_system.get_available_ingredients()[:ADD_COUNT]
+    for ingredient in ingredients:
+        # 选择材料（准备步骤），输入用量并按回车添加
+        select.value = ingredient.name
+        view.query_one("#amount-input").focus()
+        await driver.settle()
+        for key in ("3", "0"):
+            await driver.press(key)
+        view.query_one("#add-ingredient").focus()
+        await driver.settle()
+        await driver.press("enter")
+    view.query_one("#clear-recipe").focus()
+    await driver.settle()
+    await driver.press("enter")
+
+
+async def _view_switch(app, driver: InteractionDriver):
+    await driver.show("ingredients", "#nav-ingredients")
+    for key in ("f2", "f3", "f4", "f5", "enter"):
+        await driver.press(key)
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "ingredient-paging": _ingredient_paging,
+    "ingredient-select": _ingredient_select,
+    "recipe-paging": _recipe_paging,
+    "free-mixing-add": _free_mixing_add,
+    "view-switch": _view_switch,
+}
+
+
+async def run_frame_timing(rounds: int = 5, warmup: int = 1, size: Tuple[int, int] = DEFAULT_SIZE,
+                           scenarios: Optional[List[str]] = None, cocktail_system=None,
+                           seed: int = 0, allow_untested_textual: bool = False) -> Dict[str, Any]:
+    """运行各组操作 rounds 轮（另有 warmup 轮预热不计入），返回报告"""
+    import random
+
+    from main import TermixApp
+
+    names = list(scenarios or SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"未知的场景: {', '.join(unknown)}")
+
+    random.seed(seed)
+    results: Dict[str, Dict[str, List[float]]] = {name: {"interaction": [], "frame": []} for name in names}
+    started = time.perf_counter()
+
+    with FrameTimer(allow_untested_textual) as timer:
+        app = TermixApp(fast=True, cocktail_system=cocktail_system)
+        timer.check_app(app)
+        async with app.run_test(size=size) as pilot:
+            await app.game_ready.wait()
+            await pilot.pause()
+            await pilot.click("#start_game")
+            driver = InteractionDriver(app, pilot, timer)
+            await driver.settle()
+            if not timer.frames:
+                raise RuntimeError("没有记录到任何帧：Textual 的屏幕更新流程可能已改变")
+
+            for round_index in range(warmup + rounds):
+                driver.recording = round_index >= warmup
+                for name in names:
+                    interactions = len(driver.interactions)
+                    frames = len(timer.frames)
+                    await SCENARIOS[name](app, driver)
+                    if driver.recording:
+                        results[name]["interaction"] += driver.interactions[interactions:]
+                        results[name]["frame"] += [duration for _, duration in timer.frames[frames:]]
+            cocktail_system = app.cocktail_system
+
+    report_scenarios = {
+        name: {
+            "interaction_ms": summarize(samples["interaction"]),
+            "frame_ms": summarize(samples["frame"]),
+        }
+        for name, samples in results.items()
+    }
+    return {
+        "size": list(size),
+        "rounds": rounds,
+        "catalog": {
+            "ingredients": len(cocktail_system.ingredients),
+            "recipes": len(cocktail_system.recipes),
+        },
+        "elapsed_s": round(time.perf_counter() - started, 1),
+        "scenarios": report_scenarios,
+        "overall": {
+            "interaction_ms": summarize([v for s in results.values() for v in s["interaction"]]),
+            "frame_ms": summarize([v for s in results.values() for v in s["frame"]]),
+        },
+    }
+
+
+def parse_threshold(text: str) -> Optional[float]:
+    """解析退化阈值："25%" 或 "0.25"；"off" 返回 None"""
+    text = text.strip().lower()
+    if text == "off":
+        return None
+    if text.endswith("%"):
+        return float(text[:-1]) / 100
+    return float(text)
+
+
+def compare_reports(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float,
+                    min_delta_ms: float = MIN_REGRESSION_MS) -> List[Dict[str, Any]]:
+    """与基线比较各场景的 p50/p95/p99，返回超过阈值的退化"""
+    regressions = []
+    for name, metrics in report["scenarios"].items():
+        baseline_metrics = baseline.get("scenarios", {}).get(name)
+        if not baseline_metrics:
+            continue
+        for metric, stats in metrics.items():
+            for stat in COMPARED_STATS:
+                old = baseline_metrics.get(metric, {}).get(stat)
+                new = stats.get(stat)
+                if old is None or new is None:
+                    continue
+                if new > old * (1 + threshold) and new - old >= min_delta_ms:
+                    regressions.append({
+                        "scenario": name,
+                        "metric": metric,
+                        "stat": stat,
+                        "baseline": old,
+                        "current": new,
+                        "change": f"{(new / old - 1) * 100:+.0f}%" if old else "new",
+                    })
+    return regressions
+
+
+def main():
+    """帧时间基准命令行"""
+    import argparse
+    import contextlib
+    import sys
+
+    parser = argparse.ArgumentParser(description="Termix 界面帧时间基准")
+    parser.add_argument("--rounds", type=int, default=5, help="每组操作重复的轮数（默认 5）")
+    parser.add_argument("--warmup", type=int, default=1, help="不计入统计的预热轮数（默认 1）")
+    parser.add_argument("--size", metavar="WxH", default="x".join(map(str, DEFAULT_SIZE)),
+                        help="终端尺寸（默认 %(default)s）")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="只运行指定场景（可重复，默认全部）")
+    parser.add_argument("--config-dir", metavar="DIR", help="从其他目录加载配置（如生成的大规模目录）")
+    parser.add_argument("--seed", type=int, default=0, help="随机数种子（默认 0）")
+    parser.add_argument("--allow-untested-textual", action="store_true",
+                        help="在未验证过的 Textual 版本上运行（私有接口仍须存在）")
+    parser.add_argument("--baseline", metavar="PATH", help="与基线报告比较，有退化时以非零状态退出")
+    parser.add_argument("--threshold", default=DEFAULT_THRESHOLD,
+                        help="p50/p95/p99 允许的退化比例（如 25%%），off 表示只比较不判定；默认 %(default)s")
+    parser.add_argument("--save", metavar="PATH", help="把报告保存为基线")
+    parser.add_argument("--report", metavar="PATH", help="把报告写入文件（默认输出到标准输出）")
+    args = parser.parse_args()
+
+    try:
+        check_textual(args.allow_untested_textual)
+    except RuntimeError as e:
+        sys.exit(f"无法运行帧计时: {e}")
+
+    width, _, height = args.size.lower().partition("x")
+    cocktail_system = None
+    if args.config_dir:
+        from .cocktail_system import CocktailSystem
+        from .config_loader import ConfigLoader
+
+        with contextlib.redirect_stdout(sys.stderr):
+            cocktail_system = CocktailSystem(ConfigLoader(args.config_dir))
+
+    report = asyncio.run(run_frame_timing(
+        rounds=args.rounds, warmup=args.warmup, size=(int(width), int(height)),
+        scenarios=args.scenario, cocktail_system=cocktail_system, seed=args.seed,
+        allow_untested_textual=args.allow_untested_textual,
+    ))
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        threshold = parse_threshold(args.threshold)
+        report["baseline"] = args.baseline
+        report["regressions"] = compare_reports(report, baseline, threshold or 0.0)
+        if threshold is not None:
+            regressions = report["regressions"]
+
+    data = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            f.write(data + "\n")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(data + "\n")
+    elif not args.save:
+        print(data)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
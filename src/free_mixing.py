@@ -15,6 +15,8 @@ from rich.table import Table
 from typing import Dict, List
 import random
 
+from .scoring_service import LocalScoringBackend, QuerySuperseded
+
 
 class FreeMixingScreen(Container):
     """自由调酒界面"""
@@ -121,17 +123,17 @@ class FreeMixingScreen(Container):
         content = ""
         
         for recipe in self.cocktail_system.get_unlocked_recipes()[:5]:  # 只显示前5个配方
-            content += f"\n{recipe.emoji} [bold]{recipe.name}[/bold]\n"
-            content += f"[italic]{recipe.description}[/italic]\n"
-            content += f"难度: {'⭐' * recipe.difficulty}\n"
+            fragments = self.cocktail_system.get_recipe_fragments(recipe)
+            content += f"\n{fragments.title}\n"
+            content += f"[italic]{fragments.description}[/italic]\n"
+            content += f"难度: {fragments.stars}\n"
             
             # 显示主要材料
-            main_ingredients = list(recipe.ingredients.items())[:3]
-            for name, amount in main_ingredients:
+            for name, amount in fragments.main_ingredients:
                 content += f"• {name}: {amount}ml\n"
             
-            if len(recipe.ingredients) > 3:
-                content += f"• ... 等{len(recipe.ingredients) - 3}种材料\n"
+            if fragments.extra_ingredients:
+                content += f"• ... 等{fragments.extra_ingredients}种材料\n"
             content += "\n"
         
         return Static(content)
@@ -166,33 +168,30 @@ class FreeMixingScreen(Container):
             content += f"[bold]总量:[/bold] {total_volume}ml\n"
             content += f"[bold]酒精度:[/bold] {avg_alcohol:.1f}%\n"
             
-            # 尝试匹配已知配方
-            matched_recipe = self._find_matching_recipe()
-            if matched_recipe:
-                content += f"\n🎯 [green]匹配配方: {matched_recipe}[/green]"
+            # 异步匹配已知配方，结果返回后补充到显示中
+            self.run_worker(
+                self._update_matched_recipe(content, dict(self.selected_ingredients)),
+                group="recipe-match"
+            )
         
         recipe_display = self.query_one("#current-recipe", Static)
         recipe_display.update(content)
     
-    def _find_matching_recipe(self) -> str:
-        """查找匹配的配方"""
-        for recipe_name, recipe in self.cocktail_system.recipes.items():
-            if self._recipes_match(self.selected_ingredients, recipe.ingredients):
-                return recipe_name
-        return ""
-    
-    def _recipes_match(self, recipe1: Dict[str, float], recipe2: Dict[str, float]) -> bool:
-        """检查两个配方是否匹配（允许一定误差）"""
-        if set(recipe1.keys()) != set(recipe2.keys()):
-            return False
+    async def _update_matched_recipe(self, content: str, ingredients: Dict[str, float]):
+        """查询与当前材料匹配的配方
         
-        for ingredient, amount1 in recipe1.items():
-            amount2 = recipe2[ingredient]
-            # 允许20%的误差
-            if abs(amount1 - amount2) / amount2 > 0.2:
-                return False
+        通过应用的评分后端查询；使用评分服务时，连续操作产生的旧查询会被
+        新查询取代，只有最新的材料组合会被计算。
+        """
+        scoring = getattr(self.app, "scoring", None) or LocalScoringBackend(self.cocktail_system)
+        try:
+            matched_recipe = await scoring.match(ingredients, key="free-mixing:match")
+        except (QuerySuperseded, ConnectionError, RuntimeError):
+            return
         
-        return True
+        if matched_recipe and ingredients == self.selected_ingredients:
+            recipe_display = self.query_one("#current-recipe", Static)
+            recipe_display.update(content + f"\n🎯 [green]匹配配方: {matched_recipe}[/green]")
     
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """处理按钮点击事件"""
@@ -75,6 +75,7 @@ class HelpScreen(Container):
 • Page Up/Down - 快速滚动
 • Home/End - 滚动到顶部/底部
 • F8 - 显示帮助
+• F9 - 跳过调酒动画
 • F11 - 切换布局模式
 • Ctrl+C - 退出游戏
 • Escape - 返回欢迎界面
@@ -171,7 +172,7 @@ class HelpScreen(Container):
 [bold yellow]调酒流程：[/bold yellow]
 1. 选择要调制的鸡尾酒配方
 2. 按照配方添加材料
-3. 观看精美的调酒动画
+3. 观看精美的调酒动画（按 F9 可跳过）
 4. 获得评分和专业反馈
 
 [bold yellow]评分标准：[/bold yellow]
@@ -11,6 +11,8 @@ from rich.panel import Panel
 from rich.console import Console
 from typing import Dict, List
 
+from .render_scheduler import RenderScheduler, get_render_fps
+
 
 class KeyboardIngredientDisplay(Container):
     """全键盘操作的材料选择器"""
@@ -53,6 +55,9 @@ class KeyboardIngredientDisplay(Container):
     
     def on_mount(self):
         """初始化"""
+        self._render_scheduler = RenderScheduler(
+            self, self._update_display, get_render_fps(self.cocktail_system)
+        )
         self._update_display()
     
     def _update_display(self):
@@ -172,7 +177,7 @@ class KeyboardIngredientDisplay(Container):
             # 如果未选择，添加默认用量
             self.selected_ingredients[ingredient.name] = 30  # 默认30ml
         
-        self._update_display()
+        self._render_scheduler.mark_dirty()
     
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """处理按钮点击"""
@@ -180,14 +185,14 @@ class KeyboardIngredientDisplay(Container):
             if self.current_page > 0:
                 self.current_page -= 1
                 self.focused_ingredient = 0  # 重置聚焦
-                self._update_display()
+                self._render_scheduler.mark_dirty()
         elif event.button.id == "next-page":
             ingredients = self.cocktail_system.get_available_ingredients()
             total_pages = (len(ingredients) + self.ingredients_per_page - 1) // self.ingredients_per_page
             if self.current_page < total_pages - 1:
                 self.current_page += 1
                 self.focused_ingredient = 0  # 重置聚焦
-                self._update_display()
+                self._render_scheduler.mark_dirty()
         elif event.button.id and event.button.id.startswith("ingredient-"):
             # 选择材料
             idx = int(event.button.id.split("-")[1])
@@ -197,7 +202,7 @@ class KeyboardIngredientDisplay(Container):
                 self._toggle_ingredient(ingredient)
         elif event.button.id == "clear-selection":
             self.selected_ingredients.clear()
-            self._update_display()
+            self._render_scheduler.mark_dirty()
         elif event.button.id == "start-mixing":
             if self.selected_ingredients:
                 # 发送调酒消息
@@ -229,7 +234,7 @@ class KeyboardIngredientDisplay(Container):
             if self.current_page > 0:
                 self.current_page -= 1
                 self.focused_ingredient = 0
-                self._update_display()
+                self._render_scheduler.mark_dirty()
         elif event.key == "d" or event.key == "right":
             # 下一页
             ingredients = self.cocktail_system.get_available_ingredients()
@@ -237,11 +242,11 @@ class KeyboardIngredientDisplay(Container):
             if self.current_page < total_pages - 1:
                 self.current_page += 1
                 self.focused_ingredient = 0
-                self._update_display()
+                self._render_scheduler.mark_dirty()
         elif event.key == "c":
             # 清空选择
             self.selected_ingredients.clear()
-            self._update_display()
+            self._render_scheduler.mark_dirty()
         elif event.key == "enter":
             # 开始调酒
             if self.selected_ingredients:
@@ -251,7 +256,7 @@ class KeyboardIngredientDisplay(Container):
             # 上一个材料
             if self.focused_ingredient > 0:
                 self.focused_ingredient -= 1
-                self._update_display()
+                self._render_scheduler.mark_dirty()
         elif event.key == "down":
             # 下一个材料
             ingredients = self.cocktail_system.get_available_ingredients()
@@ -259,7 +264,7 @@ class KeyboardIngredientDisplay(Container):
             current_ingredients = ingredients[start_idx:start_idx + self.ingredients_per_page]
             if self.focused_ingredient < len(current_ingredients) - 1:
                 self.focused_ingredient += 1
-                self._update_display()
+                self._render_scheduler.mark_dirty()
     
     def _select_ingredient(self):
         """选择当前聚焦的材料"""
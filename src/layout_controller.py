@@ -0,0 +1,66 @@
+"""
+布局控制模块 - 根据终端宽度自动切换布局
+"""
+
+from typing import Optional
+
+
+class LayoutController:
+    """自适应布局控制器
+    
+    拖动调整窗口大小时会连续收到 Resize 事件，这里先防抖，
+    再在阈值附近加入滞回区间，只有真正越过阈值才切换一次布局。
+    """
+    
+    def __init__(self, game_screen, threshold: int = 100, hysteresis: int = 5, debounce: float = 0.15):
+        self.game_screen = game_screen
+        self.threshold = threshold
+        self.hysteresis = hysteresis
+        self.debounce = debounce
+        self._pending_width: Optional[int] = None
+        self._timer = None
+        self._decided = False
+    
+    @classmethod
+    def from_config(cls, game_screen, game_config):
+        """从 ui_settings 创建控制器"""
+        ui_config = game_config.get("ui_settings", {})
+        return cls(
+            game_screen,
+            threshold=ui_config.get("auto_layout_threshold", 100),
+            hysteresis=ui_config.get("layout_hysteresis", 5),
+            debounce=ui_config.get("layout_debounce", 0.15)
+        )
+    
+    def request(self, width: int):
+        """记录新的终端宽度，防抖后再决定布局"""
+        self._pending_width = width
+        if self._timer is not None:
+            self._timer.stop()
+        self._timer = self.game_screen.set_timer(self.debounce, self._apply_pending)
+    
+    def _apply_pending(self):
+        """应用最后一次记录的宽度"""
+        self._timer = None
+        width = self._pending_width
+        if width is None:
+            return
+        
+        target = self.choose_layout(width)
+        self._decided = True
+        if target != self.game_screen.layout_mode:
+            self.game_screen._set_layout(target)
+    
+    def choose_layout(self, width: int) -> str:
+        """根据宽度和当前布局选择目标布局"""
+        current = self.game_screen.layout_mode
+        
+        # 首次决定时没有历史状态，直接按阈值判断
+        if not self._decided:
+            return "vertical" if width < self.threshold else "horizontal"
+        
+        if current == "horizontal" and width < self.threshold - self.hysteresis:
+            return "vertical"
+        if current == "vertical" and width >= self.threshold + self.hysteresis:
+            return "horizontal"
+        return current
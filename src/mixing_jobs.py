@@ -0,0 +1,67 @@
+"""
+调酒任务模块 - 管理调酒流程的异步任务
+"""
+
+import asyncio
+from typing import Awaitable, Optional
+
+
+class MixingJobManager:
+    """调酒任务管理器
+    
+    同一时间只保留一个调酒任务：新任务会取代仍在进行的旧任务，
+    并支持跳过正在播放的动画直接显示结果。
+    """
+    
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._skip_event: Optional[asyncio.Event] = None
+    
+    @property
+    def is_running(self) -> bool:
+        """是否有调酒任务正在进行"""
+        return self._task is not None and not self._task.done()
+    
+    def submit(self, job: Awaitable) -> asyncio.Task:
+        """提交新的调酒任务，取消正在进行的旧任务"""
+        self.cancel()
+        self._skip_event = asyncio.Event()
+        self._task = asyncio.create_task(job)
+        return self._task
+    
+    def cancel(self) -> bool:
+        """取消正在进行的任务"""
+        if self.is_running:
+            self._task.cancel()
+            return True
+        return False
+    
+    def skip(self) -> bool:
+        """跳过当前任务的动画"""
+        if self.is_running and self._skip_event is not None:
+            self._skip_event.set()
+            return True
+        return False
+    
+    async def play(self, animation: Awaitable):
+        """播放动画，收到跳过请求时提前结束"""
+        skip_event = self._skip_event
+        animation_task = asyncio.ensure_future(animation)
+        if skip_event is None:
+            await animation_task
+            return
+        
+        skip_task = asyncio.ensure_future(skip_event.wait())
+        try:
+            await asyncio.wait({animation_task, skip_task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            # 等被取消的动画收尾后再继续，避免它的清理晚于结果显示
+            pending = [task for task in (animation_task, skip_task) if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        # 动画自己结束时取出结果，动画中的异常交给调用方处理
+        if animation_task.done() and not animation_task.cancelled():
+            animation_task.result()
@@ -0,0 +1,105 @@
+"""
+调酒步骤规划模块 - 根据实际材料生成调酒动画步骤
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Dict, List
+
+from .data_models import Ingredient, IngredientType
+
+
+@dataclass
+class MixingStep:
+    """调酒动画中的一个步骤"""
+    label: str  # 状态文字
+    frame: str  # 动画帧内容
+    duration: float  # 持续时间（秒）
+
+
+# 添加顺序：冰块 → 基酒 → 利口酒 → 调和剂 → 装饰
+STEP_ORDER = [
+    (IngredientType.ICE, "🧊", "加入冰块"),
+    (IngredientType.BASE_SPIRIT, "🥃", "倒入基酒"),
+    (IngredientType.LIQUEUR, "🍊", "加入利口酒"),
+    (IngredientType.MIXER, "🍋", "加入调和剂"),
+    (IngredientType.GARNISH, "🌿", "装饰点缀"),
+]
+
+# 搅拌和完成步骤占总时长的比例
+STIR_SHARE = 0.15
+FINISH_SHARE = 0.1
+
+# 每个添加步骤至少按总用量的这一比例计时，避免少量装饰一闪而过
+MIN_VOLUME_SHARE = 0.1
+
+
+def build_mixing_plan(ingredients: Dict[str, float], catalog: Dict[str, Ingredient],
+                      total_time: float = 7.0) -> List[MixingStep]:
+    """根据材料生成调酒步骤，添加步骤的时长与用量成正比"""
+    groups = {ingredient_type: [] for ingredient_type, _, _ in STEP_ORDER}
+    for name, amount in ingredients.items():
+        if amount <= 0:
+            continue
+        # 未知材料按调和剂处理
+        ingredient_type = catalog[name].type if name in catalog else IngredientType.MIXER
+        groups[ingredient_type].append(name)
+    
+    total_volume = sum(amount for amount in ingredients.values() if amount > 0)
+    min_volume = total_volume * MIN_VOLUME_SHARE
+    
+    add_steps = []
+    for ingredient_type, icon, verb in STEP_ORDER:
+        names = groups[ingredient_type]
+        if not names:
+            continue
+        volume = sum(ingredients[name] for name in names)
+        add_steps.append((icon, verb, names, max(volume, min_volume)))
+    
+    # 没有材料时添加步骤的时间并入搅拌
+    finish_time = total_time * FINISH_SHARE
+    add_time = total_time * (1 - STIR_SHARE - FINISH_SHARE) if add_steps else 0.0
+    stir_time = total_time - add_time - finish_time
+    total_weight = sum(weight for _, _, _, weight in add_steps)
+    
+    steps = []
+    glass = []
+    for icon, verb, names, weight in add_steps:
+        glass.extend(catalog[name].emoji if name in catalog else icon for name in names)
+        label = f"{icon} {verb}: {', '.join(names)}..."
+        steps.append(MixingStep(
+            label=label,
+            frame=f"{''.join(glass)}\n{label}",
+            duration=add_time * weight / total_weight
+        ))
+    
+    steps.append(MixingStep(
+        label="🥄 搅拌混合...",
+        frame="🌪️ 🥄 🌪️\n搅拌中...",
+        duration=stir_time
+    ))
+    steps.append(MixingStep(
+        label="✨ 完成调制！",
+        frame="🍸✨\n调制完成！",
+        duration=finish_time
+    ))
+    return steps
+
+
+def get_step_boundaries(plan: List[MixingStep]) -> List[float]:
+    """各步骤结束时刻（相对动画开始）"""
+    return list(accumulate(step.duration for step in plan))
+
+
+def step_at(boundaries: List[float], fraction: float) -> int:
+    """根据总进度（0-1）找到当前所在的步骤"""
+    if not boundaries:
+        return 0
+    position = fraction * boundaries[-1]
+    return min(bisect_right(boundaries, position), len(boundaries) - 1)
+
+
+def get_mixing_time_budget(game_config, default: float = 7.0) -> float:
+    """从 ui_settings 读取调酒动画总时长"""
+    return game_config.get("ui_settings", {}).get("mixing_time_budget", default)
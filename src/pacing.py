@@ -0,0 +1,107 @@
+"""
+节奏控制模块 - 控制动画和演示中的等待时间
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+DEFAULT_FPS = 60
+
+
+class Pacing:
+    """动画节奏控制
+    
+    普通模式下按原时长等待；快速模式下每次等待被压缩到帧预算以内
+    （预算为 0 时完全不等待），便于自动化运行和压力测试。
+    """
+    
+    def __init__(self, fast: bool = False, frame_budget: float = 0.0):
+        self.fast = fast
+        self.frame_budget = frame_budget
+    
+    @classmethod
+    def from_config(cls, game_config: Dict[str, Any], fast: Optional[bool] = None) -> "Pacing":
+        """从 ui_settings 创建，命令行参数优先于配置文件"""
+        ui_config = game_config.get("ui_settings", {})
+        if fast is None:
+            fast = ui_config.get("fast_mode", False)
+        return cls(fast=fast, frame_budget=ui_config.get("fast_mode_frame_budget", 0.0))
+    
+    def scale(self, seconds: float) -> float:
+        """返回实际需要等待的时长"""
+        if self.fast:
+            return min(seconds, self.frame_budget)
+        return seconds
+    
+    def sleep(self, seconds: float):
+        """阻塞等待（用于控制台演示）"""
+        delay = self.scale(seconds)
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def asleep(self, seconds: float):
+        """异步等待（用于 Textual 界面）"""
+        await asyncio.sleep(self.scale(seconds))
+
+
+class ProgressDriver:
+    """进度驱动器
+    
+    以单调时钟为准按帧率插值进度。每一帧的目标时间都从起点推算，
+    不会像连续 sleep 那样累积误差，最后一帧恰好落在时间预算上；
+    回调明显滞后时自动降低帧率，负载恢复后再逐步回升。
+    
+    clock 和 sleep 默认为 time.monotonic 和 asyncio.sleep，测试时可换成假时钟。
+    """
+    
+    def __init__(self, total_time: float, fps: float = 60, min_fps: float = 10, pacing: Optional[Pacing] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], Awaitable] = asyncio.sleep):
+        pacing = pacing or Pacing()
+        self.clock = clock
+        self.sleep = sleep
+        self.total_time = pacing.scale(total_time)
+        # 配置中的帧率可能为 0 或负数（RenderScheduler 视为不限帧率），这里退回默认帧率
+        if fps <= 0:
+            fps = DEFAULT_FPS
+        self.base_interval = 1 / fps
+        self.max_interval = max(self.base_interval, 1 / min_fps) if min_fps > 0 else self.base_interval
+        self.interval = self.base_interval
+        self.frames = 0
+        self.dropped_frames = 0
+        self.stopped = False
+    
+    def stop(self):
+        """提前结束"""
+        self.stopped = True
+    
+    async def run(self, on_frame: Callable[[float, float], None]):
+        """运行直到时间预算用完，每帧回调 on_frame(已用时间, 进度0-1)"""
+        start = self.clock()
+        deadline = start + self.total_time
+        next_frame = start
+        
+        while True:
+            now = self.clock()
+            elapsed = min(now - start, self.total_time)
+            fraction = elapsed / self.total_time if self.total_time > 0 else 1.0
+            on_frame(elapsed, fraction)
+            self.frames += 1
+            if self.stopped or now >= deadline:
+                break
+            
+            lateness = now - next_frame
+            if lateness > self.interval:
+                # 落后超过一帧：丢弃过期的帧并降低帧率
+                self.dropped_frames += int(lateness / self.interval)
+                self.interval = min(self.interval * 2, self.max_interval)
+                next_frame = now
+            elif lateness < self.interval / 4 and self.interval > self.base_interval:
+                self.interval = max(self.interval / 2, self.base_interval)
+            
+            next_frame += self.interval
+            if deadline - next_frame < self.interval / 2:
+                # 不足半帧时直接落在终点，避免浮点累加误差在终点前多出一帧
+                next_frame = deadline
+            await self.sleep(max(0.0, next_frame - self.clock()))
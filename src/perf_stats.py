@@ -0,0 +1,27 @@
+"""
+性能统计模块 - 计时样本的百分位数汇总
+"""
+
+import math
+from typing import Dict, List
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """最近秩法求百分位数（values 为空时返回 0）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(fraction * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """毫秒数列的 p50/p95/p99/max 汇总"""
+    return {
+        "count": len(values),
+        "total": round(sum(values), 3),
+        "p50": round(percentile(values, 0.50), 3),
+        "p95": round(percentile(values, 0.95), 3),
+        "p99": round(percentile(values, 0.99), 3),
+        "max": round(max(values), 3) if values else 0.0,
+    }
@@ -6,9 +6,83 @@ from textual.app import ComposeResult
 from textual.containers import Container, Horizontal, Vertical, ScrollableContainer
 from textual.widgets import Static, Button, Label, Select
 from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+from textual.geometry import Size
+from rich.cells import cell_len
+from rich.text import Text
 from rich.table import Table
 from rich.panel import Panel
 from typing import Dict, List
+from bisect import bisect_right
+
+
+class ReferenceList(ScrollView):
+    """虚拟滚动的参考列表 - 按宽度折行，只解析可见行和需要折行的长行的标记"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._lines: List[str] = []
+        self._wrap_width = 0
+        self._row_offsets: List[int] = [0]  # 每个条目的起始行，最后一项为总行数
+        self._strip_cache: Dict[int, List[Strip]] = {}
+    
+    def set_lines(self, lines: List[str]):
+        """替换列表内容"""
+        if lines is self._lines:
+            return
+        self._lines = lines
+        self._relayout()
+        self.scroll_home(animate=False)
+    
+    def on_resize(self, event) -> None:
+        """宽度变化时按新宽度重新折行"""
+        if self.scrollable_content_region.width != self._wrap_width:
+            self._relayout()
+    
+    def _relayout(self):
+        """按当前宽度计算每个条目占的行数"""
+        self._wrap_width = width = self.scrollable_content_region.width
+        self._strip_cache.clear()
+        offsets = [0]
+        total = 0
+        for index, line in enumerate(self._lines):
+            # 标记字符串的长度是可见宽度的上界，不超过宽度的条目无需解析即知只占一行
+            if width <= 0 or cell_len(line) <= width:
+                total += 1
+            else:
+                total += len(self._wrap(index))
+            offsets.append(total)
+        self._row_offsets = offsets
+        self.virtual_size = Size(width, total)
+        self.refresh()
+    
+    def _wrap(self, index: int) -> List[Strip]:
+        """解析并折行一个条目（按条目缓存）"""
+        strips = self._strip_cache.get(index)
+        if strips is None:
+            console = self.app.console
+            text = Text.from_markup(self._lines[index])
+            if self._wrap_width > 0:
+                rows = text.wrap(console, self._wrap_width)
+            else:
+                rows = [text]
+            strips = [Strip(row.render(console), row.cell_len) for row in rows]
+            self._strip_cache[index] = strips
+        return strips
+    
+    def render_line(self, y: int) -> Strip:
+        """渲染一行（仅在该行可见时调用）"""
+        scroll_x, scroll_y = self.scroll_offset
+        row = scroll_y + y
+        width = self.size.width
+        
+        if row >= self._row_offsets[-1]:
+            return Strip.blank(width, self.rich_style)
+        
+        index = bisect_right(self._row_offsets, row) - 1
+        strip = self._wrap(index)[row - self._row_offsets[index]]
+        return strip.crop_extend(scroll_x, scroll_x + width, self.rich_style)
 
 
 class QuickReference(Container):
@@ -18,6 +92,8 @@ class QuickReference(Container):
         super().__init__(**kwargs)
         self.cocktail_system = cocktail_system
         self.current_view = "recipes"  # recipes 或 ingredients
+        self._lines_cache: Dict[str, List[str]] = {}
+        self._lines_version = cocktail_system.catalog_version
     
     def compose(self) -> ComposeResult:
         """构建快速参考界面"""
@@ -28,34 +104,37 @@ class QuickReference(Container):
             yield Button("🧪 材料", id="tab-ingredients")
         
         # 内容显示区域
-        with ScrollableContainer(id="reference-content"):
-            yield Static("", id="reference-display")
+        yield ReferenceList(id="reference-content")
     
     def on_mount(self):
         """初始化"""
         self._update_display()
     
+    def on_show(self):
+        """重新显示时检查目录是否更新（如期间解锁了新配方）"""
+        self._update_display()
+    
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """处理按钮点击"""
         if event.button.id == "tab-recipes":
-            self.current_view = "recipes"
-            self._update_tabs()
-            self._update_display()
+            self._switch_view("recipes")
         elif event.button.id == "tab-ingredients":
-            self.current_view = "ingredients"
-            self._update_tabs()
-            self._update_display()
+            self._switch_view("ingredients")
     
     def on_key(self, event) -> None:
         """处理键盘事件"""
         if event.key == "1":
-            self.current_view = "recipes"
-            self._update_tabs()
-            self._update_display()
+            self._switch_view("recipes")
         elif event.key == "2":
-            self.current_view = "ingredients"
-            self._update_tabs()
-            self._update_display()
+            self._switch_view("ingredients")
+    
+    def _switch_view(self, view: str):
+        """切换标签页"""
+        if view == self.current_view:
+            return
+        self.current_view = view
+        self._update_tabs()
+        self._update_display()
     
     def _update_tabs(self):
         """更新标签页状态"""
@@ -71,78 +150,53 @@ class QuickReference(Container):
     
     def _update_display(self):
         """更新显示内容"""
-        if self.current_view == "recipes":
-            content = self._create_recipes_reference()
-        else:
-            content = self._create_ingredients_reference()
+        # 目录更新后丢弃旧的行缓存
+        if self._lines_version != self.cocktail_system.catalog_version:
+            self._lines_cache.clear()
+            self._lines_version = self.cocktail_system.catalog_version
+        
+        lines = self._lines_cache.get(self.current_view)
+        if lines is None:
+            if self.current_view == "recipes":
+                lines = self._create_recipes_reference()
+            else:
+                lines = self._create_ingredients_reference()
+            self._lines_cache[self.current_view] = lines
         
-        display = self.query_one("#reference-display", Static)
-        display.update(content)
+        display = self.query_one("#reference-content", ReferenceList)
+        display.set_lines(lines)
     
-    def _create_recipes_reference(self):
+    def _create_recipes_reference(self) -> List[str]:
         """创建配方快速参考"""
-        content = "[bold cyan]📖 配方快速参考[/bold cyan]\n\n"
-        
-        recipes = self.cocktail_system.get_unlocked_recipes()
+        lines = ["[bold cyan]📖 配方快速参考[/bold cyan]", ""]
         
-        # 按分类组织配方
-        categories = {}
-        for recipe in recipes:
-            # 从配方的flavor_tags推断分类，或使用默认分类
-            category = "其他"
-            if "经典" in recipe.flavor_tags:
-                category = "经典系列"
-            elif "热带" in recipe.flavor_tags:
-                category = "热带系列"
-            elif "果味" in recipe.flavor_tags:
-                category = "果味系列"
-            elif "咖啡" in recipe.flavor_tags:
-                category = "咖啡系列"
-            elif any(tag in ["创意", "复杂", "强烈"] for tag in recipe.flavor_tags):
-                category = "创意系列"
-            
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(recipe)
-        
-        for category, recipe_list in categories.items():
-            content += f"\n[bold yellow]{category}[/bold yellow]\n"
+        # 分类在加载配方时已预先计算
+        for category, recipe_list in self.cocktail_system.get_recipes_by_category().items():
+            lines.append("")
+            lines.append(f"[bold yellow]{category}[/bold yellow]")
             for recipe in recipe_list:
-                content += f"• {recipe.emoji} [bold]{recipe.name}[/bold] ({'⭐' * recipe.difficulty})\n"
-                
-                # 显示主要材料（前3个）
-                main_ingredients = list(recipe.ingredients.items())[:3]
-                ingredients_str = ", ".join([f"{name}({amount}ml)" for name, amount in main_ingredients])
-                if len(recipe.ingredients) > 3:
-                    ingredients_str += f" +{len(recipe.ingredients)-3}种"
-                
-                content += f"  材料: {ingredients_str}\n"
-                content += f"  {recipe.description}\n\n"
+                fragments = self.cocktail_system.get_recipe_fragments(recipe)
+                lines.append(f"• {fragments.title} ({fragments.stars})")
+                lines.append(f"  材料: {fragments.ingredients_inline}")
+                lines.append(f"  {fragments.description}")
+                lines.append("")
         
-        return content
+        return lines
     
-    def _create_ingredients_reference(self):
+    def _create_ingredients_reference(self) -> List[str]:
         """创建材料快速参考"""
-        content = "[bold cyan]🧪 材料快速参考[/bold cyan]\n\n"
-        
-        ingredients = self.cocktail_system.get_available_ingredients()
-        
-        # 按类型组织材料
-        by_type = {}
-        for ingredient in ingredients:
-            type_name = ingredient.type.value
-            if type_name not in by_type:
-                by_type[type_name] = []
-            by_type[type_name].append(ingredient)
+        lines = ["[bold cyan]🧪 材料快速参考[/bold cyan]", ""]
         
-        for type_name, ingredient_list in by_type.items():
-            content += f"\n[bold yellow]{type_name}[/bold yellow]\n"
+        for type_name, ingredient_list in self.cocktail_system.get_ingredients_by_type().items():
+            lines.append("")
+            lines.append(f"[bold yellow]{type_name}[/bold yellow]")
             for ingredient in ingredient_list:
-                content += f"• {ingredient.emoji} [bold]{ingredient.name}[/bold] ({ingredient.alcohol_content}%)\n"
-                content += f"  风味: {', '.join(ingredient.flavor_profile)}\n"
-                content += f"  {ingredient.description}\n\n"
+                lines.append(f"• {ingredient.emoji} [bold]{ingredient.name}[/bold] ({ingredient.alcohol_content}%)")
+                lines.append(f"  风味: {', '.join(ingredient.flavor_profile)}")
+                lines.append(f"  {ingredient.description}")
+                lines.append("")
         
-        return content
+        return lines
 
 
 class QuickRecipeSelector(Container):
@@ -0,0 +1,73 @@
+"""
+配方渲染片段模块 - 预先生成各界面共用的配方标记字符串
+"""
+
+from __future__ import annotations
+
+from .data_models import CocktailRecipe, Record
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, List, Tuple
+
+
+class RecipeFragments(Record):
+    """单个配方的渲染片段"""
+
+    _fields = ("title", "description", "stars", "flavors", "ingredient_count",
+               "main_ingredients", "extra_ingredients", "ingredients_inline")
+
+    def __init__(self, title: str, description: str, stars: str, flavors: str, ingredient_count: int,
+                 main_ingredients: List[Tuple[str, float]], extra_ingredients: int, ingredients_inline: str):
+        self.title = title  # 表情 + 加粗名称
+        self.description = description
+        self.stars = stars  # 难度星级
+        self.flavors = flavors  # 风味标签
+        self.ingredient_count = ingredient_count
+        self.main_ingredients = main_ingredients  # 前3种材料
+        self.extra_ingredients = extra_ingredients  # 其余材料数量
+        self.ingredients_inline = ingredients_inline  # 单行材料摘要
+
+
+def build_recipe_fragments(recipe: CocktailRecipe) -> RecipeFragments:
+    """生成配方的渲染片段"""
+    main_ingredients = list(recipe.ingredients.items())[:3]
+    extra_ingredients = max(0, len(recipe.ingredients) - 3)
+    
+    ingredients_inline = ", ".join([f"{name}({amount}ml)" for name, amount in main_ingredients])
+    if extra_ingredients:
+        ingredients_inline += f" +{extra_ingredients}种"
+    
+    return RecipeFragments(
+        title=f"{recipe.emoji} [bold]{recipe.name}[/bold]",
+        description=recipe.description,
+        stars='⭐' * recipe.difficulty,
+        flavors=', '.join(recipe.flavor_tags),
+        ingredient_count=len(recipe.ingredients),
+        main_ingredients=main_ingredients,
+        extra_ingredients=extra_ingredients,
+        ingredients_inline=ingredients_inline
+    )
+
+
+class RecipeFragmentCache:
+    """按目录版本缓存的配方渲染片段
+    
+    片段在首次使用时生成，目录版本变化后整体失效。
+    """
+    
+    def __init__(self):
+        self.catalog_version = -1
+        self._fragments: Dict[str, RecipeFragments] = {}
+    
+    def get(self, recipe: CocktailRecipe, catalog_version: int) -> RecipeFragments:
+        """获取配方片段，必要时生成"""
+        if catalog_version != self.catalog_version:
+            self._fragments.clear()
+            self.catalog_version = catalog_version
+        
+        fragments = self._fragments.get(recipe.name)
+        if fragments is None:
+            fragments = build_recipe_fragments(recipe)
+            self._fragments[recipe.name] = fragments
+        return fragments
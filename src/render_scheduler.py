@@ -0,0 +1,41 @@
+"""
+渲染调度模块 - 合并按键连发时的重复重绘
+"""
+
+from typing import Callable, Optional
+
+
+class RenderScheduler:
+    """渲染调度器
+    
+    状态变化时只标记为脏，真正的重建在下一帧统一执行，
+    因此同一帧内的多次请求只会触发一次渲染。
+    """
+    
+    def __init__(self, widget, render: Callable[[], None], fps: float = 60):
+        self.widget = widget
+        self.render = render
+        self.frame_interval = 1 / fps if fps > 0 else 0
+        self.dirty = False
+        self._timer = None
+    
+    def mark_dirty(self):
+        """标记需要重绘，并在下一帧刷新"""
+        self.dirty = True
+        if self._timer is None:
+            self._timer = self.widget.set_timer(self.frame_interval, self.flush)
+    
+    def flush(self):
+        """立即执行挂起的渲染"""
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        if self.dirty:
+            self.dirty = False
+            self.render()
+
+
+def get_render_fps(cocktail_system, default: float = 60) -> float:
+    """从 ui_settings 读取渲染帧率"""
+    ui_config = cocktail_system.game_config.get("ui_settings", {})
+    return ui_config.get("render_fps", default)
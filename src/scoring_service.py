@@ -0,0 +1,420 @@
+"""
+评分服务模块 - 通过 Unix 域套接字共享同一个调酒系统
+
+同一台机器上的多个 Termix 前端可以连接到一个常驻的评分守护进程，
+由它持有唯一的 CocktailSystem，回答评分（score）、配方匹配（match）
+和配方搜索（search）请求。
+
+协议：每帧为 4 字节大端长度 + UTF-8 JSON。
+    请求 {"id": 1, "op": "score", "args": {"ingredients": {...}, "recipe": null}}
+    响应 {"id": 1, "ok": true, "result": ...} 或 {"id": 1, "ok": false, "error": "..."}
+同一连接上的请求可以连续发送（流水线），响应按 id 对应。
+多个请求可以合并成一帧 {"batch": [请求, ...]}，响应为 {"batch": [响应, ...]}。
+
+启动守护进程：
+    python -m src.scoring_service --socket /tmp/termix-scoring.sock
+
+套接字只允许属主连接（0600）；路径上已有服务在运行时拒绝启动，不会抢占它的地址。
+"""
+
+import asyncio
+import json
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+
+from .unix_sockets import bind_private_socket, default_socket_path
+
+SOCKET_ENV_VAR = "TERMIX_SCORING_SOCKET"
+DEFAULT_SOCKET_PATH = default_socket_path("termix-scoring")
+MAX_FRAME_SIZE = 1 << 20  # 单帧上限 1 MiB
+
+_HEADER = struct.Struct(">I")
+
+
+def encode_frame(message: dict) -> bytes:
+    """编码一帧"""
+    payload = json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return _HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[dict]:
+    """读取一帧，连接正常关闭时返回 None"""
+    try:
+        header = await reader.readexactly(_HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if e.partial:
+            raise ConnectionError("帧头不完整") from e
+        return None
+    (length,) = _HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ConnectionError(f"帧过大: {length} 字节")
+    payload = await reader.readexactly(length)
+    return json.loads(payload)
+
+
+def get_socket_path(path: Optional[str] = None) -> Optional[str]:
+    """返回配置的套接字路径（参数优先，其次环境变量），未配置时返回 None"""
+    return path or os.environ.get(SOCKET_ENV_VAR) or None
+
+
+class LocalScoringBackend:
+    """进程内评分后端，与 ScoringClient 提供相同的异步接口"""
+
+    def __init__(self, cocktail_system):
+        self.cocktail_system = cocktail_system
+
+    # key 仅为与 ScoringClient 接口一致：本地查询立即完成，不存在过时请求
+
+    async def score(self, ingredients: Dict[str, float], recipe: str = None,
+                    key: str = None) -> Tuple[int, str, str]:
+        """评分，返回 (得分, 配方名称, 评价)"""
+        return self.cocktail_system.grade_mix(ingredients, recipe)
+
+    async def match(self, ingredients: Dict[str, float], key: str = None) -> str:
+        """查找匹配的配方，没有时返回空字符串"""
+        return self.cocktail_system.find_matching_recipe(ingredients)
+
+    async def search(self, query: str, limit: int = 20, key: str = None) -> List[str]:
+        """搜索配方名称"""
+        return self.cocktail_system.search_recipes(query, limit)
+
+    async def close(self):
+        pass
+
+
+def _ingredients_arg(args) -> Dict[str, float]:
+    """取出并检查 ingredients 参数：{材料名: 用量}"""
+    ingredients = args.get("ingredients")
+    if not isinstance(ingredients, dict) or not all(
+        isinstance(amount, (int, float)) and not isinstance(amount, bool)
+        for amount in ingredients.values()
+    ):
+        raise ValueError("ingredients 必须是 {材料名: 用量} 对象")
+    return ingredients
+
+
+class ScoringServer:
+    """评分守护进程"""
+
+    def __init__(self, cocktail_system, path: str = DEFAULT_SOCKET_PATH, catalog_reader=None):
+        self.cocktail_system = cocktail_system
+        self.path = path
+        # 使用共享内存目录时，每帧请求前检查是否有新发布的目录
+        self.catalog_reader = catalog_reader
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._owns_path = False
+        self._connections = {}  # writer -> 处理该连接的任务
+        self._handlers = {
+            "score": self._op_score,
+            "match": self._op_match,
+            "search": self._op_search,
+        }
+
+    async def start(self):
+        """开始监听；路径上已有服务在运行时抛出 RuntimeError（遗留的套接字文件会被清理）"""
+        sock = bind_private_socket(self.path)
+        self._owns_path = True
+        self._server = await asyncio.start_unix_server(self._handle_connection, sock=sock)
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """停止监听并断开所有客户端"""
+        if self._server is not None:
+            self._server.close()
+            handlers = list(self._connections.values())
+            for writer in list(self._connections):
+                writer.close()
+            # 等待各连接的处理任务读到 EOF 后自行退出
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        # 只删除自己创建的套接字文件
+        if self._owns_path and os.path.exists(self.path):
+            os.unlink(self.path)
+            self._owns_path = False
+
+    def _refresh_catalog(self):
+        if self.catalog_reader is not None:
+            refreshed = self.catalog_reader.refresh()
+            if refreshed is not None:
+                self.cocktail_system = refreshed
+
+    def handle_request(self, request: dict) -> dict:
+        """处理单个请求（同步执行，单次评分在微秒级）
+
+        请求的结构先行检查，格式错误时返回错误响应而不是中断连接。
+        """
+        if not isinstance(request, dict):
+            return {"id": None, "ok": False, "error": "请求必须是 JSON 对象"}
+        request_id = request.get("id")
+        op = request.get("op")
+        handler = self._handlers.get(op) if isinstance(op, str) else None
+        if handler is None:
+            return {"id": request_id, "ok": False, "error": f"未知操作: {op}"}
+        args = request.get("args") or {}
+        if not isinstance(args, dict):
+            return {"id": request_id, "ok": False, "error": "args 必须是 JSON 对象"}
+        try:
+            return {"id": request_id, "ok": True, "result": handler(args)}
+        except (KeyError, TypeError, ValueError, ZeroDivisionError) as e:
+            return {"id": request_id, "ok": False, "error": str(e)}
+
+    def handle_frame(self, frame) -> dict:
+        """处理一帧：单个请求或 {"batch": [请求, ...]}"""
+        if isinstance(frame, dict) and "batch" in frame:
+            batch = frame["batch"]
+            if not isinstance(batch, list):
+                return {"id": None, "ok": False, "error": "batch 必须是请求数组"}
+            return {"batch": [self.handle_request(item) for item in batch]}
+        return self.handle_request(frame)
+
+    def _op_score(self, args):
+        recipe = args.get("recipe")
+        if recipe is not None and not isinstance(recipe, str):
+            raise ValueError("recipe 必须是字符串或 null")
+        score, recipe_name, evaluation = self.cocktail_system.grade_mix(_ingredients_arg(args), recipe)
+        return {"score": score, "recipe": recipe_name, "evaluation": evaluation}
+
+    def _op_match(self, args):
+        return self.cocktail_system.find_matching_recipe(_ingredients_arg(args))
+
+    def _op_search(self, args):
+        query, limit = args.get("query"), args.get("limit", 20)
+        if not isinstance(query, str):
+            raise ValueError("query 必须是字符串")
+        if not isinstance(limit, int) or isinstance(limit, bool):
+            raise ValueError("limit 必须是整数")
+        return self.cocktail_system.search_recipes(query, limit)
+
+    async def _handle_connection(self, reader, writer):
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                request = await read_frame(reader)
+                if request is None:
+                    break
+                self._refresh_catalog()
+                response = self.handle_frame(request)
+                writer.write(encode_frame(response))
+                # 缓冲区未满时 drain 立即返回，连续请求的响应会合并写出
+                await writer.drain()
+        except (ConnectionError, json.JSONDecodeError, UnicodeDecodeError):
+            pass  # 协议错误或客户端断开：直接关闭连接
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+
+class QuerySuperseded(Exception):
+    """同一 key 的查询被更新的查询取代，旧查询不再返回结果"""
+
+
+class ScoringClient:
+    """评分服务客户端
+
+    - 流水线：请求带递增 id 发出，不等待之前的响应。
+    - 批量：同一轮事件循环内发起的请求在下一轮合并成一帧发送。
+    - 取代：带 key 的查询（如"匹配当前配方"）再次发起时，旧查询若还没发出
+      就直接丢弃，已发出的则忽略其响应；旧的调用方收到 QuerySuperseded。
+    """
+
+    def __init__(self, path: str = DEFAULT_SOCKET_PATH):
+        self.path = path
+        self._reader = None
+        self._writer = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._outbox: List[dict] = []
+        self._flush_scheduled = False
+        self._latest_by_key: Dict[str, int] = {}
+        self._connection_error: Optional[Exception] = None
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+        self._connection_error = None
+        self._reader_task = asyncio.ensure_future(self._read_responses())
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        self._outbox.clear()
+        self._fail_pending(ConnectionError("评分服务连接已关闭"))
+
+    async def call(self, op: str, key: str = None, **args):
+        """发起一个请求并等待结果"""
+        if self._writer is None:
+            raise self._connection_error or ConnectionError("尚未连接评分服务")
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        if key is not None:
+            self._supersede(key)
+            self._latest_by_key[key] = request_id
+
+        self._outbox.append({"id": request_id, "op": op, "args": args})
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # 调用方被取消：还没发出的请求不再发送
+            self._drop(request_id)
+            raise
+        finally:
+            if key is not None and self._latest_by_key.get(key) == request_id:
+                del self._latest_by_key[key]
+
+    async def score(self, ingredients: Dict[str, float], recipe: str = None,
+                    key: str = None) -> Tuple[int, str, str]:
+        """评分，返回 (得分, 配方名称, 评价)"""
+        result = await self.call("score", key=key, ingredients=ingredients, recipe=recipe)
+        return result["score"], result["recipe"], result["evaluation"]
+
+    async def match(self, ingredients: Dict[str, float], key: str = None) -> str:
+        """查找匹配的配方，没有时返回空字符串"""
+        return await self.call("match", key=key, ingredients=ingredients)
+
+    async def search(self, query: str, limit: int = 20, key: str = None) -> List[str]:
+        """搜索配方名称"""
+        return await self.call("search", key=key, query=query, limit=limit)
+
+    def _supersede(self, key: str):
+        """取代同一 key 的旧查询"""
+        old_id = self._latest_by_key.pop(key, None)
+        if old_id is None:
+            return
+        future = self._drop(old_id)
+        if future is not None and not future.done():
+            future.set_exception(QuerySuperseded(key))
+
+    def _drop(self, request_id: int) -> Optional[asyncio.Future]:
+        """从发送队列和等待表中移除请求，返回它的 future"""
+        self._outbox = [request for request in self._outbox if request["id"] != request_id]
+        return self._pending.pop(request_id, None)
+
+    def _flush(self):
+        """把本轮积累的请求合并成一帧发出"""
+        self._flush_scheduled = False
+        requests, self._outbox = self._outbox, []
+        if not requests:
+            return
+        if self._writer is None or self._writer.is_closing():
+            error = self._connection_error or ConnectionError("评分服务已断开")
+            for request in requests:
+                future = self._pending.pop(request["id"], None)
+                if future is not None and not future.done():
+                    future.set_exception(error)
+            return
+        message = requests[0] if len(requests) == 1 else {"batch": requests}
+        self._writer.write(encode_frame(message))
+
+    async def _read_responses(self):
+        try:
+            while True:
+                message = await read_frame(self._reader)
+                if message is None:
+                    break
+                for response in message.get("batch", [message]):
+                    self._resolve(response)
+            error = ConnectionError("评分服务已断开")
+        except (ConnectionError, json.JSONDecodeError) as e:
+            error = ConnectionError(f"评分服务连接中断: {e}")
+        self._connection_error = error
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._fail_pending(error)
+
+    def _resolve(self, response: dict):
+        # 被取代或取消的请求不在等待表中，其响应直接忽略
+        future = self._pending.pop(response.get("id"), None)
+        if future is None or future.done():
+            return
+        if response.get("ok"):
+            future.set_result(response.get("result"))
+        else:
+            future.set_exception(RuntimeError(response.get("error", "评分服务错误")))
+
+    def _fail_pending(self, error: Exception):
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+
+async def connect_scoring_backend(cocktail_system, path: Optional[str] = None):
+    """配置了套接字时连接评分服务，否则（或连接失败时）返回进程内后端
+
+    返回 (后端, 连接错误)，连接成功或未配置时错误为 None。
+    """
+    path = get_socket_path(path)
+    if path is None:
+        return LocalScoringBackend(cocktail_system), None
+    client = ScoringClient(path)
+    try:
+        await client.connect()
+    except OSError as e:
+        return LocalScoringBackend(cocktail_system), e
+    return client, None
+
+
+def main():
+    """启动评分守护进程"""
+    import argparse
+    import contextlib
+    import signal
+    import sys
+
+    from .cocktail_system import CocktailSystem
+
+    parser = argparse.ArgumentParser(description="Termix 评分服务")
+    parser.add_argument("--socket", default=get_socket_path() or DEFAULT_SOCKET_PATH,
+                        help=f"Unix 套接字路径（默认 ${SOCKET_ENV_VAR} 或 {DEFAULT_SOCKET_PATH}）")
+    parser.add_argument("--shared-catalog", metavar="NAME",
+                        help="从共享内存目录加载配方（见 src.shared_catalog），并跟随热更新")
+    args = parser.parse_args()
+
+    catalog_reader = None
+    if args.shared_catalog:
+        from .shared_catalog import CatalogReader
+        catalog_reader = CatalogReader(args.shared_catalog)
+        cocktail_system = catalog_reader.load()
+    else:
+        with contextlib.redirect_stdout(sys.stderr):
+            cocktail_system = CocktailSystem()
+    server = ScoringServer(cocktail_system, args.socket, catalog_reader)
+
+    async def run():
+        try:
+            await server.start()
+        except RuntimeError as e:
+            sys.exit(f"评分服务未启动: {e}")
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        print(f"🍸 评分服务已启动: {args.socket}", file=sys.stderr)
+        try:
+            await stop.wait()
+        finally:
+            await server.close()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
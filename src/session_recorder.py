@@ -0,0 +1,291 @@
+"""
+会话录制与回放模块 - 记录 TermixApp 处理的输入和消息，并在无头模式下确定性回放
+
+录制（main.py --record）时每行写入一条 JSON：
+
+    {"e": "session", "version": 1, "seed": 42, "size": [120, 40], "fast": false}
+    {"t": 812.5, "e": "key", "key": "enter", "char": "\\r"}
+    {"t": 930.1, "e": "mouse_down", "x": 60, "y": 20, "button": 1}
+    {"t": 1204.7, "e": "message", "name": "StartMixingMessage", "ingredients": {...}}
+    {"t": 4410.2, "e": "result", "recipe": "莫吉托", "score": 92}
+
+t 为相对录制开始的毫秒数。key / mouse / resize 是输入，回放时通过
+Textual 的 run_test pilot 重新发送；ready / message / result 是应用的输出，
+回放时作为同步点：等回放中的应用产生同样的输出后再发送下一条输入，
+因此即使全速回放（不按录制时的间隔等待），事件顺序也与录制时一致。
+录制和回放都以同一个种子初始化 random，角色台词和配方提示也会一致。
+
+    python main.py --record session.jsonl
+    python -m src.session_recorder replay session.jsonl
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .perf_stats import summarize
+
+FORMAT_VERSION = 1
+
+INPUT_EVENTS = ("key", "mouse_down", "mouse_up", "resize")
+OUTPUT_EVENTS = ("ready", "message", "result")
+
+
+class SessionRecorder:
+    """会话录制器
+
+    output 为文件路径时逐行写入（崩溃时已写入的部分仍可回放），
+    为 None 时只保存在内存中（回放时用来收集回放会话的输出）。
+    """
+
+    def __init__(self, output: Optional[str] = None, seed: Optional[int] = None):
+        self.seed = seed
+        self.entries: List[Dict[str, Any]] = []
+        self._file = open(output, "w", encoding="utf-8", buffering=1) if output else None
+        self._started = time.monotonic()
+        self._counts: Dict[str, int] = {}
+        self._size = None
+        self._changed: Optional[asyncio.Event] = None
+
+    def start(self, size, fast=None):
+        """写入会话头（应用挂载后调用）"""
+        self._started = time.monotonic()
+        self._size = (size[0], size[1])
+        self._write({
+            "e": "session",
+            "version": FORMAT_VERSION,
+            "seed": self.seed,
+            "size": [size[0], size[1]],
+            "fast": fast,
+        })
+
+    def record(self, kind: str, **fields):
+        """记录一条事件"""
+        entry = {"t": round((time.monotonic() - self._started) * 1000, 1), "e": kind, **fields}
+        self._counts[kind] = self._counts.get(kind, 0) + 1
+        self._write(entry)
+        if self._changed is not None:
+            self._changed.set()
+
+    def record_key(self, event):
+        self.record("key", key=event.key, char=event.character)
+
+    def record_mouse(self, kind: str, event):
+        self.record(kind, x=int(event.screen_x), y=int(event.screen_y), button=event.button)
+
+    def record_resize(self, size):
+        # 挂载前和尺寸未变的 Resize（初始布局）不是用户操作
+        if self._size is None or self._size == (size.width, size.height):
+            return
+        self._size = (size.width, size.height)
+        self.record("resize", size=[size.width, size.height])
+
+    def record_message(self, message):
+        """记录应用处理的消息，附带可序列化的关键字段"""
+        fields = {}
+        ingredients = getattr(message, "ingredients", None)
+        if isinstance(ingredients, dict):
+            fields["ingredients"] = ingredients
+        recipe = getattr(message, "recipe", None)
+        if recipe is not None:
+            fields["recipe"] = recipe.name
+        self.record("message", name=type(message).__name__, **fields)
+
+    def count(self, kind: str) -> int:
+        return self._counts.get(kind, 0)
+
+    async def wait_for(self, kind: str, count: int, timeout: float) -> bool:
+        """等待 kind 类事件累计达到 count 条，超时返回 False"""
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        deadline = time.monotonic() + timeout
+        while self.count(kind) < count:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, entry):
+        self.entries.append(entry)
+        if self._file is not None:
+            self._file.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+def load_recording(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """读取录制文件，返回 (会话头, 事件列表)"""
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    if not lines or lines[0].get("e") != "session":
+        raise ValueError(f"{path} 不是 Termix 会话录制文件")
+    header = lines[0]
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"不支持的录制格式版本: {header.get('version')}")
+    return header, lines[1:]
+
+
+def _outputs(entries):
+    """输出事件去掉时间戳，用于比较录制与回放是否一致"""
+    return [
+        {key: value for key, value in entry.items() if key != "t"}
+        for entry in entries if entry["e"] in ("message", "result")
+    ]
+
+
+class _InputDispatcher:
+    """通过 pilot 重新发送录制的输入
+
+    真实终端的按下/抬起由 App.on_event 合成点击，而 pilot 的鼠标事件绕过
+    App.on_event，因此同一位置的按下+抬起回放为一次 pilot.click。
+    """
+
+    def __init__(self, pilot):
+        self.pilot = pilot
+        self._pending_down = None
+
+    async def dispatch(self, entry):
+        from textual.pilot import OutOfBounds
+
+        kind = entry["e"]
+        try:
+            if kind == "mouse_down":
+                await self.flush()
+                self._pending_down = entry
+            elif kind == "mouse_up":
+                down, self._pending_down = self._pending_down, None
+                offset = (entry["x"], entry["y"])
+                if down is not None and (down["x"], down["y"]) == offset:
+                    await self.pilot.click(offset=offset, button=down["button"])
+                else:
+                    if down is not None:
+                        await self.pilot.mouse_down(offset=(down["x"], down["y"]), button=down["button"])
+                    await self.pilot.mouse_up(offset=offset)
+            else:
+                await self.flush()
+                if kind == "key":
+                    await self.pilot.press(entry["key"])
+                elif kind == "resize":
+                    await self.pilot.resize_terminal(*entry["size"])
+        except OutOfBounds:
+            return False
+        return True
+
+    async def flush(self):
+        down, self._pending_down = self._pending_down, None
+        if down is not None:
+            await self.pilot.mouse_down(offset=(down["x"], down["y"]), button=down["button"])
+
+
+async def replay(path: str, fast: Optional[bool] = None, realtime: bool = False,
+                 size: Optional[Tuple[int, int]] = None, sync_timeout: float = 30.0) -> Dict[str, Any]:
+    """无头回放一段录制，返回回放报告
+
+    fast 为 None 时沿用录制时的设置；realtime 为 True 时按录制的时间间隔发送输入
+    （复现卡顿），否则全速回放。
+    """
+    import random
+
+    from main import TermixApp
+
+    header, entries = load_recording(path)
+    if header.get("seed") is not None:
+        random.seed(header["seed"])
+
+    recorder = SessionRecorder(seed=header.get("seed"))
+    app = TermixApp(fast=header.get("fast") if fast is None else fast, recorder=recorder)
+    latencies: List[float] = []
+    expected: Dict[str, int] = {}
+    desyncs: List[Dict[str, Any]] = []
+    skipped = 0
+
+    async with app.run_test(size=tuple(size or header["size"])) as pilot:
+        dispatcher = _InputDispatcher(pilot)
+        started = time.perf_counter()
+        for entry in entries:
+            kind = entry["e"]
+            if realtime:
+                delay = entry.get("t", 0) / 1000 - (time.perf_counter() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            if kind in INPUT_EVENTS:
+                dispatched_at = time.perf_counter()
+                if await dispatcher.dispatch(entry):
+                    latencies.append((time.perf_counter() - dispatched_at) * 1000)
+                else:
+                    skipped += 1
+            elif kind in OUTPUT_EVENTS:
+                # 同步点：回放中的应用产生同样多的该类输出后再继续
+                expected[kind] = expected.get(kind, 0) + 1
+                if not await recorder.wait_for(kind, expected[kind], sync_timeout):
+                    desyncs.append({"t": entry.get("t"), "e": kind, "reason": "timeout"})
+        await dispatcher.flush()
+        await pilot.pause()
+        elapsed = (time.perf_counter() - started) * 1000
+
+    recorded_outputs = _outputs(entries)
+    replayed_outputs = _outputs(recorder.entries)
+    for index, (recorded, replayed) in enumerate(zip(recorded_outputs, replayed_outputs)):
+        if recorded != replayed:
+            desyncs.append({"index": index, "recorded": recorded, "replayed": replayed})
+    if len(recorded_outputs) != len(replayed_outputs):
+        desyncs.append({"reason": "output_count", "recorded": len(recorded_outputs),
+                        "replayed": len(replayed_outputs)})
+
+    return {
+        "recording": path,
+        "inputs": sum(1 for entry in entries if entry["e"] in INPUT_EVENTS),
+        "skipped_inputs": skipped,
+        "recorded_ms": entries[-1].get("t", 0) if entries else 0,
+        "replay_ms": round(elapsed, 1),
+        "input_latency_ms": summarize(latencies),
+        "desyncs": desyncs,
+    }
+
+
+def main():
+    """回放命令行"""
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Termix 会话回放")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    replay_parser = subparsers.add_parser("replay", help="无头回放录制的会话")
+    replay_parser.add_argument("recording", help="main.py --record 生成的录制文件")
+    replay_parser.add_argument("--realtime", action="store_true", help="按录制时的时间间隔发送输入")
+    replay_parser.add_argument("--fast", action="store_true", default=None,
+                               help="压缩调酒动画（默认沿用录制时的设置）")
+    replay_parser.add_argument("--size", metavar="WxH", help="终端尺寸（默认沿用录制时的尺寸）")
+    replay_parser.add_argument("--timeout", type=float, default=30.0, help="等待每个同步点的最长秒数")
+    replay_parser.add_argument("--report", metavar="PATH", help="把回放报告写入文件（默认输出到标准输出）")
+    args = parser.parse_args()
+
+    size = None
+    if args.size:
+        width, _, height = args.size.lower().partition("x")
+        size = (int(width), int(height))
+
+    report = asyncio.run(replay(args.recording, fast=args.fast, realtime=args.realtime,
+                                size=size, sync_timeout=args.timeout))
+    data = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(data + "\n")
+    else:
+        print(data)
+    # 回放输出与录制不一致时以非零状态退出，便于在 CI 中发现行为变化
+    sys.exit(1 if report["desyncs"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,464 @@
+"""
+会话预热模块 - 为每个访客 fork 一个预热好的 TermixApp 会话
+
+浏览器托管（textual-serve 等）时每个访客对应一个 Python 进程。预热进程
+（zygote）启动时一次性导入 Textual/Rich 和全部界面模块、加载配方目录并跑
+一遍无头会话预热，然后冻结 GC；之后每个会话只需 fork，目录等只读数据以
+写时复制的方式在各会话间共享。
+
+    python -m src.session_zygote serve
+    textual-serve "python -m src.session_zygote attach"
+
+attach 端只依赖标准库：通过 Unix 套接字把自己的 stdin/stdout/stderr 连同
+命令行参数、环境变量和工作目录交给预热进程，之后转发信号并等待会话结束，
+以会话的退出码退出。
+
+会话以预热进程属主的身份运行，因此套接字只允许属主连接（权限 0600，
+并用 SO_PEERCRED 核对对端 uid）。请求在选择循环里非阻塞地读取，
+迟迟不发完请求的客户端不会耽误其他会话的接入和退出码回收。
+"""
+
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+
+from .unix_sockets import bind_private_socket, default_socket_path
+
+SOCKET_ENV_VAR = "TERMIX_ZYGOTE_SOCKET"
+DEFAULT_SOCKET_PATH = default_socket_path("termix-zygote")
+MAX_REQUEST_SIZE = 1 << 20
+
+_LENGTH = struct.Struct(">I")
+_STATUS = struct.Struct(">i")
+_FORWARDED_SIGNALS = ("SIGINT", "SIGTERM", "SIGHUP", "SIGWINCH")
+_PEERCRED = struct.Struct("3i")  # struct ucred: pid, uid, gid
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("连接已关闭")
+        data += chunk
+    return data
+
+
+# ---------------------------------------------------------------------------
+# attach 端
+# ---------------------------------------------------------------------------
+
+def attach(path: str, argv=None) -> int:
+    """把当前终端交给预热进程开启一个会话，返回会话退出码"""
+    request = {
+        "argv": list(sys.argv[1:] if argv is None else argv),
+        "env": dict(os.environ),
+        "cwd": os.getcwd(),
+    }
+    payload = json.dumps(request).encode("utf-8")
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(path)
+    # 描述符随第一段数据发送；send_fds 可能只发出一部分，剩余部分用 sendall 补齐
+    frame = _LENGTH.pack(len(payload)) + payload
+    sent = socket.send_fds(sock, [frame], [0, 1, 2])
+    if sent < len(frame):
+        sock.sendall(frame[sent:])
+
+    # 预热进程回复会话进程的 pid，信号直接转发给它
+    (session_pid,) = _STATUS.unpack(_recv_exactly(sock, _STATUS.size))
+
+    def forward(signum, frame):
+        try:
+            os.kill(session_pid, signum)
+        except ProcessLookupError:
+            pass
+
+    for name in _FORWARDED_SIGNALS:
+        signal.signal(getattr(signal, name), forward)
+
+    try:
+        (exit_code,) = _STATUS.unpack(_recv_exactly(sock, _STATUS.size))
+    except ConnectionError:
+        exit_code = 1
+    finally:
+        sock.close()
+    return exit_code
+
+
+# ---------------------------------------------------------------------------
+# 预热进程
+# ---------------------------------------------------------------------------
+
+class SessionZygote:
+    """会话预热进程"""
+
+    def __init__(self, path: str = DEFAULT_SOCKET_PATH, warm_up: bool = True):
+        self.path = path
+        self.warm_up = warm_up
+        self.sessions = {}  # pid -> 对应 attach 端的连接
+        self._listener = None
+        self._owns_path = False
+        self._selector = None
+        self._wakeup = None
+        self.preloaded = {}
+
+    def preload(self):
+        """导入全部模块并加载共享数据"""
+        import contextlib
+        import gc
+
+        with contextlib.redirect_stdout(sys.stderr):
+            import main as termix_main
+            from src.character import BunnyGirl
+            from src.shared_catalog import load_cocktail_system
+
+            # 配置了 TERMIX_SHARED_CATALOG 时从共享内存目录解码
+            cocktail_system, error = load_cocktail_system()
+            if error is not None:
+                print(f"⚠️  {error}，改用配置文件", file=sys.stderr)
+            bunny_girl = BunnyGirl()
+
+            # 预先生成各会话都会用到的只读缓存
+            for recipe in cocktail_system.get_unlocked_recipes():
+                cocktail_system.get_recipe_fragments(recipe)
+            for mood in ("happy", "working", "excited", "thinking"):
+                for frame in range(BunnyGirl.FRAME_VARIANTS.get(mood, 1)):
+                    bunny_girl.get_ascii_art(mood, frame)
+
+            if self.warm_up:
+                self._run_warm_up_session(termix_main, bunny_girl, cocktail_system)
+
+        self.preloaded = {
+            "main": termix_main,
+            "bunny_girl": bunny_girl,
+            "cocktail_system": cocktail_system,
+        }
+
+        # 之后不再产生需要回收的长期对象：冻结 GC，避免子进程的回收扫描
+        # 触碰共享页面导致写时复制
+        gc.collect()
+        gc.freeze()
+
+    @staticmethod
+    def _run_warm_up_session(termix_main, bunny_girl, cocktail_system):
+        """跑一遍无头会话，把 Textual 运行时才按需导入的模块提前加载"""
+        import asyncio
+
+        async def run():
+            app = termix_main.TermixApp(fast=True, bunny_girl=bunny_girl, cocktail_system=cocktail_system)
+            async with app.run_test(size=(120, 40)) as pilot:
+                await app.game_ready.wait()
+                await pilot.click("#start_game")
+                await pilot.pause()
+
+        asyncio.run(run())
+
+    def serve_forever(self):
+        """监听会话请求，直到收到 SIGINT/SIGTERM；路径上已有服务在运行时抛出 RuntimeError"""
+        import selectors
+
+        self._listener = bind_private_socket(self.path)
+        self._owns_path = True
+        self._listener.listen(64)
+        self._listener.setblocking(False)
+
+        # SIGCHLD 等信号通过自管道唤醒 select
+        wakeup_r, wakeup_w = socket.socketpair()
+        wakeup_r.setblocking(False)
+        wakeup_w.setblocking(False)
+        self._wakeup = (wakeup_r, wakeup_w)
+        signal.set_wakeup_fd(wakeup_w.fileno())
+        stopping = []
+        signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+        signal.signal(signal.SIGINT, lambda signum, frame: stopping.append(signum))
+        signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._listener, selectors.EVENT_READ, "accept")
+        self._selector.register(wakeup_r, selectors.EVENT_READ, "signal")
+
+        print(f"🍸 会话预热进程已启动: {self.path}", file=sys.stderr)
+        try:
+            while not stopping:
+                for key, _ in self._selector.select():
+                    if key.data == "accept":
+                        self._accept()
+                    elif key.data == "signal":
+                        try:
+                            wakeup_r.recv(4096)
+                        except BlockingIOError:
+                            pass
+                        self._reap()
+                    elif isinstance(key.data, _PendingRequest):
+                        self._read_request(key.data)
+                    else:
+                        self._on_attach_closed(key.data)
+        finally:
+            self.close()
+
+    def close(self):
+        for pid in list(self.sessions):
+            _kill(pid, signal.SIGHUP)
+        if self._selector is not None:
+            for key in list(self._selector.get_map().values()):
+                if isinstance(key.data, _PendingRequest):
+                    key.data.close()
+            self._selector.close()
+            self._selector = None
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        # 只删除自己创建的套接字文件
+        if self._owns_path and os.path.exists(self.path):
+            os.unlink(self.path)
+            self._owns_path = False
+        if self._wakeup is not None:
+            signal.set_wakeup_fd(-1)
+            for sock in self._wakeup:
+                sock.close()
+            self._wakeup = None
+
+    def _accept(self):
+        """接受连接并登记到选择循环，请求等可读时再读"""
+        import selectors
+
+        try:
+            conn, _ = self._listener.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        if not _peer_is_owner(conn):
+            print("⚠️  拒绝会话请求: 对端不是预热进程的属主", file=sys.stderr)
+            conn.close()
+            return
+        conn.setblocking(False)
+        self._selector.register(conn, selectors.EVENT_READ, _PendingRequest(conn))
+
+    def _read_request(self, pending):
+        """读取已到达的请求数据；请求完整后 fork 会话"""
+        import selectors
+
+        try:
+            request = pending.feed()
+        except (OSError, ValueError) as e:
+            print(f"⚠️  拒绝会话请求: {e}", file=sys.stderr)
+            self._selector.unregister(pending.conn)
+            pending.close()
+            return
+        if request is None:
+            return
+
+        conn, fds = pending.conn, pending.fds
+        self._selector.unregister(conn)
+        pid = os.fork()
+        if pid == 0:
+            self._run_session(request, fds, conn)  # 不会返回
+
+        for fd in fds:
+            os.close(fd)
+        pending.fds = []
+        conn.setblocking(True)
+        try:
+            conn.sendall(_STATUS.pack(pid))
+        except OSError:
+            # attach 端已经离开：不再等它，直接挂断会话
+            _kill(pid, signal.SIGHUP)
+        conn.setblocking(False)
+        self.sessions[pid] = conn
+        self._selector.register(conn, selectors.EVENT_READ, pid)
+
+    def _run_session(self, request, fds, conn):
+        """子进程：接管 attach 端的终端并运行 TermixApp"""
+        exit_code = 1
+        try:
+            # 与预热进程脱离：独立会话、恢复默认信号处理、关闭无关的描述符
+            os.setsid()
+            signal.set_wakeup_fd(-1)
+            for signum in (signal.SIGCHLD, signal.SIGINT, signal.SIGTERM):
+                signal.signal(signum, signal.SIG_DFL)
+            for key in list(self._selector.get_map().values()):
+                if isinstance(key.data, _PendingRequest):
+                    key.data.close()
+            self._selector.close()
+            self._listener.close()
+            for sock in self._wakeup:
+                sock.close()
+            conn.close()
+            for other in self.sessions.values():
+                other.close()
+
+            for target, fd in enumerate(fds):
+                os.dup2(fd, target)
+                os.close(fd)
+            sys.stdin = open(0, "r", closefd=False)
+            sys.stdout = open(1, "w", closefd=False)
+            sys.stderr = open(2, "w", closefd=False)
+
+            os.chdir(request["cwd"])
+            os.environ.clear()
+            os.environ.update(request["env"])
+            sys.argv = ["main.py", *request["argv"]]
+            _reload_textual_settings()
+
+            from src.startup_profiler import profiler
+            profiler.reset()
+            profiler.enable_from_env()
+
+            preloaded = self.preloaded
+            exit_code = preloaded["main"].main(
+                request["argv"],
+                bunny_girl=preloaded["bunny_girl"],
+                cocktail_system=preloaded["cocktail_system"],
+            )
+            profiler.dump()
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except BaseException:
+            import traceback
+            traceback.print_exc()
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            finally:
+                os._exit(exit_code)
+
+    def _reap(self):
+        """回收已结束的会话并把退出码发给 attach 端"""
+        while self.sessions:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            conn = self.sessions.pop(pid, None)
+            if conn is None:
+                continue
+            if conn.fileno() in self._selector.get_map():
+                self._selector.unregister(conn)
+            try:
+                conn.setblocking(True)
+                conn.sendall(_STATUS.pack(os.waitstatus_to_exitcode(status)))
+            except OSError:
+                pass
+            conn.close()
+
+    def _on_attach_closed(self, pid):
+        """attach 端断开（访客离开）：挂断对应会话"""
+        conn = self.sessions.get(pid)
+        if conn is None:
+            return
+        try:
+            if conn.recv(1):
+                return
+        except BlockingIOError:
+            return
+        except OSError:
+            pass
+        # 不再监听该连接，等会话退出后在 _reap 中回收
+        self._selector.unregister(conn)
+        _kill(pid, signal.SIGHUP)
+
+
+class _PendingRequest:
+    """尚未读完的会话请求：长度前缀 + JSON，三个描述符随第一段数据到达"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.buffer = b""
+        self.fds = []
+
+    def feed(self):
+        """读取当前可读的数据；请求完整时返回解析结果，否则返回 None"""
+        try:
+            data, fds, _, _ = socket.recv_fds(self.conn, 65536, 3)
+        except (BlockingIOError, InterruptedError):
+            return None
+        self.fds.extend(fds)
+        if not data:
+            raise ValueError("请求未发完连接就已关闭")
+        if len(self.fds) != 3:
+            raise ValueError("请求格式错误: 需要随第一段数据传递 stdin/stdout/stderr")
+        self.buffer += data
+
+        if len(self.buffer) < _LENGTH.size:
+            return None
+        (length,) = _LENGTH.unpack_from(self.buffer)
+        if length > MAX_REQUEST_SIZE:
+            raise ValueError("请求过大")
+        if len(self.buffer) < _LENGTH.size + length:
+            return None
+        request = json.loads(self.buffer[_LENGTH.size:_LENGTH.size + length])
+        if not isinstance(request, dict) or not {"argv", "env", "cwd"} <= request.keys():
+            raise ValueError("请求格式错误: 缺少 argv/env/cwd")
+        return request
+
+    def close(self):
+        for fd in self.fds:
+            os.close(fd)
+        self.fds = []
+        self.conn.close()
+
+
+def _peer_is_owner(conn) -> bool:
+    """核对对端 uid（仅 Linux 提供 SO_PEERCRED，其他平台依靠套接字文件权限）"""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return True
+    try:
+        _, uid, _ = _PEERCRED.unpack(conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, _PEERCRED.size))
+    except OSError:
+        return False
+    return uid == os.getuid()
+
+
+def _kill(pid, signum):
+    try:
+        os.kill(pid, signum)
+    except ProcessLookupError:
+        pass
+
+
+def _reload_textual_settings():
+    """按会话的环境变量重新读取 Textual 的设置（驱动、颜色、帧率等）"""
+    import importlib
+    import textual.constants
+
+    importlib.reload(textual.constants)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Termix 会话预热进程")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    default_socket = os.environ.get(SOCKET_ENV_VAR) or DEFAULT_SOCKET_PATH
+    serve_parser = subparsers.add_parser("serve", help="启动预热进程")
+    serve_parser.add_argument("--socket", default=default_socket, help="监听的 Unix 套接字")
+    serve_parser.add_argument("--no-warm-up", action="store_true", help="跳过无头预热会话")
+
+    attach_parser = subparsers.add_parser("attach", help="开启一个会话（供 textual-serve 等调用）")
+    attach_parser.add_argument("--socket", default=default_socket, help="预热进程的 Unix 套接字")
+    attach_parser.add_argument("app_args", nargs=argparse.REMAINDER, help="传给 main.py 的参数")
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        zygote = SessionZygote(args.socket, warm_up=not args.no_warm_up)
+        zygote.preload()
+        try:
+            zygote.serve_forever()
+        except RuntimeError as e:
+            sys.exit(f"会话预热进程未启动: {e}")
+    else:
+        app_args = args.app_args
+        if app_args[:1] == ["--"]:
+            app_args = app_args[1:]
+        sys.exit(attach(args.socket, app_args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,440 @@
+"""
+共享内存目录模块 - 多进程部署时只解析一次配方目录
+
+发布端把 CocktailSystem 的材料、配方和游戏配置编码成扁平数组加字符串表，
+写入一段 multiprocessing.shared_memory；评分进程池、评分服务、游戏会话等
+读取端直接附加这段内存解码，不再各自读取、解析和校验 JSON 配置文件。
+
+共享的只是解析结果的编码，不是常驻内存：读取端加载时把整段数据解码成
+本进程的 Ingredient / CocktailRecipe 对象并建立索引，之后即与共享内存
+无关，每个进程仍各持有一份完整的目录。节省的是每个进程的加载时间
+（解码比读取 JSON 配置快一倍多），以及热更新时的统一发布。
+
+共享内存分两部分：
+- 控制块 "<name>"：seqlock 序号 + 代号（generation）+ 当前数据段名称。
+  发布端更新时先把序号加到奇数，写完再加到偶数；读取端读到奇数或前后
+  序号不一致就重读，因此读取端无需加锁。
+- 数据段 "<name>.<generation>"：写入后不再修改。热更新时发布端写入新的
+  数据段、更新控制块，再删除旧数据段（已附加的读取端映射仍然有效）。
+
+    python -m src.shared_catalog publish --watch     # 发布并在配置变化时重新发布
+    TERMIX_SHARED_CATALOG=termix_catalog python main.py
+"""
+
+import json
+import os
+import struct
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .data_models import CocktailRecipe, Ingredient, IngredientType
+
+DEFAULT_CATALOG_NAME = "termix_catalog"
+SHARED_CATALOG_ENV_VAR = "TERMIX_SHARED_CATALOG"
+
+_MAGIC = b"TMXC"
+_FORMAT_VERSION = 1
+_INGREDIENT_TYPES = list(IngredientType)
+_TYPE_INDEX = {ingredient_type: index for index, ingredient_type in enumerate(_INGREDIENT_TYPES)}
+
+# 控制块：序号，其后是代号和数据段名称
+_SEQUENCE = struct.Struct("<Q")
+_CONTROL_BODY = struct.Struct("<Q64s")
+_CONTROL_SIZE = _SEQUENCE.size + _CONTROL_BODY.size
+_CONTROL_READ_TIMEOUT = 1.0
+# 数据段头：魔数、格式版本、代号、游戏配置的字符串编号、各区段条目数和偏移
+_HEADER = struct.Struct("<4sIQI5I5Q")
+# 字符串表索引：(偏移, 字节长度)
+_STRING = struct.Struct("<II")
+# 材料：名称、类型、颜色、酒精度、表情、描述、风味起始下标、风味数量
+_INGREDIENT = struct.Struct("<IIIdIIII")
+# 配方：名称、描述、难度、表情、ASCII 艺术、标签起始/数量、材料起始/数量
+_RECIPE = struct.Struct("<9I")
+# 字符串编号列表（风味、标签）
+_SID = struct.Struct("<I")
+# 配方材料用量：(材料名称编号, 用量)
+_AMOUNT = struct.Struct("<Id")
+
+
+def _attach(name: str):
+    """以只读用途附加已有的共享内存段
+
+    读取端不应在退出时删除共享内存：Python 3.13 起用 track=False；更早的
+    版本在附加期间跳过 resource_tracker 登记。登记会按需启动跟踪进程，
+    在 Textual 等替换了 sys.stderr 的环境中会失败，之后再注销又会影响同一
+    进程中发布端的登记，因此不登记而不是登记后注销。
+    """
+    from multiprocessing import shared_memory
+
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        from multiprocessing import resource_tracker
+
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class _StringTable:
+    """去重的字符串表"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.encoded: List[bytes] = []
+
+    def add(self, text: str) -> int:
+        sid = self.ids.get(text)
+        if sid is None:
+            sid = self.ids[text] = len(self.encoded)
+            self.encoded.append(text.encode("utf-8"))
+        return sid
+
+
+def encode_catalog(cocktail_system, generation: int = 0) -> bytes:
+    """把目录编码成一段连续的字节"""
+    strings = _StringTable()
+    sids: List[int] = []
+    amounts: List[Tuple[int, float]] = []
+
+    ingredient_rows = []
+    for ingredient in cocktail_system.ingredients.values():
+        start = len(sids)
+        sids.extend(strings.add(flavor) for flavor in ingredient.flavor_profile)
+        ingredient_rows.append(_INGREDIENT.pack(
+            strings.add(ingredient.name),
+            _TYPE_INDEX[ingredient.type],
+            strings.add(ingredient.color),
+            float(ingredient.alcohol_content),
+            strings.add(ingredient.emoji),
+            strings.add(ingredient.description),
+            start,
+            len(ingredient.flavor_profile),
+        ))
+
+    recipe_rows = []
+    for recipe in cocktail_system.recipes.values():
+        tag_start = len(sids)
+        sids.extend(strings.add(tag) for tag in recipe.flavor_tags)
+        amount_start = len(amounts)
+        amounts.extend((strings.add(name), float(amount)) for name, amount in recipe.ingredients.items())
+        recipe_rows.append(_RECIPE.pack(
+            strings.add(recipe.name),
+            strings.add(recipe.description),
+            recipe.difficulty,
+            strings.add(recipe.emoji),
+            strings.add(recipe.ascii_art),
+            tag_start,
+            len(recipe.flavor_tags),
+            amount_start,
+            len(recipe.ingredients),
+        ))
+
+    game_config_sid = strings.add(json.dumps(cocktail_system.game_config, ensure_ascii=False))
+
+    string_index = []
+    offset = 0
+    for encoded in strings.encoded:
+        string_index.append(_STRING.pack(offset, len(encoded)))
+        offset += len(encoded)
+
+    sections = [
+        b"".join(string_index),
+        b"".join(strings.encoded),
+        b"".join(ingredient_rows),
+        b"".join(recipe_rows),
+        b"".join(_SID.pack(sid) for sid in sids),
+        b"".join(_AMOUNT.pack(sid, amount) for sid, amount in amounts),
+    ]
+    counts = [len(strings.encoded), len(ingredient_rows), len(recipe_rows), len(sids), len(amounts)]
+
+    # 区段顺序：字符串索引、字符串数据、材料、配方、编号列表、用量；
+    # 字符串数据的长度由索引推出，只记录其余区段的偏移
+    offsets = []
+    position = _HEADER.size
+    for index, section in enumerate(sections):
+        if index != 1:
+            offsets.append(position)
+        position += len(section)
+
+    header = _HEADER.pack(_MAGIC, _FORMAT_VERSION, generation, game_config_sid, *counts, *offsets)
+    return header + b"".join(sections)
+
+
+def decode_catalog(buffer) -> Tuple[int, Dict, Dict[str, Ingredient], Dict[str, CocktailRecipe]]:
+    """从字节缓冲区解码目录，返回 (代号, 游戏配置, 材料, 配方)
+
+    返回的对象都是本进程的副本，不再引用 buffer。
+    """
+    view = memoryview(buffer)
+    (magic, version, generation, game_config_sid,
+     n_strings, n_ingredients, n_recipes, n_sids, n_amounts,
+     index_offset, ingredient_offset, recipe_offset, sid_offset, amount_offset) = _HEADER.unpack_from(view)
+    if magic != _MAGIC or version != _FORMAT_VERSION:
+        raise ValueError("共享目录格式不兼容")
+
+    blob_offset = index_offset + n_strings * _STRING.size
+    blob = view[blob_offset:ingredient_offset].tobytes()
+    strings = [
+        blob[offset:offset + length].decode("utf-8")
+        for offset, length in _STRING.iter_unpack(view[index_offset:blob_offset])
+    ]
+    sids = [strings[sid] for (sid,) in _SID.iter_unpack(view[sid_offset:sid_offset + n_sids * _SID.size])]
+    amounts = [
+        (strings[sid], amount)
+        for sid, amount in _AMOUNT.iter_unpack(view[amount_offset:amount_offset + n_amounts * _AMOUNT.size])
+    ]
+
+    ingredients: Dict[str, Ingredient] = {}
+    end = ingredient_offset + n_ingredients * _INGREDIENT.size
+    for name, type_index, color, alcohol, emoji, description, start, count in \
+            _INGREDIENT.iter_unpack(view[ingredient_offset:end]):
+        ingredients[strings[name]] = Ingredient(
+            name=strings[name],
+            type=_INGREDIENT_TYPES[type_index],
+            color=strings[color],
+            flavor_profile=sids[start:start + count],
+            alcohol_content=alcohol,
+            emoji=strings[emoji],
+            description=strings[description],
+        )
+
+    recipes: Dict[str, CocktailRecipe] = {}
+    end = recipe_offset + n_recipes * _RECIPE.size
+    for name, description, difficulty, emoji, ascii_art, tag_start, tag_count, amount_start, amount_count in \
+            _RECIPE.iter_unpack(view[recipe_offset:end]):
+        recipes[strings[name]] = CocktailRecipe(
+            name=strings[name],
+            ingredients=dict(amounts[amount_start:amount_start + amount_count]),
+            description=strings[description],
+            difficulty=difficulty,
+            emoji=strings[emoji],
+            flavor_tags=sids[tag_start:tag_start + tag_count],
+            ascii_art=strings[ascii_art],
+        )
+
+    game_config = json.loads(strings[game_config_sid])
+    view.release()
+    return generation, game_config, ingredients, recipes
+
+
+def _read_control(buffer) -> Tuple[int, str]:
+    """按 seqlock 协议读取控制块，返回 (代号, 数据段名称)"""
+    deadline = None
+    while True:
+        (sequence,) = _SEQUENCE.unpack_from(buffer)
+        generation, segment_name = _CONTROL_BODY.unpack_from(buffer, _SEQUENCE.size)
+        if sequence % 2 == 0 and _SEQUENCE.unpack_from(buffer)[0] == sequence:
+            return generation, segment_name.rstrip(b"\0").decode("ascii")
+        # 发布端正在写入：让出 CPU 后重读；长时间停在奇数说明发布端写到一半退出了
+        if deadline is None:
+            deadline = time.monotonic() + _CONTROL_READ_TIMEOUT
+        elif time.monotonic() > deadline:
+            raise RuntimeError("共享目录控制块损坏（发布端可能异常退出）")
+        time.sleep(0)
+
+
+class CatalogPublisher:
+    """目录发布端（每个目录名只应有一个发布端）"""
+
+    def __init__(self, name: str = DEFAULT_CATALOG_NAME):
+        from multiprocessing import shared_memory
+
+        self.name = name
+        self.generation = 0
+        self._data = None
+        self._stale_segment = None
+        try:
+            self._control = shared_memory.SharedMemory(name=name, create=True, size=_CONTROL_SIZE)
+        except FileExistsError:
+            # 接管上一个发布端留下的控制块，代号继续递增
+            self._control = shared_memory.SharedMemory(name=name)
+            self.generation, segment_name = _CONTROL_BODY.unpack_from(self._control.buf, _SEQUENCE.size)
+            self._stale_segment = segment_name.rstrip(b"\0").decode("ascii") or None
+
+    def publish(self, cocktail_system) -> int:
+        """发布（或热更新）目录，返回新的代号"""
+        from multiprocessing import shared_memory
+
+        generation = self.generation + 1
+        payload = encode_catalog(cocktail_system, generation)
+        segment_name = f"{self.name}.{generation}"
+        data = shared_memory.SharedMemory(name=segment_name, create=True, size=len(payload))
+        data.buf[:len(payload)] = payload
+
+        # seqlock 写入：奇数序号表示正在更新
+        buffer = self._control.buf
+        (sequence,) = _SEQUENCE.unpack_from(buffer)
+        sequence += 1 if sequence % 2 == 0 else 0
+        _SEQUENCE.pack_into(buffer, 0, sequence)
+        _CONTROL_BODY.pack_into(buffer, _SEQUENCE.size, generation, segment_name.encode("ascii"))
+        _SEQUENCE.pack_into(buffer, 0, sequence + 1)
+
+        # 旧数据段取消链接；已附加的读取端仍可继续使用到重新附加为止
+        previous, self._data = self._data, data
+        if previous is not None:
+            previous.close()
+            previous.unlink()
+        elif self._stale_segment:
+            # 接管时上一个发布端留下的数据段
+            try:
+                stale = shared_memory.SharedMemory(name=self._stale_segment)
+                stale.close()
+                stale.unlink()
+            except FileNotFoundError:
+                pass
+            self._stale_segment = None
+        self.generation = generation
+        return generation
+
+    def close(self, unlink: bool = True):
+        """关闭发布端；unlink 为 True 时删除共享内存"""
+        for segment in (self._data, self._control):
+            if segment is None:
+                continue
+            segment.close()
+            if unlink:
+                try:
+                    segment.unlink()
+                except FileNotFoundError:
+                    pass
+        self._data = None
+        self._control = None
+
+
+class CatalogReader:
+    """目录读取端"""
+
+    def __init__(self, name: str = DEFAULT_CATALOG_NAME):
+        self.name = name
+        self._control = _attach(name)
+        self.generation = 0
+
+    @property
+    def published_generation(self) -> int:
+        """当前已发布的代号"""
+        return _read_control(self._control.buf)[0]
+
+    def changed(self) -> bool:
+        """发布端是否发布了新的目录（只读控制块，开销很小）"""
+        return self.published_generation != self.generation
+
+    def load(self):
+        """附加当前数据段，解码成本进程的 CocktailSystem 后即释放映射
+
+        不提供直接引用共享内存的惰性视图：CocktailSystem 加载时就要遍历全部
+        配方建立分类索引，评分匹配也会逐个比较配方，惰性对象很快都会被
+        解码出来，反而要一直持有映射并在热更新时处理失效。
+        """
+        from .cocktail_system import CocktailSystem
+
+        missing = None
+        while True:
+            generation, segment_name = _read_control(self._control.buf)
+            if not segment_name:
+                raise RuntimeError(f"共享目录 {self.name} 尚未发布")
+            try:
+                segment = _attach(segment_name)
+            except FileNotFoundError:
+                # 读控制块之后恰好被新代号取代时重读；同一代号连续缺失说明发布端已不在
+                if missing == generation:
+                    raise RuntimeError(f"共享目录 {self.name} 的数据段 {segment_name} 不存在")
+                missing = generation
+                continue
+            try:
+                generation, game_config, ingredients, recipes = decode_catalog(segment.buf)
+            finally:
+                segment.close()
+            self.generation = generation
+            return CocktailSystem.from_catalog(game_config, ingredients, recipes)
+
+    def refresh(self):
+        """目录有更新时返回新的 CocktailSystem，否则返回 None"""
+        if not self.changed():
+            return None
+        return self.load()
+
+    def close(self):
+        if self._control is not None:
+            self._control.close()
+            self._control = None
+
+
+def get_shared_catalog_name(name: Optional[str] = None) -> Optional[str]:
+    """返回配置的共享目录名称（参数优先，其次环境变量），未配置时返回 None"""
+    return name or os.environ.get(SHARED_CATALOG_ENV_VAR) or None
+
+
+def load_cocktail_system(name: Optional[str] = None):
+    """加载调酒系统：配置了共享目录时从共享内存解码，否则（或共享目录不可用时）读取 JSON 配置
+
+    返回 (调酒系统, 错误信息)；共享目录不可用而改读配置文件时错误信息不为 None。
+    """
+    from .cocktail_system import CocktailSystem
+
+    name = get_shared_catalog_name(name)
+    error = None
+    if name:
+        try:
+            reader = CatalogReader(name)
+            try:
+                return reader.load(), None
+            finally:
+                reader.close()
+        except (FileNotFoundError, RuntimeError, ValueError) as e:
+            error = f"共享目录 {name} 不可用: {e}"
+    return CocktailSystem(), error
+
+
+def main():
+    """发布共享目录"""
+    import argparse
+    import contextlib
+    import signal
+    import sys
+
+    from .cocktail_system import CocktailSystem
+    from .config_loader import ConfigLoader
+
+    parser = argparse.ArgumentParser(description="Termix 共享内存目录")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    publish_parser = subparsers.add_parser("publish", help="发布目录并保持运行")
+    publish_parser.add_argument("--name", default=DEFAULT_CATALOG_NAME, help="共享内存名称")
+    publish_parser.add_argument("--watch", action="store_true", help="配置文件变化时重新发布")
+    publish_parser.add_argument("--interval", type=float, default=1.0, help="检查配置文件的间隔（秒）")
+    publish_parser.add_argument("--config-dir", default="config", help="配置目录（如生成的大规模目录）")
+    args = parser.parse_args()
+
+    config_loader = ConfigLoader(args.config_dir)
+
+    config_files = [config_loader.game_config_file, config_loader.ingredients_file, config_loader.recipes_file]
+
+    def config_mtimes():
+        return [os.path.getmtime(path) if os.path.exists(path) else 0 for path in config_files]
+
+    stopping = []
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda signum, frame: stopping.append(signum))
+
+    publisher = CatalogPublisher(args.name)
+    try:
+        mtimes = config_mtimes()
+        with contextlib.redirect_stdout(sys.stderr):
+            generation = publisher.publish(CocktailSystem(config_loader))
+        print(f"🍸 已发布共享目录 {args.name}（第 {generation} 代）", file=sys.stderr)
+        while not stopping:
+            time.sleep(args.interval)
+            if args.watch and config_mtimes() != mtimes:
+                mtimes = config_mtimes()
+                with contextlib.redirect_stdout(sys.stderr):
+                    generation = publisher.publish(CocktailSystem(config_loader))
+                print(f"🔄 配置已变化，重新发布（第 {generation} 代）", file=sys.stderr)
+    finally:
+        publisher.close()
+
+
+if __name__ == "__main__":
+    main()
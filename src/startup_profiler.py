@@ -0,0 +1,168 @@
+"""
+启动性能分析模块 - 记录冷启动各阶段的时间线
+
+未开启时不记录任何事件（长期运行的进程反复加载配置也不会累积内存），
+通过环境变量 TERMIX_PROFILE_STARTUP 或 main.py 的 --profile-startup 开启后，
+记录各阶段的单调时间戳并在进程退出时输出 JSON 时间线：
+
+    TERMIX_PROFILE_STARTUP=1                  # 输出到 stderr
+    TERMIX_PROFILE_STARTUP=startup.json       # 写入文件
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, List, Optional
+
+ENV_VAR = "TERMIX_PROFILE_STARTUP"
+
+
+def _interpreter_start() -> Optional[float]:
+    """推算解释器进程启动时刻（换算到 time.monotonic 的时间轴）
+
+    Linux 下 /proc/self/stat 的第 22 列是进程自开机以来的启动时刻（时钟滴答），
+    与 CLOCK_BOOTTIME 同一时间轴；其他平台无法得知时返回 None。
+    """
+    try:
+        with open("/proc/self/stat", "r") as f:
+            stat = f.read()
+        # 进程名可能含空格，从最后一个 ')' 之后开始切分
+        fields = stat[stat.rindex(")") + 2:].split()
+        start_ticks = int(fields[19])
+        ticks_per_second = os.sysconf("SC_CLK_TCK")
+        since_start = time.clock_gettime(time.CLOCK_BOOTTIME) - start_ticks / ticks_per_second
+        return time.monotonic() - max(since_start, 0.0)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StartupProfiler:
+    """启动时间线记录器"""
+
+    def __init__(self):
+        self._atexit_registered = False
+        self.reset()
+
+    def reset(self):
+        """清空时间线并重新确定零点（fork 出的子进程以自己的启动时刻为零点）"""
+        self.origin = _interpreter_start()
+        self.loaded_at = time.monotonic()
+        if self.origin is None:
+            self.origin = self.loaded_at
+        self.events: List[Dict[str, Any]] = []
+        self._open: Dict[str, Dict[str, Any]] = {}
+        self.enabled = False
+        self.output: Optional[str] = None
+
+    def enable(self, output: Optional[str] = None):
+        """开启输出；output 为文件路径，None 表示输出到 stderr"""
+        if not self._atexit_registered:
+            atexit.register(self.dump)
+            self._atexit_registered = True
+        self.enabled = True
+        self.output = output
+
+    def enable_from_env(self, environ=os.environ):
+        """按环境变量 TERMIX_PROFILE_STARTUP 开启输出"""
+        value = environ.get(ENV_VAR, "")
+        if value and value != "0":
+            self.enable(None if value == "1" else value)
+
+    def enable_from_argv(self, argv):
+        """按命令行中的 --profile-startup [PATH] 开启输出（在解析参数之前调用，以便记录导入阶段）"""
+        for index, arg in enumerate(argv):
+            if arg == "--profile-startup":
+                value = argv[index + 1] if index + 1 < len(argv) else ""
+                self.enable(None if not value or value.startswith("-") else value)
+                return
+            if arg.startswith("--profile-startup="):
+                self.enable(arg.partition("=")[2] or None)
+                return
+
+    def begin(self, name: str, **info):
+        """开始一个阶段"""
+        if not self.enabled:
+            return
+        event = {"name": name, "start": time.monotonic(), "end": None, **info}
+        self._open[name] = event
+        self.events.append(event)
+
+    def end(self, name: str):
+        """结束一个阶段"""
+        event = self._open.pop(name, None)
+        if event is not None:
+            event["end"] = time.monotonic()
+
+    def mark(self, name: str, **info):
+        """记录一个瞬时事件（如首帧绘制完成）"""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        self.events.append({"name": name, "start": now, "end": now, **info})
+
+    @contextmanager
+    def phase(self, name: str, **info):
+        """以 with 语句记录一个阶段"""
+        self.begin(name, **info)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def timed(self, name: str):
+        """装饰器：把函数的每次调用记录为一个阶段"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.phase(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def timeline(self) -> Dict[str, Any]:
+        """生成以解释器启动为零点的时间线（毫秒）"""
+        def ms(value):
+            return round((value - self.origin) * 1000, 3)
+
+        phases = []
+        for event in self.events:
+            entry = {key: value for key, value in event.items() if key not in ("start", "end")}
+            entry["start_ms"] = ms(event["start"])
+            if event["end"] is not None:
+                entry["end_ms"] = ms(event["end"])
+                entry["duration_ms"] = round((event["end"] - event["start"]) * 1000, 3)
+            phases.append(entry)
+
+        return {
+            "pid": os.getpid(),
+            "origin": "interpreter_start" if self.origin != self.loaded_at else "profiler_loaded",
+            "profiler_loaded_ms": ms(self.loaded_at),
+            "phases": phases,
+        }
+
+    def dump(self):
+        """输出时间线"""
+        if not self.enabled:
+            return
+        import json  # 只在输出时使用，避免引擎导入时加载 json
+
+        data = json.dumps(self.timeline(), ensure_ascii=False, indent=2)
+        if self.output:
+            with open(self.output, "w", encoding="utf-8") as f:
+                f.write(data + "\n")
+        else:
+            print(data, file=sys.stderr)
+
+
+profiler = StartupProfiler()
+profiler.enable_from_env()
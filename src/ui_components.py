@@ -4,7 +4,10 @@ UI组件模块 - 游戏界面组件
 
 from textual.app import ComposeResult
 from textual.containers import Container, Horizontal, Vertical, Grid, ScrollableContainer
+from textual.widget import Widget
 from textual.widgets import Static, Button, Label, ProgressBar, Select, Input
+from textual.geometry import Region
+from textual.strip import Strip
 from textual.reactive import reactive
 from textual.message import Message
 from textual.events import Key
@@ -14,16 +17,29 @@ from rich.align import Align
 from rich.console import Console
 from rich.table import Table
 import asyncio
+import time
 from typing import Dict, List
 
+from .character import CharacterFrameCache
 from .free_mixing import FreeMixingScreen
 from .ingredient_display import IngredientDisplayNew
 from .quick_reference import QuickReference, QuickRecipeSelector
 from .keyboard_ingredient_display import KeyboardIngredientDisplay
+from .render_scheduler import RenderScheduler, get_render_fps
+from .layout_controller import LayoutController
+from .pacing import Pacing, ProgressDriver
+from .mixing_plan import build_mixing_plan, get_step_boundaries, step_at
 
 
 class WelcomeScreen(Container):
-    """欢迎界面"""
+    """欢迎界面
+    
+    loading=True 时"开始游戏"按钮先禁用，待后台加载完成后由 set_ready() 启用。
+    """
+    
+    def __init__(self, loading=False, **kwargs):
+        super().__init__(**kwargs)
+        self.loading = loading
     
     def compose(self) -> ComposeResult:
         """构建欢迎界面"""
@@ -52,41 +68,132 @@ class WelcomeScreen(Container):
         yield Static(Align.center(title_text), id="title")
         yield Static(Align.center(subtitle_text), id="subtitle")
         yield Static(Align.center(intro_text), id="intro")
-        yield Button("🚀 开始游戏", variant="success", id="start_game")
+        if self.loading:
+            yield Button("⏳ 加载中...", variant="success", id="start_game", disabled=True)
+        else:
+            yield Button("🚀 开始游戏", variant="success", id="start_game")
+    
+    def set_ready(self):
+        """游戏数据加载完成，启用开始按钮"""
+        self.loading = False
+        button = self.query_one("#start_game", Button)
+        button.label = "🚀 开始游戏"
+        button.disabled = False
 
 
-class CharacterDisplay(Static):
-    """角色显示组件"""
+class CharacterDisplay(Widget):
+    """角色显示组件
+    
+    使用逐行渲染接口，切换帧时只重绘与上一帧不同的行。
+    """
     
-    def __init__(self, bunny_girl, **kwargs):
+    def __init__(self, bunny_girl, game_config=None, **kwargs):
         super().__init__(**kwargs)
         self.bunny_girl = bunny_girl
         self.current_mood = "happy"
+        self.current_dialogue = None
         self.animation_frame = 0
+        self.frame_cache = CharacterFrameCache(bunny_girl)
+        self._frame = None
+        
+        # 动画参数：animation_duration 秒内播放 animation_frames 帧
+        game_config = game_config or {}
+        character_config = game_config.get("character_settings", {})
+        ui_config = game_config.get("ui_settings", {})
+        self.animation_frames = character_config.get("animation_frames", 6)
+        self.frame_interval = ui_config.get("animation_duration", 1.5) / self.animation_frames
+        self._animation_timer = None
+        self._last_tick = 0.0
     
     def update_character(self, mood="happy", dialogue=None):
         """更新角色显示"""
         self.current_mood = mood
-        art = self.bunny_girl.get_ascii_art(mood, self.animation_frame)
         
         if dialogue is None:
             dialogue = self.bunny_girl.get_dialogue("greeting")
+        self.current_dialogue = dialogue
         
-        content = f"{art}\n\n💬 {dialogue}"
-        
-        panel = Panel(
-            Align.center(content),
-            title="🐰 调酒师小兔",
-            border_style="magenta"
+        self._render_frame()
+    
+    def _render_frame(self):
+        """切换到当前帧，只刷新发生变化的行"""
+        width = self.content_size.width
+        if width <= 0:
+            # 尚未完成布局，等尺寸确定后再渲染
+            return
+        
+        frame = self.frame_cache.get_frame(
+            self.app.console, self.current_mood, self.animation_frame, self.current_dialogue, width
         )
+        previous = self._frame
+        self._frame = frame
+        
+        if previous is None or previous.width != frame.width:
+            self.refresh()
+            return
+        
+        for y in self.frame_cache.get_delta(previous, frame):
+            self.refresh(Region(0, y, width, 1))
+    
+    def render_line(self, y: int) -> Strip:
+        """渲染一行"""
+        width = self.content_size.width
+        frame = self._frame
+        if frame is None or y >= len(frame.lines) or frame.width != width:
+            return Strip.blank(width, self.rich_style)
+        return Strip(frame.lines[y], frame.width)
+    
+    def on_resize(self, event) -> None:
+        """尺寸变化后按新宽度重新渲染"""
+        if self.current_dialogue is not None:
+            self._render_frame()
+    
+    def start_animation(self, mood="working", dialogue=None):
+        """开始非阻塞的角色动画"""
+        self.stop_animation()
+        self.animation_frame = 0
+        self.update_character(mood, dialogue)
+        
+        # 提前渲染该心情的所有帧，播放时只需切换
+        width = self.content_size.width
+        if width > 0:
+            self.frame_cache.bake(self.app.console, mood, self.current_dialogue, width)
         
-        self.update(panel)
+        self._last_tick = time.monotonic()
+        self._animation_timer = self.set_interval(self.frame_interval, self._on_animation_tick)
+    
+    def stop_animation(self):
+        """停止角色动画"""
+        if self._animation_timer is not None:
+            self._animation_timer.stop()
+            self._animation_timer = None
+    
+    def _on_animation_tick(self):
+        """动画计时器回调"""
+        now = time.monotonic()
+        elapsed = now - self._last_tick
+        self._last_tick = now
+        
+        # 界面繁忙导致回调延迟时直接跳到应有的帧，不补画中间帧
+        frames_due = max(1, int(elapsed / self.frame_interval + 0.5))
+        self.animation_frame = (self.animation_frame + frames_due) % self.animation_frames
+        self._render_frame()
+    
+    def on_hide(self) -> None:
+        """隐藏或滚出屏幕时暂停动画"""
+        if self._animation_timer is not None:
+            self._animation_timer.pause()
+    
+    def on_show(self) -> None:
+        """重新可见时恢复动画"""
+        if self._animation_timer is not None:
+            self._last_tick = time.monotonic()
+            self._animation_timer.resume()
     
     def animate_working(self):
         """播放工作动画"""
         self.current_mood = "working"
-        # 这里可以添加动画逻辑
-        self.animation_frame = (self.animation_frame + 1) % 6
+        self.animation_frame = (self.animation_frame + 1) % self.animation_frames
         self.update_character("working", "正在为您精心调制...")
 
 
@@ -133,6 +240,9 @@ class RecipeBook(Container):
     
     def on_mount(self):
         """初始化"""
+        self._render_scheduler = RenderScheduler(
+            self, self._update_display, get_render_fps(self.cocktail_system)
+        )
         self._update_display()
     
     def _update_display(self):
@@ -152,10 +262,11 @@ class RecipeBook(Container):
         # 创建配方概览表格
         content = ""
         for i, recipe in enumerate(current_recipes, 1):
-            content += f"\n{i}. {recipe.emoji} [bold]{recipe.name}[/bold]\n"
-            content += f"   [italic]{recipe.description}[/italic]\n"
-            content += f"   难度: {'⭐' * recipe.difficulty} | 材料: {len(recipe.ingredients)}种\n"
-            content += f"   风味: {', '.join(recipe.flavor_tags)}\n"
+            fragments = self.cocktail_system.get_recipe_fragments(recipe)
+            content += f"\n{i}. {fragments.title}\n"
+            content += f"   [italic]{fragments.description}[/italic]\n"
+            content += f"   难度: {fragments.stars} | 材料: {fragments.ingredient_count}种\n"
+            content += f"   风味: {fragments.flavors}\n"
         
         # 更新显示
         display = self.query_one("#recipes-display", Static)
@@ -205,14 +316,15 @@ class RecipeBook(Container):
                 total_volume += amount
         
         avg_alcohol = total_alcohol / total_volume * 100 if total_volume > 0 else 0
+        fragments = self.cocktail_system.get_recipe_fragments(recipe)
         
         details = f"{table}\n\n"
         details += f"[bold]配方信息:[/bold]\n"
         details += f"• 总量: {total_volume}ml\n"
         details += f"• 平均酒精度: {avg_alcohol:.1f}%\n"
-        details += f"• 难度: {'⭐' * recipe.difficulty}\n"
-        details += f"• 风味标签: {', '.join(recipe.flavor_tags)}\n"
-        details += f"• 描述: {recipe.description}\n"
+        details += f"• 难度: {fragments.stars}\n"
+        details += f"• 风味标签: {fragments.flavors}\n"
+        details += f"• 描述: {fragments.description}\n"
         
         # 更新详情显示
         details_display = self.query_one("#recipe-details", Static)
@@ -223,13 +335,13 @@ class RecipeBook(Container):
         if event.button.id == "prev-recipe-page":
             if self.current_page > 0:
                 self.current_page -= 1
-                self._update_display()
+                self._render_scheduler.mark_dirty()
         elif event.button.id == "next-recipe-page":
             recipes = self.cocktail_system.get_unlocked_recipes()
             total_pages = (len(recipes) + self.recipes_per_page - 1) // self.recipes_per_page
             if self.current_page < total_pages - 1:
                 self.current_page += 1
-                self._update_display()
+                self._render_scheduler.mark_dirty()
         elif event.button.id and event.button.id.startswith("recipe-"):
             # 显示配方详情
             idx = int(event.button.id.split("-")[1])
@@ -253,14 +365,14 @@ class RecipeBook(Container):
             # 上一页
             if self.current_page > 0:
                 self.current_page -= 1
-                self._update_display()
+                self._render_scheduler.mark_dirty()
         elif event.key == "d" or event.key == "right":
             # 下一页
             recipes = self.cocktail_system.get_unlocked_recipes()
             total_pages = (len(recipes) + self.recipes_per_page - 1) // self.recipes_per_page
             if self.current_page < total_pages - 1:
                 self.current_page += 1
-                self._update_display()
+                self._render_scheduler.mark_dirty()
     
     def _show_recipe_by_index(self, idx):
         """根据索引显示配方详情"""
@@ -274,12 +386,19 @@ class RecipeBook(Container):
 
 
 class MixingAnimation(Container):
-    """调酒动画组件"""
+    """调酒动画组件
+    
+    平时隐藏，调酒时显示进度条和当前步骤，动画按时间预算结束后再隐藏。
+    """
     
-    def __init__(self, **kwargs):
+    def __init__(self, pacing=None, ingredient_catalog=None, time_budget=7.0, fps=60, **kwargs):
         super().__init__(**kwargs)
         self.is_mixing = False
         self.animation_step = 0
+        self.pacing = pacing or Pacing()
+        self.ingredient_catalog = ingredient_catalog or {}
+        self.time_budget = time_budget
+        self.fps = fps
     
     def compose(self) -> ComposeResult:
         """构建动画界面"""
@@ -288,8 +407,8 @@ class MixingAnimation(Container):
         yield ProgressBar(total=100, show_eta=False, id="mixing-progress")
         yield Static("", id="mixing-status")
     
-    async def start_mixing_animation(self, ingredients):
-        """开始调酒动画"""
+    async def start_mixing_animation(self, ingredients, plan=None):
+        """播放调酒动画，进度驱动器用完时间预算时返回（被取消时提前结束）"""
         self.is_mixing = True
         self.animation_step = 0
         
@@ -297,60 +416,54 @@ class MixingAnimation(Container):
         status_display = self.query_one("#mixing-status", Static)
         mixing_display = self.query_one("#mixing-display", Static)
         
-        steps = [
-            "🧊 准备冰块...",
-            "🥃 倒入基酒...",
-            "🍋 添加果汁...",
-            "🍯 加入糖浆...",
-            "🥄 搅拌混合...",
-            "🌿 装饰点缀...",
-            "✨ 完成调制！"
+        # 步骤根据实际材料生成，所有帧在播放前渲染好
+        if plan is None:
+            plan = build_mixing_plan(ingredients, self.ingredient_catalog, self.time_budget)
+        frames = [
+            Panel(Align.center(step.frame), title="🍸 调酒中...", border_style="cyan")
+            for step in plan
         ]
+        boundaries = get_step_boundaries(plan)
+        driver = ProgressDriver(sum(step.duration for step in plan), fps=self.fps, pacing=self.pacing)
+        shown_step = -1
         
-        for i, step in enumerate(steps):
+        def on_frame(elapsed, fraction):
+            nonlocal shown_step
             if not self.is_mixing:
-                break
-            
-            status_display.update(step)
-            progress = int((i + 1) / len(steps) * 100)
-            progress_bar.update(progress=progress)
-            
-            # 显示调酒动画
-            animation_frame = self._get_mixing_frame(i)
-            mixing_display.update(Panel(
-                Align.center(animation_frame),
-                title="🍸 调酒中...",
-                border_style="cyan"
-            ))
+                driver.stop()
+                return
             
-            await asyncio.sleep(1)
-        
-        self.is_mixing = False
-    
-    def _get_mixing_frame(self, step):
-        """获取调酒动画帧"""
-        frames = [
-            "🧊\n冰块准备中...",
-            "🥃🧊\n倒入基酒...",
-            "🥃🍋🧊\n添加果汁...",
-            "🥃🍋🍯🧊\n加入糖浆...",
-            "🌪️ 🥄 🌪️\n搅拌中...",
-            "🍸🌿\n装饰中...",
-            "🍸✨\n调制完成！"
-        ]
-        
-        return frames[min(step, len(frames) - 1)]
+            # 进度条每帧平滑推进，步骤文字和画面只在切换步骤时更新
+            progress_bar.update(progress=fraction * 100)
+            step_index = step_at(boundaries, fraction)
+            if step_index != shown_step:
+                shown_step = step_index
+                self.animation_step = step_index
+                status_display.update(plan[step_index].label)
+                mixing_display.update(frames[step_index])
+        
+        progress_bar.update(progress=0)
+        self.display = True
+        try:
+            await driver.run(on_frame)
+        finally:
+            self.is_mixing = False
+            self.display = False
 
 
 class GameScreen(Container):
     """游戏主界面"""
     
-    def __init__(self, bunny_girl, cocktail_system, **kwargs):
+    VIEW_NAMES = ["ingredients", "recipes", "mixing", "free-mixing", "reference"]
+    
+    def __init__(self, bunny_girl, cocktail_system, pacing=None, **kwargs):
         super().__init__(**kwargs)
         self.bunny_girl = bunny_girl
         self.cocktail_system = cocktail_system
+        self.pacing = pacing
         self.current_view = "ingredients"
         self.layout_mode = "horizontal"  # horizontal 或 vertical
+        self.layout_controller = LayoutController.from_config(self, cocktail_system.game_config)
     
     def compose(self) -> ComposeResult:
         """构建游戏界面"""
@@ -371,10 +484,16 @@ class GameScreen(Container):
             with Container(id="main-content"):
                 # 角色显示区域
                 with Container(classes="character-section", id="character-section"):
-                    yield CharacterDisplay(self.bunny_girl, id="character")
+                    yield CharacterDisplay(self.bunny_girl, game_config=self.cocktail_system.game_config, id="character")
                 
                 # 内容区域
                 with Container(classes="content-section", id="content-section"):
+                    yield MixingAnimation(
+                        pacing=self.pacing,
+                        ingredient_catalog=self.cocktail_system.ingredients,
+                        fps=get_render_fps(self.cocktail_system),
+                        id="mixing-animation"
+                    )
                     yield KeyboardIngredientDisplay(self.cocktail_system, id="ingredients-view")
                     yield RecipeBook(self.cocktail_system, id="recipes-view")
                     yield QuickRecipeSelector(self.cocktail_system, id="mixing-view")
@@ -383,12 +502,26 @@ class GameScreen(Container):
     
     def on_mount(self):
         """界面挂载时的初始化"""
+        # 挂载后一次性解析并持有组件引用，导航时不再做选择器查询
+        self.character = self.query_one("#character", CharacterDisplay)
+        self.mixing_animation = self.query_one("#mixing-animation", MixingAnimation)
+        self.main_scroll = self.query_one("#main-scroll", ScrollableContainer)
+        self._views = {name: self.query_one(f"#{name}-view") for name in self.VIEW_NAMES}
+        self._nav_buttons = {name: self.query_one(f"#nav-{name}", Button) for name in self.VIEW_NAMES}
+        
         # 初始显示角色
-        character = self.query_one("#character", CharacterDisplay)
-        character.update_character("happy")
+        self.character.update_character("happy")
         
         # 初始显示材料选择界面
+        for view in self._views.values():
+            view.display = False
+        for button in self._nav_buttons.values():
+            button.variant = "default"
+        self.current_view = None
         self._show_view("ingredients")
+        
+        # 按当前终端宽度决定初始布局
+        self.layout_controller.request(self.app.size.width)
     
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """处理导航按钮点击"""
@@ -451,7 +584,7 @@ class GameScreen(Container):
                 # 如果聚焦在子组件上，让子组件处理方向键
                 return
                 
-            scroll_container = self.query_one("#main-scroll", ScrollableContainer)
+            scroll_container = self.main_scroll
             
             if event.key == "up":
                 scroll_container.scroll_up()
@@ -481,59 +614,36 @@ class GameScreen(Container):
     def _toggle_layout(self):
         """切换布局模式"""
         if self.layout_mode == "horizontal":
-            self.layout_mode = "vertical"
-            self._apply_vertical_layout()
+            self._set_layout("vertical")
         else:
-            self.layout_mode = "horizontal"
-            self._apply_horizontal_layout()
+            self._set_layout("horizontal")
+    
+    def _set_layout(self, layout_mode):
+        """切换布局，所有样式变化通过一次类名切换完成"""
+        self.layout_mode = layout_mode
+        self.set_class(layout_mode == "vertical", "vertical-layout")
     
     def _apply_horizontal_layout(self):
         """应用水平布局"""
-        main_content = self.query_one("#main-content")
-        main_content.styles.layout = "horizontal"
-        
-        character_section = self.query_one("#character-section")
-        character_section.styles.width = "40%"
-        character_section.styles.height = "100%"
-        
-        content_section = self.query_one("#content-section")
-        content_section.styles.width = "60%"
-        content_section.styles.height = "100%"
+        self._set_layout("horizontal")
     
     def _apply_vertical_layout(self):
         """应用垂直布局"""
-        main_content = self.query_one("#main-content")
-        main_content.styles.layout = "vertical"
-        
-        character_section = self.query_one("#character-section")
-        character_section.styles.width = "100%"
-        character_section.styles.height = "30%"
-        
-        content_section = self.query_one("#content-section")
-        content_section.styles.width = "100%"
-        content_section.styles.height = "70%"
+        self._set_layout("vertical")
     
     def _show_view(self, view_name):
         """显示指定视图"""
-        self.current_view = view_name
+        if view_name == self.current_view:
+            return
         
-        # 隐藏所有视图
-        views = ["ingredients-view", "recipes-view", "mixing-view", "free-mixing-view", "reference-view"]
-        for view_id in views:
-            view = self.query_one(f"#{view_id}")
-            view.display = False
-        
-        # 显示当前视图
-        current_view = self.query_one(f"#{view_name}-view")
-        current_view.display = True
+        # 只切换离开和进入的两个视图
+        if self.current_view is not None:
+            self._views[self.current_view].display = False
+            self._nav_buttons[self.current_view].variant = "default"
         
-        # 更新导航按钮状态
-        nav_buttons = self.query(".nav-bar Button")
-        for button in nav_buttons:
-            button.variant = "default"
-        
-        nav_button = self.query_one(f"#nav-{view_name}", Button)
-        nav_button.variant = "primary"
+        self._views[view_name].display = True
+        self._nav_buttons[view_name].variant = "primary"
+        self.current_view = view_name
 
 
 # 自定义消息类
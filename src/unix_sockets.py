@@ -0,0 +1,56 @@
+"""
+Unix 套接字工具 - 评分服务和会话预热进程共用的监听套接字处理
+
+监听套接字只允许属主连接（权限 0600），默认放在用户自己的运行时目录；
+启动前先确认路径上没有仍在运行的服务，只清理上次异常退出遗留的套接字文件。
+"""
+
+import os
+import socket
+import stat
+
+
+def default_socket_path(name: str) -> str:
+    """默认套接字路径：$XDG_RUNTIME_DIR/<name>.sock，没有时为 /tmp/<name>-<uid>.sock"""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, f"{name}.sock")
+    return f"/tmp/{name}-{os.getuid()}.sock"
+
+
+def claim_socket_path(path: str):
+    """确认可以在 path 上监听：有服务在运行时抛出 RuntimeError，遗留的套接字文件会被删除"""
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise RuntimeError(f"{path} 已存在且不是套接字")
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        # 没有进程在监听：上次异常退出遗留的文件
+        os.unlink(path)
+    except OSError as e:
+        raise RuntimeError(f"无法确认 {path} 上是否有服务在运行: {e}") from e
+    else:
+        raise RuntimeError(f"{path} 上已有服务在运行")
+    finally:
+        probe.close()
+
+
+def bind_private_socket(path: str) -> socket.socket:
+    """创建只有属主可以连接的监听套接字（在绑定期间收紧 umask，文件创建时即为 0600）"""
+    claim_socket_path(path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        sock.bind(path)
+    except BaseException:
+        sock.close()
+        raise
+    finally:
+        os.umask(old_umask)
+    return sock
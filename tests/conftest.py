@@ -0,0 +1,8 @@
+"""
+测试公共配置 - 让测试可以从仓库根目录导入 src 和根目录脚本
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,52 @@
+"""
+帧时间基准的补丁安装测试
+"""
+
+import importlib.metadata
+
+import pytest
+from textual.app import App
+from textual.screen import Screen
+
+from src.frame_timing import FrameTimer, check_textual
+
+
+def _current():
+    return Screen._on_timer_update, App._display
+
+
+def test_restores_methods_after_error():
+    originals = _current()
+    with pytest.raises(ValueError):
+        with FrameTimer():
+            assert _current() != originals
+            raise ValueError("boom")
+    assert _current() == originals
+
+
+def test_install_twice_fails():
+    originals = _current()
+    with FrameTimer() as timer:
+        with pytest.raises(RuntimeError):
+            timer.install()
+    assert _current() == originals
+
+
+def test_missing_private_method_fails_without_patching(monkeypatch):
+    monkeypatch.delattr(Screen, "_on_timer_update")
+    with pytest.raises(RuntimeError, match="Screen._on_timer_update"):
+        with FrameTimer():
+            pass
+    assert not hasattr(Screen, "_on_timer_update")
+
+
+def test_untested_textual_version(monkeypatch):
+    monkeypatch.setattr(importlib.metadata, "version", lambda name: "99.0.0")
+    with pytest.raises(RuntimeError, match="99.0.0"):
+        check_textual()
+    assert check_textual(allow_untested=True) == "99.0.0"
+
+
+def test_missing_batch_count():
+    with pytest.raises(RuntimeError, match="_batch_count"):
+        FrameTimer().check_app(object())
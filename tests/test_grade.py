@@ -0,0 +1,94 @@
+"""
+批量评分工具测试
+"""
+
+import io
+import json
+import os
+
+import pytest
+
+import grade
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config")
+
+MIX = {"伏特加": 40, "蔓越莓汁": 60}
+
+
+@pytest.fixture(autouse=True)
+def cocktail_system():
+    grade._init_worker(config_dir=CONFIG_DIR)
+    return grade._cocktail_system
+
+
+def grade_one(attempt, path="in.jsonl", line_number=1):
+    line = attempt if isinstance(attempt, bytes) else json.dumps(attempt, ensure_ascii=False).encode("utf-8")
+    return json.loads(grade.grade_line((path, line_number, line)))
+
+
+def test_valid_line(cocktail_system):
+    recipe = next(iter(cocktail_system.recipes.values()))
+    result = grade_one({"id": "a1", "recipe": recipe.name, "ingredients": recipe.ingredients})
+    assert result["id"] == "a1"
+    assert result["matched"] == recipe.name
+    assert result["mode"] == "recipe"
+    assert result["score"] == 100
+    assert "error" not in result and "ingredients" not in result
+
+
+def test_free_mixing_line():
+    result = grade_one({"id": 2, "ingredients": MIX})
+    assert result["mode"] in ("free", "recipe")
+    assert isinstance(result["score"], int)
+
+
+def test_malformed_json_reports_file_and_line():
+    result = grade_one(b'{"id": 3, "ingredients": ', path="b.jsonl", line_number=7)
+    assert result["file"] == "b.jsonl"
+    assert result["line"] == 7
+    assert result["error"]
+    assert "score" not in result
+
+
+def test_unknown_recipe_is_an_error_and_keeps_id():
+    result = grade_one({"id": 4, "recipe": "不存在的配方", "ingredients": MIX}, path="c.jsonl", line_number=12)
+    assert result == {
+        "id": 4,
+        "recipe": "不存在的配方",
+        "file": "c.jsonl",
+        "line": 12,
+        "error": "未知配方: 不存在的配方",
+    }
+
+
+def test_missing_ingredients_keeps_id():
+    result = grade_one({"id": 5, "ingredients": ["伏特加"]})
+    assert result["id"] == 5 and result["error"]
+
+
+def test_line_numbers_are_per_file(tmp_path):
+    first = tmp_path / "first.jsonl"
+    second = tmp_path / "second.jsonl"
+    first.write_bytes(b'{"id": 1}\n\n{"id": 2}\n')
+    second.write_bytes(b'{"id": 3}\n')
+    numbered = [(os.path.basename(path), line_number)
+                for path, line_number, _ in grade._read_lines([str(first), str(second)])]
+    assert numbered == [("first.jsonl", 1), ("first.jsonl", 3), ("second.jsonl", 1)]
+
+
+def test_parallel_output_keeps_input_order():
+    lines = []
+    for index in range(200):
+        attempt = {"id": index, "ingredients": {"伏特加": 10 + index % 40, "蔓越莓汁": 60}}
+        if index % 17 == 0:
+            attempt["recipe"] = "不存在的配方"
+        lines.append(("in.jsonl", index + 1, json.dumps(attempt, ensure_ascii=False).encode("utf-8")))
+
+    serial = io.BytesIO()
+    grade.grade_stream(iter(lines), serial, jobs=1, config_dir=CONFIG_DIR)
+    parallel = io.BytesIO()
+    grade.grade_stream(iter(lines), parallel, jobs=3, chunksize=7, config_dir=CONFIG_DIR)
+
+    ids = [json.loads(line)["id"] for line in parallel.getvalue().splitlines()]
+    assert ids == list(range(200))
+    assert parallel.getvalue() == serial.getvalue()
@@ -0,0 +1,124 @@
+"""
+调酒任务测试
+"""
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from src.cocktail_system import CocktailSystem
+from src.config_loader import ConfigLoader
+from src.data_models import CocktailRecipe
+from src.mixing_jobs import MixingJobManager
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config")
+
+
+def test_submit_cancels_previous_job():
+    async def run():
+        manager = MixingJobManager()
+        first = manager.submit(asyncio.sleep(10))
+        second = manager.submit(asyncio.sleep(0))
+        await second
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return manager.is_running, manager.cancel()
+
+    assert asyncio.run(run()) == (False, False)
+
+
+def test_cancel_running_job():
+    async def run():
+        manager = MixingJobManager()
+        task = manager.submit(asyncio.sleep(10))
+        await asyncio.sleep(0)
+        cancelled = manager.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return cancelled
+
+    assert asyncio.run(run()) is True
+
+
+def test_skip_ends_animation_early():
+    events = []
+
+    async def animation():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            events.append("animation cancelled")
+            raise
+
+    async def run():
+        manager = MixingJobManager()
+
+        async def job():
+            await manager.play(animation())
+            events.append("result")
+
+        task = manager.submit(job())
+        await asyncio.sleep(0.01)
+        assert manager.skip() is True
+        await asyncio.wait_for(task, 1)
+        return manager.skip()
+
+    assert asyncio.run(run()) is False
+    assert events == ["animation cancelled", "result"]
+
+
+def test_animation_error_reaches_job():
+    async def animation():
+        raise RuntimeError("boom")
+
+    async def run():
+        manager = MixingJobManager()
+        await manager.submit(manager.play(animation()))
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(run())
+
+
+def test_superseded_job_cancels_scoring():
+    from main import TermixApp
+
+    scoring = []
+
+    async def score_mix(ingredients, recipe=None):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            scoring.append("cancelled")
+            raise
+
+    async def run():
+        manager = MixingJobManager()
+        app = SimpleNamespace(
+            mixing_jobs=manager,
+            cocktail_system=CocktailSystem(ConfigLoader(CONFIG_DIR)),
+            _score_mix=score_mix,
+            game_screen=SimpleNamespace(mixing_animation=SimpleNamespace(
+                start_mixing_animation=lambda ingredients, plan: asyncio.sleep(10),
+            )),
+        )
+        task = manager.submit(TermixApp._run_mixing_job(app, {"伏特加": 40}, "错误"))
+        await asyncio.sleep(0.01)
+        manager.submit(asyncio.sleep(0))
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert scoring == ["cancelled"]
+
+
+def test_zero_amount_recipe_ingredient():
+    system = CocktailSystem(ConfigLoader(CONFIG_DIR))
+    system.recipes["薄荷水"] = CocktailRecipe(
+        name="薄荷水", ingredients={"苏打水": 100, "薄荷叶": 0},
+        description="", difficulty=1, emoji="🥤", flavor_tags=[],
+    )
+    assert system.find_matching_recipe({"苏打水": 100, "薄荷叶": 2}) == ""
+    score, evaluation = system.calculate_score("薄荷水", {"苏打水": 100, "薄荷叶": 2})
+    assert 0 <= score < 100
@@ -0,0 +1,104 @@
+"""
+进度驱动器测试 - 用假时钟检查漂移补偿、降帧和按时结束
+"""
+
+import asyncio
+
+import pytest
+
+from src.pacing import Pacing, ProgressDriver
+
+
+class FakeClock:
+    """假时钟：sleep 只推进时间，可模拟每次 sleep 的超时"""
+
+    def __init__(self, oversleep=0.0):
+        self.now = 100.0
+        self.oversleep = oversleep
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds + self.oversleep
+
+
+def run(driver, on_frame):
+    asyncio.run(driver.run(on_frame))
+
+
+def test_finishes_exactly_on_budget():
+    clock = FakeClock()
+    driver = ProgressDriver(1.0, fps=50, clock=clock, sleep=clock.sleep)
+    frames = []
+    run(driver, lambda elapsed, fraction: frames.append((elapsed, fraction)))
+    assert frames[0] == (0.0, 0.0)
+    assert frames[-1] == (1.0, 1.0)
+    assert clock.now == pytest.approx(101.0)
+    assert driver.frames == 51
+    assert all(b[1] > a[1] for a, b in zip(frames, frames[1:]))
+
+
+def test_oversleep_does_not_accumulate():
+    # 每次 sleep 多睡 4ms：目标时间从起点推算，帧仍落在 20ms 网格上
+    clock = FakeClock(oversleep=0.004)
+    driver = ProgressDriver(1.0, fps=50, clock=clock, sleep=clock.sleep)
+    times = []
+    run(driver, lambda elapsed, fraction: times.append(elapsed))
+    assert driver.frames == 51
+    assert driver.dropped_frames == 0
+    assert times[10] == pytest.approx(0.204)
+    assert clock.sleeps[1] == pytest.approx(0.016)
+    assert times[-1] == 1.0
+
+
+def test_slow_frames_lower_frame_rate_then_recover():
+    clock = FakeClock()
+    driver = ProgressDriver(2.0, fps=50, min_fps=10, clock=clock, sleep=clock.sleep)
+    intervals = []
+    slow_frames = []
+
+    def on_frame(elapsed, fraction):
+        # 前半段每帧渲染 60ms（远超 20ms 帧间隔），后半段恢复正常
+        if elapsed < 1.0:
+            clock.now += 0.06
+            slow_frames.append(elapsed)
+        intervals.append(driver.interval)
+
+    run(driver, on_frame)
+    assert driver.dropped_frames > 0
+    assert len(slow_frames) < 1.0 / 0.06
+    assert 0.06 <= max(intervals) <= 0.1  # 降到跟得上渲染耗时的帧率，但不低于 min_fps
+    assert intervals[-1] == pytest.approx(0.02)  # 负载恢复后回到原帧率
+    assert clock.now == pytest.approx(102.0, abs=0.07)
+
+
+def test_stop_ends_early():
+    clock = FakeClock()
+    driver = ProgressDriver(1.0, fps=50, clock=clock, sleep=clock.sleep)
+
+    def on_frame(elapsed, fraction):
+        if elapsed >= 0.49:
+            driver.stop()
+
+    run(driver, on_frame)
+    assert clock.now == pytest.approx(100.5)
+
+
+@pytest.mark.parametrize("fps", [0, -5])
+def test_non_positive_fps_uses_default(fps):
+    clock = FakeClock()
+    driver = ProgressDriver(1.0, fps=fps, clock=clock, sleep=clock.sleep)
+    run(driver, lambda elapsed, fraction: None)
+    assert driver.frames == 61
+
+
+def test_fast_mode_renders_one_frame():
+    clock = FakeClock()
+    driver = ProgressDriver(7.0, pacing=Pacing(fast=True), clock=clock, sleep=clock.sleep)
+    frames = []
+    run(driver, lambda elapsed, fraction: frames.append(fraction))
+    assert frames == [1.0]
+    assert clock.sleeps == []
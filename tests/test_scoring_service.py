@@ -0,0 +1,234 @@
+"""
+评分服务测试
+"""
+
+import asyncio
+import os
+import socket
+import stat
+
+import pytest
+
+from src.cocktail_system import CocktailSystem
+from src.config_loader import ConfigLoader
+from src.scoring_service import QuerySuperseded, ScoringClient, ScoringServer, encode_frame, read_frame
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config")
+
+
+@pytest.fixture(scope="module")
+def server():
+    return ScoringServer(CocktailSystem(ConfigLoader(CONFIG_DIR)), path="")
+
+
+@pytest.mark.parametrize("request_frame", [
+    [1, 2, 3],
+    "score",
+    {"id": 1, "op": ["score"]},
+    {"id": 1, "op": "score", "args": [1]},
+    {"id": 1, "op": "score", "args": {"ingredients": ["伏特加", 40]}},
+    {"id": 1, "op": "score", "args": {"ingredients": "伏特加"}},
+    {"id": 1, "op": "score", "args": {"ingredients": {"伏特加": "40"}}},
+    {"id": 1, "op": "match", "args": {}},
+    {"id": 1, "op": "search", "args": {"query": 5}},
+    {"batch": {"id": 1}},
+])
+def test_malformed_request_returns_error(server, request_frame):
+    response = server.handle_frame(request_frame)
+    assert response["ok"] is False
+    assert response["error"]
+
+
+def test_batch_keeps_valid_requests(server):
+    response = server.handle_frame({"batch": [
+        {"id": 1, "op": "score", "args": {"ingredients": "伏特加"}},
+        {"id": 2, "op": "score", "args": {"ingredients": {"伏特加": 40, "蔓越莓汁": 60}}},
+    ]})
+    first, second = response["batch"]
+    assert first == {"id": 1, "ok": False, "error": first["error"]}
+    assert second["id"] == 2 and second["ok"] is True
+
+
+def test_malformed_request_keeps_connection_open(tmp_path):
+    async def run():
+        server = ScoringServer(CocktailSystem(ConfigLoader(CONFIG_DIR)), path=str(tmp_path / "scoring.sock"))
+        await server.start()
+        reader, writer = await asyncio.open_unix_connection(server.path)
+        try:
+            writer.write(encode_frame([1, 2, 3]))
+            writer.write(encode_frame({"id": 1, "op": "match", "args": {"ingredients": ["伏特加"]}}))
+            writer.write(encode_frame({"id": 2, "op": "search", "args": {"query": "莫"}}))
+            await writer.drain()
+            return [await read_frame(reader) for _ in range(3)]
+        finally:
+            writer.close()
+            await server.close()
+
+    not_object, bad_ingredients, search = asyncio.run(run())
+    assert not_object["ok"] is False
+    assert bad_ingredients == {"id": 1, "ok": False, "error": bad_ingredients["error"]}
+    assert search["id"] == 2 and search["ok"] is True
+
+
+def test_socket_is_private_and_not_taken_over(tmp_path):
+    path = str(tmp_path / "scoring.sock")
+
+    async def run():
+        first = ScoringServer(CocktailSystem(ConfigLoader(CONFIG_DIR)), path=path)
+        await first.start()
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+            second = ScoringServer(first.cocktail_system, path=path)
+            with pytest.raises(RuntimeError, match="已有服务在运行"):
+                await second.start()
+            await second.close()
+            # 第一个服务仍在原地址上应答
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(encode_frame({"id": 1, "op": "search", "args": {"query": "莫"}}))
+            response = await read_frame(reader)
+            writer.close()
+            return mode, response
+        finally:
+            await first.close()
+
+    mode, response = asyncio.run(run())
+    assert mode == 0o600
+    assert response["ok"] is True
+    assert not os.path.exists(path)
+
+
+def test_stale_socket_file_is_replaced(tmp_path):
+    path = str(tmp_path / "scoring.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+
+    async def run():
+        server = ScoringServer(CocktailSystem(ConfigLoader(CONFIG_DIR)), path=path)
+        await server.start()
+        await server.close()
+
+    asyncio.run(run())
+
+
+def test_refuses_non_socket_path(tmp_path):
+    path = tmp_path / "scoring.sock"
+    path.write_text("keep me")
+
+    async def run():
+        await ScoringServer(CocktailSystem(ConfigLoader(CONFIG_DIR)), path=str(path)).start()
+
+    with pytest.raises(RuntimeError, match="不是套接字"):
+        asyncio.run(run())
+    assert path.read_text() == "keep me"
+
+
+class RecordingServer:
+    """记录收到的每一帧，再交给真实的 ScoringServer 应答"""
+
+    def __init__(self, path):
+        self.path = path
+        self.frames = []
+        self.scoring = ScoringServer(CocktailSystem(ConfigLoader(CONFIG_DIR)), path="")
+        self._server = None
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        while True:
+            frame = await read_frame(reader)
+            if frame is None:
+                break
+            self.frames.append(frame)
+            writer.write(encode_frame(self.scoring.handle_frame(frame)))
+            await writer.drain()
+        writer.close()
+
+
+def run_client(tmp_path, scenario):
+    async def run():
+        path = str(tmp_path / "scoring.sock")
+        async with RecordingServer(path) as server:
+            client = ScoringClient(path)
+            await client.connect()
+            try:
+                result = await scenario(client)
+            finally:
+                await client.close()
+            return server.frames, result
+
+    return asyncio.run(run())
+
+
+def test_calls_in_one_tick_share_a_frame(tmp_path):
+    async def scenario(client):
+        return await asyncio.gather(
+            client.search("莫", limit=1),
+            client.match({"伏特加": 40}),
+            client.score({"伏特加": 40, "蔓越莓汁": 60}),
+        )
+
+    frames, (search, match, score) = run_client(tmp_path, scenario)
+    assert len(frames) == 1
+    assert [request["op"] for request in frames[0]["batch"]] == ["search", "match", "score"]
+    assert len(search) <= 1 and isinstance(match, str) and isinstance(score[0], int)
+
+
+def test_superseded_query_is_never_sent(tmp_path):
+    async def scenario(client):
+        first = asyncio.ensure_future(client.search("莫", key="recipe-search"))
+        second = asyncio.ensure_future(client.search("马", key="recipe-search"))
+        other = asyncio.ensure_future(client.search("莫", key="ingredient-search"))
+        results = await asyncio.gather(first, second, other, return_exceptions=True)
+        return results
+
+    frames, (first, second, other) = run_client(tmp_path, scenario)
+    assert isinstance(first, QuerySuperseded)
+    assert isinstance(second, list) and isinstance(other, list)
+    sent = [request for frame in frames for request in frame.get("batch", [frame])]
+    assert [request["args"]["query"] for request in sent] == ["马", "莫"]
+
+
+def test_superseded_after_send_ignores_late_response(tmp_path):
+    async def scenario(client):
+        first = asyncio.ensure_future(client.search("莫", key="k"))
+        await asyncio.sleep(0)  # 让第一帧先发出
+        await asyncio.sleep(0)
+        second = await client.search("马", key="k")
+        with pytest.raises(QuerySuperseded):
+            await first
+        return second
+
+    frames, second = run_client(tmp_path, scenario)
+    assert len(frames) == 2
+    assert second == ScoringServer(CocktailSystem(ConfigLoader(CONFIG_DIR)), path="").handle_frame(
+        {"id": 0, "op": "search", "args": {"query": "马"}})["result"]
+
+
+def test_pipelined_responses_resolve_in_order(tmp_path):
+    system = CocktailSystem(ConfigLoader(CONFIG_DIR))
+    mixes = [{"伏特加": 10 + i * 5, "蔓越莓汁": 60 - i * 3} for i in range(12)]
+
+    async def scenario(client):
+        # 每轮事件循环发一个请求，多个帧同时在途，不等待之前的响应
+        tasks = []
+        for mix in mixes:
+            tasks.append(asyncio.ensure_future(client.score(mix)))
+            await asyncio.sleep(0)
+        completed = []
+        for task in asyncio.as_completed(tasks):
+            completed.append(await task)
+        return [task.result() for task in tasks], completed
+
+    frames, (results, completed) = run_client(tmp_path, scenario)
+    assert len(frames) > 1
+    ids = [request["id"] for frame in frames for request in frame.get("batch", [frame])]
+    assert ids == sorted(ids)
+    assert results == [tuple(system.grade_mix(mix)) for mix in mixes]
+    assert completed == results
@@ -0,0 +1,92 @@
+"""
+会话录制与回放测试
+
+录制用 run_test 的 pilot 以键盘操作完成一次标准调酒：pilot 的鼠标事件绕过
+App.on_event，不会被录制，按键则和真实终端一样经过 App.on_event。
+"""
+
+import asyncio
+import json
+import random
+
+import pytest
+
+from main import TermixApp
+from src.session_recorder import FORMAT_VERSION, SessionRecorder, load_recording, replay
+
+SEED = 42
+
+
+async def record_session(path):
+    random.seed(SEED)
+    recorder = SessionRecorder(str(path), seed=SEED)
+    app = TermixApp(fast=True, recorder=recorder)
+    async with app.run_test(size=(120, 40)) as pilot:
+        await app.game_ready.wait()
+        await pilot.pause()
+        # 欢迎界面：Tab 聚焦“开始游戏”，回车进入游戏
+        await pilot.press("tab", "enter")
+        await pilot.pause()
+        # Tab 到材料界面内，按数字键选材料，回车开始调酒
+        ingredients_view = app.game_screen.query_one("#ingredients-view")
+        for _ in range(20):
+            await pilot.press("tab")
+            if app.focused is not None and ingredients_view in app.focused.ancestors:
+                break
+        await pilot.press("2", "3", "enter")
+        assert await recorder.wait_for("result", 1, timeout=10)
+
+
+@pytest.fixture(scope="module")
+def recording(tmp_path_factory):
+    path = tmp_path_factory.mktemp("recording") / "session.jsonl"
+    asyncio.run(record_session(path))
+    return path
+
+
+def test_recording_contains_inputs_and_outputs(recording):
+    header, entries = load_recording(str(recording))
+    assert header["seed"] == SEED
+    assert header["size"] == [120, 40]
+    kinds = [entry["e"] for entry in entries]
+    assert kinds[0] == "ready"
+    assert "key" in kinds
+    assert [entry["name"] for entry in entries if entry["e"] == "message"] == ["StartMixingMessage"]
+    assert kinds.count("result") == 1
+
+
+def test_replay_round_trip_has_no_desyncs(recording):
+    report = asyncio.run(replay(str(recording), sync_timeout=10))
+    assert report["desyncs"] == []
+    assert report["skipped_inputs"] == 0
+    _, entries = load_recording(str(recording))
+    assert report["inputs"] == sum(1 for entry in entries if entry["e"] == "key")
+
+
+def test_replay_reports_changed_output(recording, tmp_path):
+    lines = recording.read_text(encoding="utf-8").splitlines()
+    tampered = []
+    for line in lines:
+        entry = json.loads(line)
+        if entry["e"] == "result":
+            entry["score"] += 1
+        tampered.append(json.dumps(entry, ensure_ascii=False))
+    path = tmp_path / "tampered.jsonl"
+    path.write_text("\n".join(tampered) + "\n", encoding="utf-8")
+
+    report = asyncio.run(replay(str(path), sync_timeout=10))
+    assert len(report["desyncs"]) == 1
+    assert report["desyncs"][0]["recorded"]["e"] == "result"
+
+
+@pytest.mark.parametrize("lines", [
+    [],
+    [{"t": 0, "e": "ready"}],
+    [{"e": "session", "version": FORMAT_VERSION + 1, "seed": 1, "size": [80, 24]}],
+    [{"e": "session", "seed": 1, "size": [80, 24]}],
+])
+def test_load_recording_rejects_bad_header(tmp_path, lines):
+    path = tmp_path / "bad.jsonl"
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_recording(str(path))
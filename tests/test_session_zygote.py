@@ -0,0 +1,115 @@
+"""
+会话预热进程测试
+
+预热进程在子进程里运行（它要接管信号处理），会话入口换成一个只打印参数的
+假 main，不启动真正的界面。
+"""
+
+import os
+import signal
+import socket
+import stat
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.session_zygote import MAX_REQUEST_SIZE, _LENGTH
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ZYGOTE_SCRIPT = """
+import sys, types
+from src.session_zygote import SessionZygote
+
+def fake_main(argv, bunny_girl=None, cocktail_system=None):
+    print("session:", " ".join(argv), flush=True)
+    return int(argv[0]) if argv and argv[0].isdigit() else 0
+
+zygote = SessionZygote(sys.argv[1], warm_up=False)
+zygote.preloaded = {"main": types.SimpleNamespace(main=fake_main), "bunny_girl": None, "cocktail_system": None}
+zygote.serve_forever()
+"""
+
+
+def start_zygote(path):
+    return subprocess.Popen([sys.executable, "-c", ZYGOTE_SCRIPT, path], cwd=ROOT,
+                            stderr=subprocess.PIPE, text=True)
+
+
+def wait_for_socket(path, process, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        assert process.poll() is None, process.stderr.read()
+        assert time.monotonic() < deadline, "预热进程未在规定时间内启动"
+        time.sleep(0.05)
+
+
+def attach(path, *app_args):
+    return subprocess.run([sys.executable, "-m", "src.session_zygote", "attach", "--socket", path, "--", *app_args],
+                          cwd=ROOT, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, text=True, timeout=10)
+
+
+@pytest.fixture
+def zygote(tmp_path):
+    path = str(tmp_path / "zygote.sock")
+    process = start_zygote(path)
+    wait_for_socket(path, process)
+    yield path
+    process.send_signal(signal.SIGTERM)
+    process.wait(timeout=10)
+    assert not os.path.exists(path)
+
+
+def test_fork_attach_round_trip(zygote):
+    result = attach(zygote, "7", "--fast")
+    assert result.stdout == "session: 7 --fast\n"
+    assert result.returncode == 7
+
+    # 同一个预热进程可以连续开启会话
+    assert attach(zygote, "0").returncode == 0
+
+
+def test_socket_is_private_and_not_taken_over(zygote):
+    assert stat.S_IMODE(os.stat(zygote).st_mode) == 0o600
+
+    second = start_zygote(zygote)
+    _, stderr = second.communicate(timeout=10)
+    assert second.returncode != 0
+    assert "已有服务在运行" in stderr
+    assert attach(zygote, "0").returncode == 0
+
+
+def recv_until_closed(sock):
+    sock.settimeout(5)
+    return sock.recv(64)
+
+
+@pytest.mark.parametrize("frame, fds", [
+    (b"not a request", None),
+    (_LENGTH.pack(MAX_REQUEST_SIZE + 1), [0, 1, 2]),
+    (_LENGTH.pack(7) + b"garbage", [0, 1, 2]),
+    (_LENGTH.pack(2) + b"{}", [0, 1, 2]),
+])
+def test_bad_request_is_rejected(zygote, frame, fds):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(zygote)
+        if fds is None:
+            sock.sendall(frame)
+        else:
+            socket.send_fds(sock, [frame], fds)
+        # 预热进程不回复 pid，直接关闭连接
+        assert recv_until_closed(sock) == b""
+    assert attach(zygote, "0").returncode == 0
+
+
+def test_silent_client_does_not_block_other_sessions(zygote):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as silent:
+        silent.connect(zygote)
+        # 只发出半个长度前缀，然后一直不说话
+        socket.send_fds(silent, [b"\x00\x00"], [0, 1, 2])
+        started = time.monotonic()
+        result = attach(zygote, "3")
+        assert result.returncode == 3
+        assert time.monotonic() - started < 5
@@ -0,0 +1,135 @@
+"""
+共享内存目录测试
+"""
+
+import os
+import threading
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from src import shared_catalog
+from src.cocktail_system import CocktailSystem
+from src.config_loader import ConfigLoader
+from src.shared_catalog import CatalogPublisher, CatalogReader, decode_catalog, encode_catalog
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config")
+
+
+@pytest.fixture(scope="module")
+def cocktail_system():
+    return CocktailSystem(ConfigLoader(CONFIG_DIR))
+
+
+@pytest.fixture
+def publisher():
+    publisher = CatalogPublisher(f"termix_test_{uuid.uuid4().hex[:12]}")
+    yield publisher
+    publisher.close()
+
+
+def catalog_with_marker(cocktail_system, marker):
+    """同一份目录，游戏配置里带上标记，用来核对读到的是哪一次发布"""
+    return SimpleNamespace(
+        ingredients=cocktail_system.ingredients,
+        recipes=cocktail_system.recipes,
+        game_config={**cocktail_system.game_config, "marker": marker},
+    )
+
+
+def test_encode_decode_round_trip(cocktail_system):
+    generation, game_config, ingredients, recipes = decode_catalog(encode_catalog(cocktail_system, generation=5))
+    assert generation == 5
+    assert game_config == cocktail_system.game_config
+    assert ingredients == cocktail_system.ingredients
+    assert recipes == cocktail_system.recipes
+    # 顺序决定界面列表的顺序，也要保持
+    assert list(recipes) == list(cocktail_system.recipes)
+
+
+def test_decode_rejects_unknown_format(cocktail_system):
+    payload = bytearray(encode_catalog(cocktail_system))
+    payload[:4] = b"XXXX"
+    with pytest.raises(ValueError):
+        decode_catalog(payload)
+
+
+def test_changed_and_refresh_across_republish(cocktail_system, publisher):
+    publisher.publish(catalog_with_marker(cocktail_system, 1))
+    reader = CatalogReader(publisher.name)
+    try:
+        assert reader.changed()
+        system = reader.load()
+        assert system.game_config["marker"] == 1
+        assert system.recipes == cocktail_system.recipes
+        assert not reader.changed()
+        assert reader.refresh() is None
+
+        generation = publisher.publish(catalog_with_marker(cocktail_system, 2))
+        assert reader.changed()
+        refreshed = reader.refresh()
+        assert refreshed.game_config["marker"] == 2
+        assert reader.generation == generation
+        assert not reader.changed()
+    finally:
+        reader.close()
+
+
+def test_reader_waits_for_writer_in_progress(cocktail_system, publisher):
+    publisher.publish(catalog_with_marker(cocktail_system, 1))
+    reader = CatalogReader(publisher.name)
+    buffer = publisher._control.buf
+    (sequence,) = shared_catalog._SEQUENCE.unpack_from(buffer)
+    # 模拟发布端写到一半：序号为奇数，稍后写完
+    shared_catalog._SEQUENCE.pack_into(buffer, 0, sequence + 1)
+    timer = threading.Timer(0.05, shared_catalog._SEQUENCE.pack_into, (buffer, 0, sequence + 2))
+    timer.start()
+    try:
+        assert reader.load().game_config["marker"] == 1
+    finally:
+        timer.join()
+        reader.close()
+
+
+def test_reader_gives_up_on_abandoned_write(cocktail_system, publisher, monkeypatch):
+    publisher.publish(catalog_with_marker(cocktail_system, 1))
+    reader = CatalogReader(publisher.name)
+    monkeypatch.setattr(shared_catalog, "_CONTROL_READ_TIMEOUT", 0.05)
+    buffer = publisher._control.buf
+    (sequence,) = shared_catalog._SEQUENCE.unpack_from(buffer)
+    shared_catalog._SEQUENCE.pack_into(buffer, 0, sequence + 1)
+    try:
+        with pytest.raises(RuntimeError):
+            reader.load()
+    finally:
+        shared_catalog._SEQUENCE.pack_into(buffer, 0, sequence + 2)
+        reader.close()
+
+
+def test_reader_racing_writer_sees_consistent_generations(cocktail_system, publisher):
+    catalogs = [catalog_with_marker(cocktail_system, marker) for marker in range(2)]
+    publisher.publish(catalogs[1])
+    stop = threading.Event()
+
+    def republish():
+        while not stop.is_set():
+            generation = publisher.generation + 1
+            publisher.publish(catalogs[generation % 2])
+
+    writer = threading.Thread(target=republish)
+    writer.start()
+    reader = CatalogReader(publisher.name)
+    try:
+        last_generation = 0
+        for _ in range(50):
+            system = reader.load()
+            # 解码出的数据必须正好是控制块所指那一代的内容
+            assert system.game_config["marker"] == reader.generation % 2
+            assert reader.generation >= last_generation
+            last_generation = reader.generation
+    finally:
+        stop.set()
+        writer.join()
+        reader.close()
+    assert publisher.generation > 1
@@ -0,0 +1,52 @@
+"""
+启动分析器测试
+"""
+
+from src.startup_profiler import StartupProfiler
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = StartupProfiler()
+
+    @profiler.timed("load")
+    def load():
+        return 42
+
+    for _ in range(1000):
+        assert load() == 42
+        profiler.mark("tick")
+        with profiler.phase("phase"):
+            pass
+
+    assert profiler.events == []
+    assert profiler._open == {}
+
+
+def test_enabled_profiler_records_phases():
+    profiler = StartupProfiler()
+    profiler.enabled = True
+
+    with profiler.phase("imports"):
+        pass
+    profiler.mark("first_paint")
+
+    names = [phase["name"] for phase in profiler.timeline()["phases"]]
+    assert names == ["imports", "first_paint"]
+    assert "duration_ms" in profiler.timeline()["phases"][0]
+
+
+def test_enable_from_argv(tmp_path, monkeypatch):
+    monkeypatch.setattr("atexit.register", lambda func: None)
+    output = str(tmp_path / "startup.json")
+
+    profiler = StartupProfiler()
+    profiler.enable_from_argv(["--fast", "--profile-startup", output])
+    assert profiler.enabled and profiler.output == output
+
+    profiler = StartupProfiler()
+    profiler.enable_from_argv(["--profile-startup", "--fast"])
+    assert profiler.enabled and profiler.output is None
+
+    profiler = StartupProfiler()
+    profiler.enable_from_argv(["--fast"])
+    assert not profiler.enabled